@@ -118,6 +118,9 @@ def LoadPCFromFETC(filename):
     #     label = data['car_type']  # Load label
     # return point_set, label
     # Modified by Teng
+    if filename.endswith('.npy'):
+        # Canonical export: float32 x, y, z[, intensity]
+        return np.load(filename)
     with np.load(filename) as data:
         point_set = data['pts']  # Load point cloud data
     return point_set
@@ -125,11 +128,12 @@ def LoadPCFromFETC(filename):
 def FindFilesFromFETC(data_dir, target):
     all_files = []
     #search_path = os.path.join(data_dir, '**', target, '*.*')  # 搜索所有類型的文件
-    search_path = os.path.join(data_dir, '**', target, '*.npz') # Howard's comments: change to use .npz files
-    for file_path in glob.glob(search_path, recursive=True):
-        # 獲取檔案名稱並存入列表
-        file_name = os.path.basename(file_path)
-        all_files.append(file_name)
+    for ext in ('*.npz', '*.npy'): # Howard's comments: change to use .npz files; canonical exports are .npy
+        search_path = os.path.join(data_dir, '**', target, ext)
+        for file_path in glob.glob(search_path, recursive=True):
+            # 獲取檔案名稱並存入列表
+            file_name = os.path.basename(file_path)
+            all_files.append(file_name)
     return all_files
 
 class FETCdataLoader(Dataset):
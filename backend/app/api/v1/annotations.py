@@ -32,6 +32,7 @@ from app.schemas.annotation import (
     BulkAnnotationReviewResponse,
 )
 from app.services.annotation import AnnotationService
+from app.utils.pagination import keyset_page
 
 logger = logging.getLogger(__name__)
 
@@ -308,6 +309,10 @@ async def list_global_annotations(
     status_filter: Optional[str] = Query(None, alias="status", description="Filter by status (e.g. pending_review)"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
+    include_total: bool = Query(True, description="Count the matching annotations"),
 ) -> AnnotationListResponse:
     """List annotations globally."""
     try:
@@ -325,11 +330,16 @@ async def list_global_annotations(
         # Call service to get global annotations
         annotations, total = await annotation_service.get_global_annotations(
             status=filter_status,
-            limit=size,
-            offset=(page - 1) * size
+            limit=size + 1,
+            offset=(page - 1) * size,
+            cursor=cursor,
+            include_total=include_total,
+        )
+        annotations, next_cursor = keyset_page(
+            annotations, size, lambda a: (a.created_at, a.id)
         )
         
-        pages = (total + size - 1) // size
+        pages = (total + size - 1) // size if total is not None else None
 
         return AnnotationListResponse(
             items=[
@@ -337,11 +347,14 @@ async def list_global_annotations(
                 for annotation in annotations
             ],
             total=total,
-            page=page,
+            page=None if cursor else page,
             size=size,
             pages=pages,
+            next_cursor=next_cursor,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing global annotations: {str(e)}")
         import traceback
@@ -351,27 +364,50 @@ async def list_global_annotations(
 
 @router.get(
     "/projects/{project_id}/reviews/pending",
-    response_model=List[AnnotationResponse],
+    response_model=AnnotationListResponse,
     summary="Get pending reviews",
-    description="Get list of annotations pending review.",
+    description="Get the queue of annotations pending review, oldest first, by cursor.",
 )
 async def get_pending_reviews(
     project_id: UUID,
     current_user: User = Depends(get_current_active_user),
     annotation_service: AnnotationService = Depends(get_annotation_service),
     _: Project = Depends(validate_project_exists),
-) -> List[AnnotationResponse]:
+    size: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(False, description="Count the whole queue"),
+) -> AnnotationListResponse:
     """Get annotations pending review."""
     try:
         # Verify user has reviewer permissions
         checker = require_project_reviewer()
         await checker(project_id, current_user, annotation_service.db)
 
-        annotations = await annotation_service.get_pending_reviews(project_id)
-        return [
-            AnnotationResponse.model_validate(annotation) for annotation in annotations
-        ]
+        annotations = await annotation_service.get_pending_reviews(
+            project_id, limit=size + 1, cursor=cursor
+        )
+        annotations, next_cursor = keyset_page(
+            annotations, size, lambda a: (a.created_at, a.id)
+        )
 
+        total = None
+        if include_total:
+            total = await annotation_service.count_pending_reviews(project_id)
+
+        return AnnotationListResponse(
+            items=[
+                AnnotationResponse.model_validate(annotation)
+                for annotation in annotations
+            ],
+            total=total,
+            page=None,
+            size=size,
+            pages=(total + size - 1) // size if total is not None else None,
+            next_cursor=next_cursor,
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting pending reviews: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -452,6 +488,10 @@ async def list_annotations(
     task_id: Optional[UUID] = Query(None, description="Filter by task"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
+    include_total: bool = Query(True, description="Count the matching annotations"),
 ) -> AnnotationListResponse:
     """List annotations with filtering and pagination."""
     try:
@@ -475,18 +515,23 @@ async def list_annotations(
             annotator_id=annotator_id or current_user.id,
             project_id=project_id,
             status=status,
-            limit=size,
+            limit=size + 1,
             offset=(page - 1) * size,
+            cursor=cursor,
+        )
+        annotations, next_cursor = keyset_page(
+            annotations, size, lambda a: (a.created_at, a.id)
         )
 
         # For pagination, we need total count
-        total_annotations = await annotation_service.get_user_annotations(
-            annotator_id=annotator_id or current_user.id,
-            project_id=project_id,
-            status=status,
-        )
-        total = len(total_annotations)
-        pages = (total + size - 1) // size
+        total = None
+        if include_total:
+            total = await annotation_service.count_user_annotations(
+                annotator_id=annotator_id or current_user.id,
+                project_id=project_id,
+                status=status,
+            )
+        pages = (total + size - 1) // size if total is not None else None
 
         return AnnotationListResponse(
             items=[
@@ -494,11 +539,14 @@ async def list_annotations(
                 for annotation in annotations
             ],
             total=total,
-            page=page,
+            page=None if cursor else page,
             size=size,
             pages=pages,
+            next_cursor=next_cursor,
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing annotations: {str(e)}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
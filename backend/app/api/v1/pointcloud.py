@@ -1,7 +1,9 @@
 """Point cloud file management API endpoints."""
 
-from datetime import datetime, timedelta
-from typing import List, Optional
+import logging
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -10,15 +12,19 @@ from fastapi import (
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     status,
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
+from minio.error import S3Error
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.storage import ObjectStorage
 from app.api.deps import (
     get_current_active_user,
     get_db,
@@ -27,44 +33,79 @@ from app.api.deps import (
     validate_project_exists,
 )
 from app.models.enums import FileStatus, ProjectRole
+from app.models.pointcloud import PointCloudFile
 from app.models.project import Project
 from app.models.user import User
 from app.schemas.pointcloud import (
+    BatchUploadError,
+    BatchUploadResponse,
     FileDownloadResponse,
     FileUploadResponse,
     PointCloudFileListResponse,
     PointCloudFileResponse,
     PointCloudFileSummary,
     PointCloudStats,
+    UploadChunkResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
 )
+from app.models.upload_session import UploadSession
+from app.services.file_stats import FileStatsService
 from app.services.file_upload import FileUploadService
-import zipfile
-import io
-from pathlib import Path
+from app.services.upload_session import MAX_CHUNK_SIZE, UploadSessionService
+from app.utils.pagination import keyset_page
+from app.utils.pointcloud_io import QUANTIZED_MEDIA_TYPE
+from pathlib import Path, PurePosixPath
 
-# Helper class for in-memory files
-class MemoryUploadFile:
-    def __init__(self, filename: str, content: bytes):
-        self.filename = filename
-        self.content = content
-        self.content_type = "application/octet-stream"
-        self.size = len(content)
+router = APIRouter()
+logger = logging.getLogger(__name__)
 
-    async def read(self):
-        return self.content
 
-    async def seek(self, offset):
-        pass
+def _upload_message(pointcloud_file: PointCloudFile) -> str:
+    """Describe where an upload is in the ingest pipeline."""
+    if pointcloud_file.status == FileStatus.PROCESSED:
+        return "File uploaded and analyzed successfully"
+    if pointcloud_file.status == FileStatus.FAILED:
+        return f"File uploaded but analysis failed: {pointcloud_file.error_message}"
+    return "File uploaded; analysis queued"
 
-    async def close(self):
-        pass
 
-router = APIRouter()
+def _file_summary(pointcloud_file: PointCloudFile) -> PointCloudFileSummary:
+    """List entry of a file."""
+    return PointCloudFileSummary(
+        id=pointcloud_file.id,
+        original_filename=pointcloud_file.original_filename,
+        file_size=pointcloud_file.file_size,
+        status=pointcloud_file.status,
+        point_count=pointcloud_file.point_count,
+        data_quality=pointcloud_file.data_quality,
+        has_noise=pointcloud_file.has_noise,
+        has_outliers=pointcloud_file.has_outliers,
+        bounding_box=pointcloud_file.bounding_box,
+        upload_completed_at=pointcloud_file.upload_completed_at,
+        created_at=pointcloud_file.created_at,
+    )
+
+
+def _file_upload_response(pointcloud_file: PointCloudFile) -> FileUploadResponse:
+    """Build the upload response for a stored file."""
+    return FileUploadResponse(
+        file_id=pointcloud_file.id,
+        filename=pointcloud_file.filename,
+        original_filename=pointcloud_file.original_filename,
+        file_size=pointcloud_file.file_size,
+        status=pointcloud_file.status,
+        point_count=pointcloud_file.point_count,
+        bounding_box=pointcloud_file.bounding_box,
+        checksum=pointcloud_file.checksum or "",
+        message=_upload_message(pointcloud_file),
+    )
+
 
 
 @router.post(
     "/projects/{project_id}/files/upload-multi",
-    response_model=List[FileUploadResponse],
+    response_model=BatchUploadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Batch upload point cloud files",
     description="Upload multiple point cloud files to a project.",
@@ -76,56 +117,40 @@ async def upload_multiple_files(
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
     _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
-) -> List[FileUploadResponse]:
+) -> BatchUploadResponse:
     """
     Batch upload multiple point cloud files.
+
+    Files are stored in parallel (``UPLOAD_CONCURRENCY``) and recorded in a
+    single transaction; failed files are listed in ``errors``.
     """
     upload_service = FileUploadService(db)
-    responses = []
-    errors = []
 
-    for file in files:
-        try:
-            # Reset file cursor if needed
-            await file.seek(0)
-            
-            pointcloud_file = await upload_service.upload_pointcloud(
-                file=file,
-                project_id=project_id,
-                uploaded_by=current_user.id,
-            )
+    saved, errors = await upload_service.upload_multiple(
+        files=files,
+        project_id=project_id,
+        uploaded_by=current_user.id,
+    )
 
-            responses.append(FileUploadResponse(
-                file_id=pointcloud_file.id,
-                filename=pointcloud_file.filename,
-                original_filename=pointcloud_file.original_filename,
-                file_size=pointcloud_file.file_size,
-                status=pointcloud_file.status,
-                point_count=pointcloud_file.point_count,
-                bounding_box=pointcloud_file.bounding_box,
-                checksum=pointcloud_file.checksum or "",
-                message="Success",
-            ))
-        except Exception as e:
-            # Log error but continue with other files
-            errors.append(f"{file.filename}: {str(e)}")
-            continue
-            
-    if not responses and errors:
+    if not saved and errors:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"All uploads failed: {'; '.join(errors)}"
+            detail=f"All uploads failed: {'; '.join(e['filename'] + ': ' + e['detail'] for e in errors)}"
         )
 
-    return responses
+    return BatchUploadResponse(
+        items=[_file_upload_response(f) for f in saved],
+        errors=[BatchUploadError(**e) for e in errors],
+        total=len(files),
+    )
 
 
 @router.post(
     "/projects/{project_id}/files/upload-archive",
-    response_model=List[FileUploadResponse],
+    response_model=BatchUploadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Upload ZIP archive",
-    description="Upload a ZIP file containing multiple point cloud files (.npy, .npz).",
+    description="Upload a ZIP file containing multiple point cloud files (.npy, .npz, .ply, .pcd).",
 )
 async def upload_archive(
     project_id: UUID,
@@ -134,9 +159,13 @@ async def upload_archive(
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
     _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
-) -> List[FileUploadResponse]:
+) -> BatchUploadResponse:
     """
     Upload and extract a ZIP archive containing point cloud files.
+
+    The archive is read from its spooled temporary file and members are
+    streamed to storage in parallel; failed members are listed in
+    ``errors`` without failing the whole archive.
     """
     if not archive.filename.lower().endswith('.zip'):
         raise HTTPException(
@@ -145,74 +174,33 @@ async def upload_archive(
         )
 
     upload_service = FileUploadService(db)
-    responses = []
-    errors = []
 
     try:
-        content = await archive.read()
-        with zipfile.ZipFile(io.BytesIO(content)) as zip_ref:
-            # Filter valid files
-            valid_files = [
-                f for f in zip_ref.namelist() 
-                if not f.startswith('__MACOSX') and 
-                not f.startswith('.') and 
-                (f.lower().endswith('.npy') or f.lower().endswith('.npz'))
-            ]
-
-            if not valid_files:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="No valid point cloud files (.npy, .npz) found in archive"
-                )
-
-            for filename in valid_files:
-                try:
-                    file_content = zip_ref.read(filename)
-                    # Create memory file object that mimics UploadFile
-                    mem_file = MemoryUploadFile(
-                        filename=Path(filename).name, # Handle paths in zip
-                        content=file_content
-                    )
-
-                    pointcloud_file = await upload_service.upload_pointcloud(
-                        file=mem_file,
-                        project_id=project_id,
-                        uploaded_by=current_user.id,
-                    )
-
-                    responses.append(FileUploadResponse(
-                        file_id=pointcloud_file.id,
-                        filename=pointcloud_file.filename,
-                        original_filename=pointcloud_file.original_filename,
-                        file_size=pointcloud_file.file_size,
-                        status=pointcloud_file.status,
-                        point_count=pointcloud_file.point_count,
-                        bounding_box=pointcloud_file.bounding_box,
-                        checksum=pointcloud_file.checksum or "",
-                        message="Success",
-                    ))
-                except Exception as e:
-                    errors.append(f"{filename}: {str(e)}")
-                    continue
-
-    except zipfile.BadZipFile:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid ZIP file"
+        saved, errors = await upload_service.upload_archive(
+            archive=archive.file,
+            project_id=project_id,
+            uploaded_by=current_user.id,
+            archive_name=archive.filename,
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Archive processing failed: {str(e)}"
         )
 
-    if not responses and errors:
+    if not saved and errors:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"All files in archive failed: {'; '.join(errors)}"
+            detail=f"All files in archive failed: {'; '.join(e['filename'] + ': ' + e['detail'] for e in errors)}"
         )
 
-    return responses
+    return BatchUploadResponse(
+        items=[_file_upload_response(f) for f in saved],
+        errors=[BatchUploadError(**e) for e in errors],
+        total=len(saved) + len(errors),
+    )
 
 
 @router.post(
@@ -244,7 +232,8 @@ async def upload_pointcloud_file(
 
     **File size limit**: 50MB (configurable)
 
-    The file will be automatically analyzed to extract metadata such as:
+    The file is stored and returned with status UPLOADED; a background worker
+    then analyzes it (PROCESSING -> PROCESSED) to extract metadata such as:
     - Point count
     - Bounding box
     - Data dimensions
@@ -269,7 +258,7 @@ async def upload_pointcloud_file(
             point_count=pointcloud_file.point_count,
             bounding_box=pointcloud_file.bounding_box,
             checksum=pointcloud_file.checksum or "",
-            message="File uploaded and analyzed successfully",
+            message=_upload_message(pointcloud_file),
         )
 
     except HTTPException:
@@ -281,6 +270,204 @@ async def upload_pointcloud_file(
         )
 
 
+def _upload_session_response(session: UploadSession) -> UploadSessionResponse:
+    """Build the public view of an upload session."""
+    return UploadSessionResponse(
+        session_id=session.id,
+        filename=session.original_filename,
+        file_size=session.file_size,
+        chunk_size=session.chunk_size,
+        total_chunks=session.total_chunks,
+        status=session.status,
+        received_chunks=session.received_indexes,
+        missing_chunks=session.missing_indexes,
+        received_ranges=[list(r) for r in session.received_ranges],
+        received_bytes=session.received_bytes,
+        expires_at=session.expires_at,
+        file_id=session.pointcloud_file_id,
+    )
+
+
+@router.post(
+    "/projects/{project_id}/files/uploads",
+    response_model=UploadSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start resumable upload",
+    description="Create a resumable upload session for a large point cloud file.",
+)
+async def create_upload_session(
+    project_id: UUID,
+    request: UploadSessionCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
+) -> UploadSessionResponse:
+    """
+    Start a resumable upload.
+
+    **Required permissions**: Project ANNOTATOR or higher
+
+    **Protocol**:
+    1. `POST .../files/uploads` with filename and total size
+    2. `PUT .../files/uploads/{session_id}/chunks/{index}` for every chunk,
+       raw bytes as body, optional `X-Chunk-Checksum` (SHA-256 hex) header
+    3. `GET .../files/uploads/{session_id}` to see which chunks/ranges the
+       server already has after a dropped connection
+    4. `POST .../files/uploads/{session_id}/complete` to assemble the file
+    """
+    session_service = UploadSessionService(db)
+    session = await session_service.create_session(
+        project_id=project_id,
+        created_by=current_user.id,
+        filename=request.filename,
+        file_size=request.file_size,
+        chunk_size=request.chunk_size,
+        checksum=request.checksum,
+        description=request.description,
+    )
+    return _upload_session_response(session)
+
+
+@router.get(
+    "/projects/{project_id}/files/uploads/{session_id}",
+    response_model=UploadSessionResponse,
+    summary="Get resumable upload state",
+    description="Get received chunks and byte ranges of a resumable upload.",
+)
+async def get_upload_session(
+    project_id: UUID,
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
+) -> UploadSessionResponse:
+    """
+    Get the state of a resumable upload.
+
+    **Required permissions**: Project ANNOTATOR or higher
+    """
+    session_service = UploadSessionService(db)
+    session = await session_service.get_session(session_id, project_id)
+    return _upload_session_response(session)
+
+
+@router.put(
+    "/projects/{project_id}/files/uploads/{session_id}/chunks/{index}",
+    response_model=UploadChunkResponse,
+    summary="Upload chunk",
+    description="Upload one numbered chunk of a resumable upload as the raw request body.",
+)
+async def upload_session_chunk(
+    project_id: UUID,
+    session_id: UUID,
+    index: int,
+    request: Request,
+    x_chunk_checksum: Optional[str] = Header(
+        None, description="SHA-256 hex digest of the chunk"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
+) -> UploadChunkResponse:
+    """
+    Upload one chunk.
+
+    **Required permissions**: Project ANNOTATOR or higher
+
+    Every chunk except the last must be exactly `chunk_size` bytes. Re-sending
+    a chunk that is already stored is harmless.
+    """
+    body = bytearray()
+    async for part in request.stream():
+        body.extend(part)
+        if len(body) > MAX_CHUNK_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Chunk too large",
+            )
+
+    session_service = UploadSessionService(db)
+    session = await session_service.put_chunk(
+        session_id=session_id,
+        project_id=project_id,
+        index=index,
+        data=bytes(body),
+        checksum=x_chunk_checksum,
+    )
+    chunk = session.received_chunks[str(index)]
+
+    return UploadChunkResponse(
+        session_id=session.id,
+        index=index,
+        size=chunk["size"],
+        checksum=chunk["sha256"],
+        received_bytes=session.received_bytes,
+        missing_chunks=len(session.missing_indexes),
+    )
+
+
+@router.post(
+    "/projects/{project_id}/files/uploads/{session_id}/complete",
+    response_model=FileUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Finalize resumable upload",
+    description="Assemble all uploaded chunks and create the point cloud file.",
+)
+async def complete_upload_session(
+    project_id: UUID,
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
+) -> FileUploadResponse:
+    """
+    Finalize a resumable upload.
+
+    **Required permissions**: Project ANNOTATOR or higher
+    """
+    session_service = UploadSessionService(db)
+    pointcloud_file = await session_service.complete_session(session_id, project_id)
+
+    return FileUploadResponse(
+        file_id=pointcloud_file.id,
+        filename=pointcloud_file.filename,
+        original_filename=pointcloud_file.original_filename,
+        file_size=pointcloud_file.file_size,
+        status=pointcloud_file.status,
+        point_count=pointcloud_file.point_count,
+        bounding_box=pointcloud_file.bounding_box,
+        checksum=pointcloud_file.checksum or "",
+        message=_upload_message(pointcloud_file),
+    )
+
+
+@router.delete(
+    "/projects/{project_id}/files/uploads/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Abort resumable upload",
+    description="Abort a resumable upload and discard its stored chunks.",
+)
+async def abort_upload_session(
+    project_id: UUID,
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.ANNOTATOR)),
+) -> None:
+    """
+    Abort a resumable upload.
+
+    **Required permissions**: Project ANNOTATOR or higher
+    """
+    session_service = UploadSessionService(db)
+    await session_service.abort_session(session_id, project_id)
+
+
 @router.get(
     "/projects/{project_id}/files",
     response_model=PointCloudFileListResponse,
@@ -291,9 +478,17 @@ async def list_project_files(
     project_id: UUID,
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
     status_filter: Optional[FileStatus] = Query(
         None, description="Filter by file status"
     ),
+    has_noise: Optional[bool] = Query(None, description="Filter by noise flag"),
+    has_outliers: Optional[bool] = Query(None, description="Filter by outlier flag"),
+    min_quality: Optional[int] = Query(
+        None, ge=1, le=10, description="Only files scored at least this quality"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
@@ -302,45 +497,157 @@ async def list_project_files(
     """
     Get a paginated list of point cloud files in a project.
 
+    The quality filters use the scores of the background quality stage, so
+    noisy sweeps can be left out before creating tasks. Deep pages should be
+    walked with ``cursor``: its cost does not grow with the depth, unlike
+    ``page``.
+
     **Required permissions**: Project VIEWER or higher
     """
     upload_service = FileUploadService(db)
+    filters = dict(
+        status_filter=status_filter,
+        has_noise=has_noise,
+        has_outliers=has_outliers,
+        min_quality=min_quality,
+    )
 
-    skip = (page - 1) * size
     files = await upload_service.get_project_files(
         project_id=project_id,
-        skip=skip,
-        limit=size,
-        status_filter=status_filter,
+        skip=(page - 1) * size,
+        limit=size + 1,
+        cursor=cursor,
+        **filters,
     )
+    files, next_cursor = keyset_page(files, size, lambda f: (f.created_at, f.id))
+    total = await upload_service.count_project_files(project_id, **filters)
 
-    # Get total count (simplified - in production you might want a more efficient count)
-    total_files = await upload_service.get_project_files(
-        project_id=project_id, skip=0, limit=1000
-    )
-    total = len(total_files)
-
-    file_summaries = [
-        PointCloudFileSummary(
-            id=f.id,
-            original_filename=f.original_filename,
-            file_size=f.file_size,
-            status=f.status,
-            point_count=f.point_count,
-            upload_completed_at=f.upload_completed_at,
-            created_at=f.created_at,
-        )
-        for f in files
-    ]
+    file_summaries = [_file_summary(f) for f in files]
 
     pages = (total + size - 1) // size  # Ceiling division
 
     return PointCloudFileListResponse(
         items=file_summaries,
         total=total,
-        page=page,
+        page=None if cursor else page,
         size=size,
         pages=pages,
+        next_cursor=next_cursor,
+    )
+
+
+def _parse_floats(value: str, name: str) -> List[float]:
+    """Parse a comma-separated list of numbers from a query parameter."""
+    try:
+        return [float(part) for part in value.split(",")]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be comma-separated numbers",
+        )
+
+
+@router.get(
+    "/projects/{project_id}/files/stats",
+    response_model=PointCloudStats,
+    summary="Get file statistics",
+    description="Get statistics about point cloud files in a project.",
+)
+async def get_project_file_stats(
+    project_id: UUID,
+    exact: bool = Query(
+        False, description="Aggregate over the files now instead of reading the rollup"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+) -> PointCloudStats:
+    """
+    Get statistics about point cloud files in a project.
+
+    Deleted files are not counted.
+
+    **Required permissions**: Project VIEWER or higher
+    """
+    stats_service = FileStatsService(db)
+
+    if exact:
+        return await stats_service.aggregate_project_stats(project_id)
+    return await stats_service.get_project_stats(project_id)
+
+
+@router.get(
+    "/projects/{project_id}/files/search",
+    response_model=PointCloudFileListResponse,
+    summary="Search project files",
+    description=(
+        "Find point cloud files by bounding box intersection, extent ranges "
+        "and point count ranges. Filtering and counting run in the database."
+    ),
+)
+async def search_project_files(
+    project_id: UUID,
+    bbox: Optional[str] = Query(
+        None,
+        description="Files overlapping min_x,min_y,max_x,max_y or min_x,min_y,min_z,max_x,max_y,max_z",
+    ),
+    min_extent_x: Optional[float] = Query(None, ge=0, description="Minimum X extent"),
+    max_extent_x: Optional[float] = Query(None, ge=0, description="Maximum X extent"),
+    min_extent_y: Optional[float] = Query(None, ge=0, description="Minimum Y extent"),
+    max_extent_y: Optional[float] = Query(None, ge=0, description="Maximum Y extent"),
+    min_extent_z: Optional[float] = Query(None, ge=0, description="Minimum Z extent"),
+    max_extent_z: Optional[float] = Query(None, ge=0, description="Maximum Z extent"),
+    min_length: Optional[float] = Query(
+        None, ge=0, description="Minimum length (longer horizontal extent)"
+    ),
+    max_length: Optional[float] = Query(
+        None, ge=0, description="Maximum length (longer horizontal extent)"
+    ),
+    min_points: Optional[int] = Query(None, ge=0, description="Minimum point count"),
+    max_points: Optional[int] = Query(None, ge=0, description="Maximum point count"),
+    status_filter: Optional[FileStatus] = Query(
+        None, description="Filter by file status"
+    ),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(20, ge=1, le=100, description="Page size"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+) -> PointCloudFileListResponse:
+    """
+    Search point cloud files by geometry.
+
+    Extents are in file units (metres for our scans), so "sweeps longer
+    than 12 m" is ``min_length=12``. Files without a bounding box only match
+    searches that do not filter on geometry.
+
+    **Required permissions**: Project VIEWER or higher
+    """
+    upload_service = FileUploadService(db)
+    files, total = await upload_service.search_files(
+        project_id=project_id,
+        skip=(page - 1) * size,
+        limit=size,
+        intersects=_parse_floats(bbox, "bbox") if bbox else None,
+        extents={
+            "x": (min_extent_x, max_extent_x),
+            "y": (min_extent_y, max_extent_y),
+            "z": (min_extent_z, max_extent_z),
+            "length": (min_length, max_length),
+        },
+        min_points=min_points,
+        max_points=max_points,
+        status_filter=status_filter,
+    )
+
+    return PointCloudFileListResponse(
+        items=[_file_summary(f) for f in files],
+        total=total,
+        page=page,
+        size=size,
+        pages=(total + size - 1) // size,
     )
 
 
@@ -467,69 +774,50 @@ async def delete_file(
         )
 
 
-@router.get(
-    "/projects/{project_id}/files/stats",
-    response_model=PointCloudStats,
-    summary="Get file statistics",
-    description="Get statistics about point cloud files in a project.",
+@router.post(
+    "/projects/{project_id}/files/reprocess",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Reprocess all files",
+    description="Queue reprocessing of every point cloud file in a project.",
 )
-async def get_project_file_stats(
+async def reprocess_project_files(
     project_id: UUID,
+    status_filter: Optional[FileStatus] = Query(
+        None, description="Only reprocess files in this status (e.g. failed)"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
-    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
-) -> PointCloudStats:
+    _: bool = Depends(require_project_access(ProjectRole.PROJECT_ADMIN)),
+):
     """
-    Get statistics about point cloud files in a project.
+    Queue reprocessing of all files in a project.
 
-    **Required permissions**: Project VIEWER or higher
+    **Required permissions**: Project ADMIN
+
+    The files are fanned out over the worker pool, one analysis task per file.
     """
     upload_service = FileUploadService(db)
 
-    # Get all files for the project
-    all_files = await upload_service.get_project_files(
-        project_id=project_id,
-        skip=0,
-        limit=1000,  # In production, use proper aggregation queries
-    )
+    try:
+        task_id = upload_service.enqueue_project_reprocessing(project_id, status_filter)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to queue reprocessing: {e}",
+        )
 
-    total_files = len(all_files)
-    total_size = sum(f.file_size for f in all_files)
-    total_points = sum(f.point_count for f in all_files if f.point_count)
-
-    # Status breakdown
-    uploaded_files = len([f for f in all_files if f.status == FileStatus.UPLOADED])
-    processing_files = len([f for f in all_files if f.status == FileStatus.PROCESSING])
-    failed_files = len([f for f in all_files if f.status == FileStatus.FAILED])
-
-    # File type breakdown
-    file_types = {}
-    for f in all_files:
-        ext = f.file_extension
-        file_types[ext] = file_types.get(ext, 0) + 1
-
-    # Size statistics
-    file_sizes_mb = [f.file_size / (1024 * 1024) for f in all_files]
-    average_file_size = sum(file_sizes_mb) / len(file_sizes_mb) if file_sizes_mb else 0
-    largest_file_size = max(file_sizes_mb) if file_sizes_mb else 0
-
-    return PointCloudStats(
-        total_files=total_files,
-        total_size=total_size,
-        total_points=total_points,
-        uploaded_files=uploaded_files,
-        processing_files=processing_files,
-        failed_files=failed_files,
-        file_types=file_types,
-        average_file_size=average_file_size,
-        largest_file_size=largest_file_size,
-    )
+    return {
+        "task_id": task_id,
+        "status": "processing",
+        "message": "Reprocessing queued",
+    }
 
 
 @router.post(
     "/projects/{project_id}/files/{file_id}/reprocess",
     response_model=PointCloudFileResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Reprocess file",
     description="Trigger reprocessing of a point cloud file to regenerate metadata.",
 )
@@ -550,6 +838,9 @@ async def reprocess_file(
     - Initial processing failed
     - You want to regenerate metadata with updated algorithms
     - File analysis needs to be refreshed
+
+    The analysis is queued on the worker; poll the file details for the
+    PROCESSING -> PROCESSED transition.
     """
     upload_service = FileUploadService(db)
 
@@ -564,13 +855,9 @@ async def reprocess_file(
             status_code=status.HTTP_410_GONE, detail="Cannot reprocess deleted file"
         )
 
-    # TODO: Implement reprocessing logic
-    # This would typically involve:
-    # 1. Marking file as PROCESSING
-    # 2. Queuing a background task for reanalysis
-    # 3. Updating metadata when complete
+    if not upload_service.enqueue_processing(file_id):
+        pointcloud_file = await upload_service.process_file(file_id)
 
-    # For now, return current file state
     return PointCloudFileResponse.model_validate(pointcloud_file)
 
 
@@ -636,7 +923,7 @@ async def list_local_folders(
 
 @router.post(
     "/projects/{project_id}/files/import-local",
-    response_model=List[FileUploadResponse],
+    response_model=BatchUploadResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Import local files",
     description="Import files from the server's local raw_data directory."
@@ -648,8 +935,14 @@ async def import_local_files(
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
     _: bool = Depends(require_project_access(ProjectRole.PROJECT_ADMIN)),
-):
-    """Import files from local folder."""
+) -> BatchUploadResponse:
+    """
+    Import files from local folder.
+
+    Files are imported in parallel (``IMPORT_CONCURRENCY``) straight from
+    disk and analyzed as they are stored; failed files are listed in
+    ``errors``.
+    """
     if not settings.DATASET_EXPORT_PATH:
         raise HTTPException(status_code=501, detail="DATASET_EXPORT_PATH not configured")
         
@@ -661,80 +954,195 @@ async def import_local_files(
         
     # Security check
     try:
-        source_dir.relative_to(base_root)
+        source_dir.resolve().relative_to(base_root.resolve())
     except ValueError:
         raise HTTPException(status_code=403, detail="Access denied")
 
     upload_service = FileUploadService(db)
-    responses = []
-    errors = []
-    
+
     # Collect files
-    files_to_process = []
-    if request.recursive:
-        for ext in ['.npy', '.npz', '.ply', '.pcd']:
-            files_to_process.extend(source_dir.rglob(f"*{ext}"))
-    else:
-        for ext in ['.npy', '.npz', '.ply', '.pcd']:
-            files_to_process.extend(source_dir.glob(f"*{ext}"))
-            
+    candidates = source_dir.rglob("*") if request.recursive else source_dir.glob("*")
+    files_to_process = sorted(
+        path for path in candidates
+        if path.suffix.lower() in upload_service.allowed_extensions and path.is_file()
+    )
+
     if not files_to_process:
         raise HTTPException(status_code=404, detail="No valid files found in directory")
 
-    for file_path in files_to_process:
-        try:
-            # Read file content
-            with open(file_path, "rb") as f:
-                content = f.read()
-                
-            # Create memory file wrapper
-            mem_file = MemoryUploadFile(
-                filename=file_path.name,
-                content=content
-            )
-            
-            pointcloud_file = await upload_service.upload_pointcloud(
-                file=mem_file,
-                project_id=project_id,
-                uploaded_by=current_user.id,
-                description=f"Imported from {request.source_path}"
-            )
-            
-            responses.append(FileUploadResponse(
-                file_id=pointcloud_file.id,
-                filename=pointcloud_file.filename,
-                original_filename=pointcloud_file.original_filename,
-                file_size=pointcloud_file.file_size,
-                status=pointcloud_file.status,
-                point_count=pointcloud_file.point_count,
-                bounding_box=pointcloud_file.bounding_box,
-                checksum=pointcloud_file.checksum or "",
-                message="Success",
-            ))
-        except Exception as e:
-            import traceback
-            print(f"IMPORT ERROR for {file_path.name}: {e}")
-            traceback.print_exc()
-            errors.append(f"{file_path.name}: {str(e)}")
-            continue
-            
-    if not responses and errors:
+    saved, errors = await upload_service.import_local_files(
+        paths=files_to_process,
+        project_id=project_id,
+        uploaded_by=current_user.id,
+        analyze_inline=True,
+        label=f"Local import {request.source_path}",
+    )
+
+    if not saved and errors:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"All imports failed: {'; '.join(errors[:5])}"
+            detail=f"All imports failed: {'; '.join(e['filename'] + ': ' + e['detail'] for e in errors[:5])}"
         )
-        
-    return responses
+
+    return BatchUploadResponse(
+        items=[_file_upload_response(f) for f in saved],
+        errors=[BatchUploadError(**e) for e in errors],
+        total=len(files_to_process),
+    )
+
+
+async def _get_live_file(
+    upload_service: FileUploadService, project_id: UUID, file_id: UUID
+) -> PointCloudFile:
+    """The file with ``file_id`` in the project, 404 if missing or deleted."""
+    pointcloud_file = await upload_service.get_file_by_id(file_id)
+    if (
+        not pointcloud_file
+        or pointcloud_file.project_id != project_id
+        or pointcloud_file.status == FileStatus.DELETED
+    ):
+        raise HTTPException(status_code=404, detail="File not found")
+    return pointcloud_file
+
+
+def _not_modified(
+    request: Request, headers: Dict[str, str], etag: Optional[str]
+) -> Optional[Response]:
+    """
+    Add ``etag`` to the response headers and answer 304 if the client has it.
+
+    Returns:
+        Optional[Response]: The 304 response, None if the body must be sent
+    """
+    if not etag:
+        return None
+    headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return None
+
+
+async def _stream_object(
+    storage: ObjectStorage,
+    object_path: str,
+    status_code: int,
+    headers: Dict[str, str],
+    offset: int = 0,
+    length: int = 0,
+    media_type: str = "application/octet-stream",
+) -> StreamingResponse:
+    """
+    Relay an object (or a byte range of it) chunk by chunk.
+
+    The first chunk is fetched before responding so storage errors still
+    become a 404 (missing object) or 500 instead of a truncated body.
+    """
+    try:
+        # Read through the internal MinIO client (configured with the internal
+        # host); chunks are fetched off the event loop as the client consumes them
+        body = storage.iter_object(
+            object_path,
+            offset=offset,
+            length=length,
+            chunk_size=settings.DOWNLOAD_CHUNK_SIZE,
+        )
+        first_chunk = await body.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except S3Error as e:
+        if e.code != "NoSuchKey":
+            logger.error(f"Failed to stream {object_path}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to stream file: {e}")
+        raise HTTPException(status_code=404, detail="File not found in storage")
+    except Exception as e:
+        logger.error(f"Failed to stream {object_path}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to stream file: {e}")
+
+    async def _content():
+        yield first_chunk
+        async for chunk in body:
+            yield chunk
+
+    return StreamingResponse(
+        _content(),
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range ``Range`` header into inclusive (start, end).
+
+    Returns None when the header should be ignored (malformed, multiple
+    ranges, other units); raises 416 when the range cannot be satisfied.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(last), 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    if end < start:
+        return None
+    return start, min(end, size - 1)
 
 
 @router.get(
     "/projects/{project_id}/files/{file_id}/proxy",
     summary="Proxy file download",
-    description="Stream the file through the backend to avoid CORS/Signature issues.",
+    description=(
+        "Stream the file through the backend to avoid CORS/Signature issues. "
+        "Supports Range/If-Range requests for partial content. With "
+        "canonical=true the canonical float32 .npy copy is served instead; "
+        f"with encoding=quantized (or Accept: {QUANTIZED_MEDIA_TYPE}) the "
+        "compact quantized transport format."
+    ),
+    responses={
+        206: {"description": "Partial content"},
+        304: {"description": "Not modified"},
+        416: {"description": "Requested range not satisfiable"},
+    },
 )
 async def proxy_file_download(
     project_id: UUID,
     file_id: UUID,
+    request: Request,
+    canonical: bool = Query(
+        False, description="Serve the canonical x/y/z[/intensity] float32 .npy"
+    ),
+    encoding: Optional[str] = Query(
+        None, pattern="^(raw|quantized)$", description="raw (default) or quantized"
+    ),
+    bits: int = Query(16, description="Quantized: bits per coordinate (16 or 32)"),
+    attributes: bool = Query(True, description="Quantized: include intensity"),
+    order: str = Query(
+        "source",
+        pattern="^(source|morton)$",
+        description="Quantized: keep the source point order or sort along a Morton curve",
+    ),
+    delta: bool = Query(True, description="Quantized: delta-code each channel"),
+    compression: str = Query(
+        "deflate", description="Quantized: deflate, zstd (if installed) or none"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     project: Project = Depends(validate_project_exists),
@@ -743,45 +1151,286 @@ async def proxy_file_download(
     """
     Stream the file content directly from MinIO through the backend.
     Useful for local development to avoid DNS/CORS issues with MinIO URLs.
+
+    The object is relayed chunk by chunk: the next chunk is only read from
+    storage once the previous one has been sent, so memory use per download
+    stays at one chunk. A single ``Range`` is served as 206; ``If-Range`` and
+    ``If-None-Match`` are checked against the ``ETag`` (the SHA-256 checksum)
+    and ``Last-Modified``.
+
+    The canonical copy needs no parsing by the client: it is an uncompressed
+    little-endian float32 ``.npy`` that can be memory-mapped as is.
+
+    The quantized format (see ``app.utils.pointcloud_io``) trades precision
+    for size on slow links: 16-bit positions over the bounding box are
+    typically a few millimetres apart on site scans. Morton order improves
+    compression but changes the point order, so it is only for viewing.
     """
     upload_service = FileUploadService(db)
-    pointcloud_file = await upload_service.get_file_by_id(file_id)
-    
-    if not pointcloud_file or pointcloud_file.project_id != project_id:
-        raise HTTPException(status_code=404, detail="File not found")
-
-    try:
-        # Get object from MinIO
-        # We use the internal MinIO client which is configured with internal host
-        response = upload_service.minio_client.get_object(
-            settings.MINIO_BUCKET,
-            pointcloud_file.file_path
+    pointcloud_file = await _get_live_file(upload_service, project_id, file_id)
+
+    storage = upload_service.storage
+    media_type = "application/octet-stream"
+    if encoding is None and QUANTIZED_MEDIA_TYPE in request.headers.get("accept", ""):
+        encoding = "quantized"
+    if encoding == "quantized":
+        object_path = await upload_service.get_quantized_object(
+            pointcloud_file,
+            bits=bits,
+            attributes=attributes,
+            morton=order == "morton",
+            delta=delta,
+            compression=compression,
         )
-        
-        # Read fully into memory to avoid streaming issues with MinIO/Uvicorn
-        content = response.read()
-        
-        # Log response details for debugging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"Proxying file {pointcloud_file.original_filename} (size: {len(content)} bytes)")
-        if len(content) < 2000:
-             logger.info(f"Small file content preview: {content[:200]}")
-
-        # Close response immediately
-        response.close()
-        response.release_conn()
-
-        return StreamingResponse(
-            io.BytesIO(content), 
-            media_type="application/octet-stream",
-            headers={
-                "Content-Disposition": f'attachment; filename="{pointcloud_file.original_filename}"',
-                "Content-Length": str(len(content))
-            }
+        variant = PurePosixPath(object_path).name.split(".", 1)[1]
+        filename = f"{Path(pointcloud_file.original_filename).stem}.{variant}"
+        size = 0
+        etag_value = f"{pointcloud_file.checksum}.{variant}" if pointcloud_file.checksum else None
+        modified_at = pointcloud_file.processing_completed_at or pointcloud_file.updated_at
+        media_type = QUANTIZED_MEDIA_TYPE
+    elif canonical:
+        if not pointcloud_file.canonical_path:
+            raise HTTPException(status_code=404, detail="Canonical points not available")
+        object_path = pointcloud_file.canonical_path
+        filename = f"{Path(pointcloud_file.original_filename).stem}.npy"
+        size = 0
+        etag_value = f"{pointcloud_file.checksum}.points" if pointcloud_file.checksum else None
+        modified_at = pointcloud_file.processing_completed_at or pointcloud_file.updated_at
+    else:
+        object_path = pointcloud_file.file_path
+        filename = pointcloud_file.original_filename
+        size = pointcloud_file.file_size
+        etag_value = pointcloud_file.checksum
+        modified_at = pointcloud_file.upload_completed_at or pointcloud_file.updated_at
+
+    if not size:
+        # Older records (and canonical copies) have no recorded size; ask storage
+        try:
+            size = (await storage.stat_object(object_path)).size
+        except Exception as e:
+            logger.error(f"Failed to stat file {file_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to stream file: {e}")
+
+    etag = f'"{etag_value}"' if etag_value else None
+    last_modified = format_datetime(modified_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Last-Modified": last_modified,
+        "Vary": "Accept",
+    }
+    not_modified = _not_modified(request, headers, etag)
+    if not_modified:
+        return not_modified
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and size > 0:
+        # If-Range: only honour the range if the client's copy is current
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() in (etag, last_modified):
+            try:
+                byte_range = _parse_range(range_header, size)
+            except HTTPException as e:
+                e.headers = {**headers, **e.headers}
+                raise
+
+    if byte_range:
+        start, end = byte_range
+        offset, length = start, end - start + 1
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    else:
+        offset, length = 0, size
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(length)
+
+    return await _stream_object(
+        storage,
+        object_path,
+        status_code,
+        headers,
+        offset=offset,
+        length=length if byte_range else 0,
+        media_type=media_type,
+    )
+
+
+@router.get(
+    "/projects/{project_id}/files/{file_id}/lod/{level}",
+    summary="Download preview level",
+    description=(
+        "Stream a downsampled preview of the file as a float32 .npy "
+        "(x, y, z[, intensity]). Level 0 is the coarsest; level "
+        "len(LOD_LEVELS) is the full cloud."
+    ),
+    responses={304: {"description": "Not modified"}},
+)
+async def get_file_lod(
+    project_id: UUID,
+    file_id: UUID,
+    level: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+):
+    """
+    Stream one level of the preview pyramid built at ingest.
+
+    Levels are nested subsamples of the same cloud, so a viewer can render
+    level 0 at once and refine level by level. Previews only change with the
+    file content, so they are served with a checksum ``ETag`` and may be
+    cached by the client.
+    """
+    upload_service = FileUploadService(db)
+    pointcloud_file = await _get_live_file(upload_service, project_id, file_id)
+
+    object_path = upload_service.get_lod_object(pointcloud_file, level)
+    headers = {
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": (
+            f'attachment; filename="{Path(pointcloud_file.original_filename).stem}.lod{level}.npy"'
+        ),
+    }
+    etag = None
+    if pointcloud_file.checksum:
+        # The level's point budget is part of the tag: which subsample (or the
+        # full cloud) a level resolves to changes with LOD_LEVELS and reprocessing
+        stored = pointcloud_file.lod_levels
+        points = stored[level] if level < len(stored) else "full"
+        etag = f'"{pointcloud_file.checksum}.lod{level}.{points}"'
+    not_modified = _not_modified(request, headers, etag)
+    if not_modified:
+        return not_modified
+
+    return await _stream_object(
+        upload_service.storage, object_path, status.HTTP_200_OK, headers
+    )
+
+
+async def _stream_octree_object(
+    db: AsyncSession,
+    request: Request,
+    project_id: UUID,
+    file_id: UUID,
+    node: Optional[str],
+) -> Response:
+    """Serve the octree hierarchy (``node`` None) or one node with a checksum ETag."""
+    upload_service = FileUploadService(db)
+    pointcloud_file = await _get_live_file(upload_service, project_id, file_id)
+
+    object_path = upload_service.get_octree_object(pointcloud_file, node)
+    headers = {"Cache-Control": "private, max-age=86400"}
+    if node is not None:
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{Path(pointcloud_file.original_filename).stem}.{node}.npy"'
         )
+    etag = None
+    if pointcloud_file.checksum:
+        etag = f'"{pointcloud_file.checksum}.octree.{node or "hierarchy"}"'
+    not_modified = _not_modified(request, headers, etag)
+    if not_modified:
+        return not_modified
+
+    return await _stream_object(
+        upload_service.storage,
+        object_path,
+        status.HTTP_200_OK,
+        headers,
+        media_type="application/json" if node is None else "application/octet-stream",
+    )
 
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"Failed to stream file: {e}")
+
+@router.get(
+    "/projects/{project_id}/files/{file_id}/octree",
+    summary="Get octree hierarchy",
+    description=(
+        "Index of the octree tiling of a large file: root cube bounds and, per "
+        "node, its name, point count, cube bounds and child bit mask."
+    ),
+    responses={304: {"description": "Not modified"}},
+)
+async def get_file_octree(
+    project_id: UUID,
+    file_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+):
+    """
+    Return the hierarchy index of the octree built at ingest.
+
+    Node ``r`` is the root; each further digit (0-7, x as the high bit, then
+    y, then z) selects a child cube. Every node holds a random subsample of
+    its cube that its ancestors did not take, so a viewer draws the nodes
+    visible at the depth it needs and fetches nothing else.
+    """
+    return await _stream_octree_object(db, request, project_id, file_id, None)
+
+
+@router.get(
+    "/projects/{project_id}/files/{file_id}/octree/{node}",
+    summary="Download octree node",
+    description="Stream the points of one octree node as a float32 .npy (x, y, z[, intensity]).",
+    responses={304: {"description": "Not modified"}},
+)
+async def get_file_octree_node(
+    project_id: UUID,
+    file_id: UUID,
+    node: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+):
+    """Stream one node of the octree; nodes only change with the file content."""
+    return await _stream_octree_object(db, request, project_id, file_id, node)
+
+
+@router.get(
+    "/projects/{project_id}/files/{file_id}/outliers",
+    summary="Download outlier mask",
+    description=(
+        "Stream the per-point mask of the quality stage as a uint8 .npy: "
+        "bit 0 marks statistical outliers, bit 1 low-density noise."
+    ),
+    responses={304: {"description": "Not modified"}},
+)
+async def get_file_outliers(
+    project_id: UUID,
+    file_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    project: Project = Depends(validate_project_exists),
+    _: bool = Depends(require_project_access(ProjectRole.VIEWER)),
+):
+    """Stream the outlier mask; rows follow the point order of the file."""
+    upload_service = FileUploadService(db)
+    pointcloud_file = await _get_live_file(upload_service, project_id, file_id)
+
+    object_path = upload_service.get_outlier_mask_object(pointcloud_file)
+    headers = {
+        "Cache-Control": "private, max-age=86400",
+        "Content-Disposition": (
+            f'attachment; filename="{Path(pointcloud_file.original_filename).stem}.outliers.npy"'
+        ),
+    }
+    # The mask changes with rescoring (forced or with other QUALITY_* settings)
+    # and not with the file content, so it is tagged by its own digest; masks
+    # scored before the digest was recorded are sent without an ETag
+    mask_digest = (pointcloud_file.quality_details or {}).get("mask_sha256")
+    etag = f'"{mask_digest}"' if mask_digest else None
+    not_modified = _not_modified(request, headers, etag)
+    if not_modified:
+        return not_modified
+
+    return await _stream_object(
+        upload_service.storage, object_path, status.HTTP_200_OK, headers
+    )
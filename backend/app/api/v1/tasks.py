@@ -262,6 +262,10 @@ async def list_project_tasks(
     created_by: Optional[UUID] = Query(None, description="Filter by creator"),
     name_search: Optional[str] = Query(None, description="Search by task name"),
     overdue_only: bool = Query(False, description="Show only overdue tasks"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
+    include_total: bool = Query(True, description="Count the matching tasks"),
 ) -> TaskListResponse:
     """
     Get paginated list of tasks in a project.
@@ -277,6 +281,8 @@ async def list_project_tasks(
     - **created_by**: Filter by creator user ID
     - **name_search**: Search tasks by name (partial match)
     - **overdue_only**: Show only overdue tasks
+    - **cursor**: Continue after the previous page (cost independent of depth)
+    - **include_total**: Count the matching tasks (skip for faster pages)
     """
     try:
         # Create filter object
@@ -290,12 +296,19 @@ async def list_project_tasks(
         )
 
         tasks = await task_service.get_project_tasks(
-            project_id=project_id, filters=filters, page=page, size=size
+            project_id=project_id,
+            filters=filters,
+            page=page,
+            size=size,
+            cursor=cursor,
+            include_total=include_total,
         )
 
         logger.info(f"Retrieved {len(tasks.items)} tasks for project {project_id}")
         return tasks
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving tasks for project {project_id}: {e}")
         raise HTTPException(
@@ -715,6 +728,10 @@ async def get_my_tasks(
     status_filter: Optional[TaskStatus] = Query(None, description="Filter by status"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="next_cursor of the previous page (replaces page)"
+    ),
+    include_total: bool = Query(True, description="Count the matching tasks"),
 ) -> TaskListResponse:
     """
     Get tasks assigned to the current user.
@@ -724,6 +741,8 @@ async def get_my_tasks(
     - **status_filter**: Filter by task status
     - **page**: Page number (starting from 1)
     - **size**: Items per page (1-100)
+    - **cursor**: Continue after the previous page (cost independent of depth)
+    - **include_total**: Count the matching tasks (skip for faster pages)
     """
     try:
         tasks = await task_service.get_user_tasks(
@@ -732,11 +751,15 @@ async def get_my_tasks(
             status_filter=status_filter,
             page=page,
             size=size,
+            cursor=cursor,
+            include_total=include_total,
         )
 
         logger.info(f"Retrieved {len(tasks.items)} tasks for user {current_user.email}")
         return tasks
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving tasks for user {current_user.id}: {e}")
         raise HTTPException(
@@ -8,5 +8,11 @@ celery_app.conf.update(
     task_serializer='json',
     result_serializer='json',
     accept_content=['json'],
+    beat_schedule={
+        "purge-expired-upload-sessions": {
+            "task": "app.worker.purge_expired_upload_sessions",
+            "schedule": settings.UPLOAD_SESSION_PURGE_MINUTES * 60,
+        },
+    },
 )
 
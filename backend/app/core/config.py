@@ -83,6 +83,14 @@ class Settings(BaseSettings):
     MINIO_SECURE: bool = False
     MINIO_URL: Optional[str] = None
 
+    # Object storage client tuning
+    STORAGE_MAX_WORKERS: int = 16  # threads running blocking storage calls
+    STORAGE_MAX_CONNECTIONS: int = 16  # pooled HTTP connections kept to MinIO
+    STORAGE_CONNECT_TIMEOUT: float = 5.0  # seconds
+    STORAGE_READ_TIMEOUT: float = 120.0  # seconds
+    STORAGE_MAX_RETRIES: int = 3
+    STORAGE_RETRY_BACKOFF: float = 0.5  # seconds, doubled per retry
+
     @field_validator("MINIO_URL", mode="before")
     @classmethod
     def assemble_minio_connection(cls, v: Optional[str], info) -> str:
@@ -97,6 +105,32 @@ class Settings(BaseSettings):
     MAX_FILE_SIZE: int = 50  # MB
     ALLOWED_FILE_EXTENSIONS: List[str] = [".npy", ".npz"]
     UPLOAD_CHUNK_SIZE: int = 8192  # bytes
+    STORAGE_PART_SIZE: int = 8 * 1024 * 1024  # bytes per multipart part (S3 minimum: 5 MiB)
+    DOWNLOAD_CHUNK_SIZE: int = 1024 * 1024  # bytes relayed per chunk by the download proxy
+    UPLOAD_SESSION_CHUNK_SIZE: int = 8 * 1024 * 1024  # default resumable chunk size
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+    UPLOAD_SESSION_PURGE_MINUTES: int = 60  # beat interval of the expired session purge
+    PROCESS_FILES_ASYNC: bool = True  # Analyze uploads in the Celery worker
+    UPLOAD_CONCURRENCY: int = 8  # files stored in parallel by batch/archive uploads
+    ARCHIVE_COMMIT_BATCH: int = 100  # archive members recorded per commit
+    IMPORT_CONCURRENCY: int = 16  # files imported in parallel from local folders
+    IMPORT_COMMIT_BATCH: int = 500  # imported files recorded per commit
+    DEDUP_SCOPE: str = "project"  # reuse stored objects by checksum: project | global | off
+    LOD_LEVELS: List[int] = [8192, 65536, 524288]  # point budgets of the preview pyramid
+    OCTREE_MIN_POINTS: int = 2_000_000  # clouds at least this large are also tiled into an octree
+    OCTREE_NODE_POINTS: int = 50_000  # point budget of one octree node
+    OCTREE_MAX_DEPTH: int = 10  # deepest octree level (at most 10)
+    QUALITY_STAGE_ENABLED: bool = True  # score noise/outliers of processed files in the worker
+    QUALITY_NEIGHBORS: int = 8  # k of the statistical outlier test
+    QUALITY_STD_RATIO: float = 3.0  # outlier if mean k-NN distance > mean + ratio * std
+    QUALITY_RADIUS_FACTOR: float = 3.0  # density radius in multiples of the point spacing
+    QUALITY_MIN_NEIGHBORS: int = 3  # noise if fewer neighbors within the radius
+    QUALITY_KDTREE_MAX_POINTS: int = 5_000_000  # larger clouds use the voxel hash index
+    QUALITY_OUTLIER_RATIO: float = 0.02  # share of outliers that sets has_outliers
+    QUALITY_NOISE_RATIO: float = 0.005  # share of noise points that sets has_noise
+    FILE_STATS_ROLLUP: bool = True  # serve project file stats from the rollup table
+    TASK_STATS_TTL: float = 5.0  # seconds project task stats are cached per process (0: off)
+    TASK_STATS_CACHE_SIZE: int = 1024  # projects whose task stats are cached per process
 
     # Celery Configuration
     CELERY_BROKER_URL: Optional[str] = None
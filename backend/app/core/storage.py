@@ -0,0 +1,321 @@
+"""
+Async object storage access.
+
+The MinIO client is synchronous. ``ObjectStorage`` wraps it so every call
+runs on a dedicated, bounded thread pool instead of the event loop. The
+underlying HTTP pool has connection limits, timeouts and retry/backoff
+configured from settings.
+
+One instance is shared per process: ``init_storage()`` is called from the
+FastAPI lifespan (which then awaits ``ensure_bucket()``) and from the Celery
+``worker_process_init`` hook, and ``get_storage()`` returns it everywhere else.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, AsyncIterator, BinaryIO, Callable, Iterable, List, Optional, TypeVar
+
+import certifi
+import urllib3
+from minio import Minio
+from minio.commonconfig import ComposeSource
+from minio.datatypes import Object
+from minio.deleteobjects import DeleteObject
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Transient server responses worth retrying (requests are idempotent part/object PUTs and GETs)
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+_storage: Optional["ObjectStorage"] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool reserved for storage calls."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.STORAGE_MAX_WORKERS,
+                thread_name_prefix="storage",
+            )
+        return _executor
+
+
+def create_http_client() -> urllib3.PoolManager:
+    """Bounded, retrying HTTP connection pool for the MinIO client."""
+    return urllib3.PoolManager(
+        maxsize=settings.STORAGE_MAX_CONNECTIONS,
+        timeout=urllib3.Timeout(
+            connect=settings.STORAGE_CONNECT_TIMEOUT,
+            read=settings.STORAGE_READ_TIMEOUT,
+        ),
+        retries=urllib3.Retry(
+            total=settings.STORAGE_MAX_RETRIES,
+            backoff_factor=settings.STORAGE_RETRY_BACKOFF,
+            status_forcelist=_RETRY_STATUSES,
+            # MinIO maps the final response to S3Error itself
+            raise_on_status=False,
+        ),
+        cert_reqs="CERT_REQUIRED",
+        ca_certs=os.environ.get("SSL_CERT_FILE") or certifi.where(),
+    )
+
+
+def create_minio_client(http_client: Optional[urllib3.PoolManager] = None) -> Minio:
+    """Create a MinIO client over ``http_client`` (a new bounded pool by default)."""
+    return Minio(
+        endpoint=f"{settings.MINIO_HOST}:{settings.MINIO_PORT}",
+        access_key=settings.MINIO_ACCESS_KEY,
+        secret_key=settings.MINIO_SECRET_KEY,
+        secure=settings.MINIO_SECURE,
+        http_client=http_client or create_http_client(),
+    )
+
+
+class ObjectStorage:
+    """Async facade over the MinIO client for the configured bucket."""
+
+    def __init__(self, client: Optional[Minio] = None, bucket: Optional[str] = None):
+        # Only a pool created here is ours to clear; a passed-in client owns its own
+        self._http: Optional[urllib3.PoolManager] = None
+        if client is None:
+            self._http = create_http_client()
+            client = create_minio_client(self._http)
+        self.client = client
+        self.bucket = bucket or settings.MINIO_BUCKET
+        self._bucket_ready = False
+
+    def close(self) -> None:
+        """Drop pooled connections."""
+        if self._http is not None:
+            self._http.clear()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking callable on the storage thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _get_executor(), functools.partial(func, *args, **kwargs)
+        )
+
+    def ensure_bucket_sync(self) -> None:
+        """
+        Create the bucket if it does not exist.
+
+        Checked once per instance; later calls return without a round trip.
+        """
+        if self._bucket_ready:
+            return
+        if not self.client.bucket_exists(self.bucket):
+            self.client.make_bucket(self.bucket)
+        self._bucket_ready = True
+
+    async def ensure_bucket(self) -> None:
+        """Async variant of ``ensure_bucket_sync``."""
+        if not self._bucket_ready:
+            await self.run(self.ensure_bucket_sync)
+
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int = -1,
+        part_size: int = 0,
+        content_type: str = "application/octet-stream",
+    ) -> None:
+        """Upload a stream; ``length=-1`` streams it as a multipart upload."""
+        await self.ensure_bucket()
+        await self.run(
+            self.client.put_object,
+            bucket_name=self.bucket,
+            object_name=object_name,
+            data=data,
+            length=length,
+            part_size=part_size or settings.STORAGE_PART_SIZE,
+            content_type=content_type,
+        )
+
+    async def stat_object(self, object_name: str) -> Object:
+        """Fetch object metadata (size, etag, last modified)."""
+        return await self.run(self.client.stat_object, self.bucket, object_name)
+
+    async def iter_object(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: int = 0,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield an object (or the byte range ``offset``/``length``) in chunks.
+
+        Each chunk is read on the storage pool, so only one chunk is held in
+        memory and the next read waits until the consumer asks for it.
+        """
+        response = await self.run(
+            self.client.get_object, self.bucket, object_name, offset=offset, length=length
+        )
+        chunks = response.stream(chunk_size or settings.STORAGE_PART_SIZE)
+        try:
+            while True:
+                chunk = await self.run(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            response.close()
+            response.release_conn()
+
+    async def copy_object_to(
+        self,
+        object_name: str,
+        destination: BinaryIO,
+        on_chunk: Optional[Callable[[bytes], None]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Copy an object into a local file object on the storage pool.
+
+        The whole copy is one pool job, so large objects do not cost a pool
+        round trip per chunk; ``on_chunk`` sees every chunk (e.g. to hash it).
+
+        Returns:
+            int: Number of bytes copied
+        """
+
+        def _copy() -> int:
+            size = 0
+            response = self.client.get_object(self.bucket, object_name)
+            try:
+                for chunk in response.stream(chunk_size or settings.STORAGE_PART_SIZE):
+                    destination.write(chunk)
+                    if on_chunk:
+                        on_chunk(chunk)
+                    size += len(chunk)
+            finally:
+                response.close()
+                response.release_conn()
+            return size
+
+        return await self.run(_copy)
+
+    async def fget_object(self, object_name: str, file_path: str) -> None:
+        """Download an object to a local file."""
+        await self.run(self.client.fget_object, self.bucket, object_name, file_path)
+
+    async def remove_object(self, object_name: str) -> None:
+        """Delete an object."""
+        await self.run(self.client.remove_object, self.bucket, object_name)
+
+    async def remove_objects(self, object_names: Iterable[str]) -> List[str]:
+        """
+        Delete several objects in bulk requests.
+
+        Returns:
+            List[str]: Names of objects that could not be deleted
+        """
+
+        def _remove() -> List[str]:
+            errors = self.client.remove_objects(
+                self.bucket, [DeleteObject(name) for name in object_names]
+            )
+            return [error.name for error in errors]
+
+        return await self.run(_remove)
+
+    async def remove_prefix(self, prefix: str) -> List[str]:
+        """
+        Delete every object whose key starts with ``prefix``.
+
+        Returns:
+            List[str]: Names of objects that could not be deleted
+        """
+
+        def _remove() -> List[str]:
+            names = [
+                obj.object_name
+                for obj in self.client.list_objects(self.bucket, prefix=prefix, recursive=True)
+            ]
+            if not names:
+                return []
+            errors = self.client.remove_objects(
+                self.bucket, [DeleteObject(name) for name in names]
+            )
+            return [error.name for error in errors]
+
+        return await self.run(_remove)
+
+    async def compose_object(self, object_name: str, source_names: List[str]) -> None:
+        """Concatenate existing objects server-side into ``object_name``."""
+        await self.run(
+            self.client.compose_object,
+            self.bucket,
+            object_name,
+            [ComposeSource(self.bucket, name) for name in source_names],
+        )
+
+    async def presigned_get_object(self, object_name: str, expires: timedelta) -> str:
+        """Generate a temporary download URL."""
+        return await self.run(
+            self.client.presigned_get_object,
+            bucket_name=self.bucket,
+            object_name=object_name,
+            expires=expires,
+        )
+
+
+def init_storage(check_bucket: bool = True) -> ObjectStorage:
+    """
+    Create the process-wide storage client and, by default, verify the bucket.
+
+    Also resets the thread pool, so it is safe to call in a freshly forked
+    worker process. The check blocks for up to the configured retries and
+    timeouts, so async callers pass ``check_bucket=False`` and await
+    ``ensure_bucket()`` instead. A bucket check failure is logged and retried
+    on first write.
+    """
+    global _storage, _executor
+    if _storage is not None:
+        _storage.close()
+    with _executor_lock:
+        _executor = None
+    _storage = ObjectStorage()
+    if not check_bucket:
+        return _storage
+
+    try:
+        _storage.ensure_bucket_sync()
+    except Exception as e:
+        logger.warning(f"Storage bucket check failed, will retry on first write: {e}")
+    return _storage
+
+
+def get_storage() -> ObjectStorage:
+    """Return the process-wide storage client, creating it on first use."""
+    if _storage is None:
+        return init_storage(check_bucket=False)
+    return _storage
+
+
+def close_storage() -> None:
+    """Release the storage connection pool and thread pool."""
+    global _storage, _executor
+    if _storage is not None:
+        _storage.close()
+        _storage = None
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
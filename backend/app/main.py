@@ -17,6 +17,7 @@ from sqlalchemy import select
 from app.api.v1 import api_router
 from app.core.config import settings
 from app.core.database import close_db, init_db, AsyncSessionLocal
+from app.core.storage import close_storage, init_storage
 from app.core.exceptions import (
     BaseCustomException,
     custom_exception_handler,
@@ -63,6 +64,15 @@ async def lifespan(app: FastAPI):
         await init_db()
         logger.info("Database initialized successfully")
 
+        # Shared object storage client; the bucket check runs on the storage
+        # thread pool so an unreachable MinIO does not block the event loop
+        storage = init_storage(check_bucket=False)
+        try:
+            await storage.ensure_bucket()
+        except Exception as e:
+            logger.warning(f"Storage bucket check failed, will retry on first write: {e}")
+        logger.info("Object storage client initialized")
+
         # Bootstrap first superuser if enabled
         if settings.SEED_ADMIN:
             try:
@@ -118,6 +128,9 @@ async def lifespan(app: FastAPI):
         await close_db()
         logger.info("Database connections closed")
 
+        close_storage()
+        logger.info("Object storage connections closed")
+
         # Add any other cleanup tasks here
 
         logger.info("Application shutdown complete")
@@ -13,12 +13,16 @@ from app.models.enums import (
     ReviewStatus,
     TaskPriority,
     TaskStatus,
+    UploadSessionStatus,
     VehicleTypeSource,
 )
+from app.models.file_stats import ProjectFileStats
+from app.models.import_ledger import ImportLedgerEntry
 from app.models.notification import Notification
 from app.models.pointcloud import PointCloudFile
 from app.models.project import Project, ProjectMember
 from app.models.task import Task
+from app.models.upload_session import UploadSession
 from app.models.user import User
 from app.models.vehicle_type import GlobalVehicleType, ProjectVehicleType
 
@@ -36,6 +40,7 @@ __all__ = [
     "AnnotationStatus",
     "ReviewStatus",
     "FileStatus",
+    "UploadSessionStatus",
     "VehicleTypeSource",
     "NotificationType",
     "NotificationStatus",
@@ -49,5 +54,8 @@ __all__ = [
     "GlobalVehicleType",
     "ProjectVehicleType",
     "PointCloudFile",
+    "UploadSession",
+    "ImportLedgerEntry",
+    "ProjectFileStats",
     "Notification",
 ]
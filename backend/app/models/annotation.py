@@ -11,9 +11,11 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
@@ -26,6 +28,33 @@ class Annotation(BaseProjectModel):
     """Annotation model for point cloud labeling."""
 
     __tablename__ = "annotations"
+    __table_args__ = (
+        # Keyset pagination of the annotation listings and the review queue
+        Index(
+            "ix_annotations_annotator_project_created",
+            "annotator_id",
+            "project_id",
+            "created_at",
+            "id",
+        ),
+        Index("ix_annotations_created", "created_at", "id"),
+        Index("ix_annotations_status_created", "status", "created_at", "id"),
+        Index(
+            "ix_annotations_pending_review",
+            "project_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'SUBMITTED'"),
+        ),
+        # Project dashboards and per-annotator counts filter on status
+        Index("ix_annotations_project_status", "project_id", "status"),
+        Index(
+            "ix_annotations_annotator_project_status",
+            "annotator_id",
+            "project_id",
+            "status",
+        ),
+    )
 
     # Task and User
     task_id = Column(
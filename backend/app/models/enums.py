@@ -80,6 +80,14 @@ class FileStatus(str, Enum):
     DELETED = "deleted"  # 已刪除
 
 
+class UploadSessionStatus(str, Enum):
+    """Resumable upload session status."""
+
+    ACTIVE = "active"  # 接收分塊中
+    COMPLETED = "completed"  # 已完成
+    ABORTED = "aborted"  # 已取消
+
+
 class VehicleTypeSource(str, Enum):
     """Vehicle type source."""
 
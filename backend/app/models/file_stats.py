@@ -0,0 +1,43 @@
+"""Per-project file statistics rollup model definitions."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Enum, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+
+from app.models.base import Base
+from app.models.enums import FileStatus
+
+
+class ProjectFileStats(Base):
+    """
+    Running totals of a project's point cloud files per status and extension.
+
+    Maintained in the same transaction as every change to ``pointcloud_files``
+    (see ``app.services.file_stats``), so reading a project's statistics
+    touches a handful of rows whatever the number of files.
+    """
+
+    __tablename__ = "project_file_stats"
+
+    project_id = Column(
+        PostgresUUID(as_uuid=True),
+        ForeignKey("projects.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    status = Column(Enum(FileStatus), primary_key=True)
+    file_extension = Column(String(10), primary_key=True)
+
+    file_count = Column(BigInteger, default=0, nullable=False)
+    total_size = Column(BigInteger, default=0, nullable=False)
+    total_points = Column(BigInteger, default=0, nullable=False)
+    largest_file_size = Column(BigInteger, default=0, nullable=False)
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ProjectFileStats(project_id={self.project_id}, status={self.status}, "
+            f"extension='{self.file_extension}', files={self.file_count})>"
+        )
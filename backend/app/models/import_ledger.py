@@ -0,0 +1,43 @@
+"""Local folder import ledger model definitions."""
+
+from sqlalchemy import BigInteger, Column, ForeignKey, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseProjectModel
+
+
+class ImportLedgerEntry(BaseProjectModel):
+    """A server-side file already imported into a project by a folder import."""
+
+    __tablename__ = "import_ledger"
+    __table_args__ = (
+        UniqueConstraint("project_id", "relative_path", name="uq_import_ledger_project_path"),
+    )
+
+    # Source File (path relative to the raw_data directory)
+    relative_path = Column(String(1024), nullable=False)
+    file_size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    checksum = Column(String(64), nullable=False)
+
+    # Result
+    pointcloud_file_id = Column(
+        PostgresUUID(as_uuid=True),
+        ForeignKey("pointcloud_files.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    imported_by = Column(
+        PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+    )
+
+    # Relationships
+    pointcloud_file = relationship("PointCloudFile")
+    importer = relationship("User", foreign_keys=[imported_by])
+
+    def __repr__(self) -> str:
+        return f"<ImportLedgerEntry(project_id={self.project_id}, path='{self.relative_path}')>"
+
+    def matches(self, file_size: int, mtime_ns: int) -> bool:
+        """Check whether the file on disk still looks like the imported one."""
+        return self.file_size == file_size and self.mtime_ns == mtime_ns
@@ -10,10 +10,14 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
@@ -22,6 +26,11 @@ from app.models.base import BaseProjectModel
 from app.models.enums import FileStatus
 
 
+def footprint_box(min_x, min_y, max_x, max_y):
+    """PostgreSQL ``box`` of an XY extent, for the GiST footprint index and ``&&`` tests."""
+    return func.box(func.point(min_x, min_y), func.point(max_x, max_y))
+
+
 class PointCloudFile(BaseProjectModel):
     """Point cloud file model for storing file metadata and processing status."""
 
@@ -30,7 +39,14 @@ class PointCloudFile(BaseProjectModel):
     # Basic Information
     filename = Column(String(255), nullable=False, index=True)
     original_filename = Column(String(255), nullable=False)
-    file_path = Column(String(500), nullable=False)  # Path in storage
+    # Path in storage; several records may share one object (deduplication)
+    file_path = Column(String(500), nullable=False, index=True)
+    # Canonical float32 .npy (x, y, z[, intensity]) derived from file_path at ingest
+    canonical_path = Column(String(500), nullable=True)
+    # Point count of each stored preview level, coarsest first
+    lod_levels = Column(JSON, nullable=True)
+    # Node count of the octree tiling of large clouds (hierarchy index in storage)
+    octree_nodes = Column(Integer, nullable=True)
 
     # File Properties
     file_size = Column(BigInteger, nullable=False)  # Size in bytes
@@ -60,14 +76,13 @@ class PointCloudFile(BaseProjectModel):
     dimensions = Column(Integer, nullable=True)  # Usually 3 for x,y,z
 
     # Bounding Box
-    min_x = Column(
-        String(50), nullable=True
-    )  # Using string to avoid float precision issues
-    max_x = Column(String(50), nullable=True)
-    min_y = Column(String(50), nullable=True)
-    max_y = Column(String(50), nullable=True)
-    min_z = Column(String(50), nullable=True)
-    max_z = Column(String(50), nullable=True)
+    # Double precision, so files can be filtered and aggregated by extent in SQL
+    min_x = Column(Float, nullable=True)
+    max_x = Column(Float, nullable=True)
+    min_y = Column(Float, nullable=True)
+    max_y = Column(Float, nullable=True)
+    min_z = Column(Float, nullable=True)
+    max_z = Column(Float, nullable=True)
 
     # Quality Metrics
     data_quality = Column(Integer, nullable=True)  # 1-10 scale
@@ -82,7 +97,7 @@ class PointCloudFile(BaseProjectModel):
     error_details = Column(JSON, nullable=True)
 
     # Checksum for integrity
-    checksum = Column(String(64), nullable=True)  # SHA-256
+    checksum = Column(String(64), nullable=True, index=True)  # SHA-256
 
     # Relationships
     project = relationship("Project", back_populates="pointcloud_files")
@@ -153,8 +168,9 @@ class PointCloudFile(BaseProjectModel):
     @property
     def bounding_box(self) -> Optional[Dict[str, float]]:
         """Get bounding box as a dictionary."""
-        if not all(
-            [self.min_x, self.max_x, self.min_y, self.max_y, self.min_z, self.max_z]
+        if any(
+            value is None
+            for value in (self.min_x, self.max_x, self.min_y, self.max_y, self.min_z, self.max_z)
         ):
             return None
 
@@ -205,12 +221,67 @@ class PointCloudFile(BaseProjectModel):
         self.dimensions = dimensions
 
         if bounding_box:
-            self.min_x = str(bounding_box["min_x"])
-            self.max_x = str(bounding_box["max_x"])
-            self.min_y = str(bounding_box["min_y"])
-            self.max_y = str(bounding_box["max_y"])
-            self.min_z = str(bounding_box["min_z"])
-            self.max_z = str(bounding_box["max_z"])
+            self.min_x = float(bounding_box["min_x"])
+            self.max_x = float(bounding_box["max_x"])
+            self.min_y = float(bounding_box["min_y"])
+            self.max_y = float(bounding_box["max_y"])
+            self.min_z = float(bounding_box["min_z"])
+            self.max_z = float(bounding_box["max_z"])
+
+    def set_quality_metrics(
+        self,
+        data_quality: Optional[int],
+        has_noise: bool,
+        has_outliers: bool,
+        details: Optional[Dict] = None,
+    ) -> None:
+        """Set the results of the quality stage (``details`` goes to extra_data)."""
+        self.data_quality = data_quality
+        self.has_noise = has_noise
+        self.has_outliers = has_outliers
+        extra_data = dict(self.extra_data or {})
+        if details is None:
+            extra_data.pop("quality", None)
+        else:
+            extra_data["quality"] = details
+        self.extra_data = extra_data or None
+
+    def copy_analysis_from(self, other: "PointCloudFile") -> None:
+        """Copy analysis results from a record of the same content."""
+        self.point_count = other.point_count
+        self.dimensions = other.dimensions
+        self.min_x, self.max_x = other.min_x, other.max_x
+        self.min_y, self.max_y = other.min_y, other.max_y
+        self.min_z, self.max_z = other.min_z, other.max_z
+        self.data_quality = other.data_quality
+        self.has_noise = other.has_noise
+        self.has_outliers = other.has_outliers
+        self.extra_data = dict(other.extra_data) if other.extra_data else None
+        self.canonical_path = other.canonical_path
+        self.lod_levels = list(other.lod_levels) if other.lod_levels is not None else None
+        self.octree_nodes = other.octree_nodes
+        self.error_message = None
+        self.error_details = None
+
+    @property
+    def has_canonical_points(self) -> bool:
+        """Check if the canonical float32 copy has been written."""
+        return bool(self.canonical_path)
+
+    @property
+    def descriptors(self) -> Optional[Dict]:
+        """Geometric descriptors computed at ingest, if any."""
+        return (self.extra_data or {}).get("descriptors")
+
+    @property
+    def quality_details(self) -> Optional[Dict]:
+        """Statistics of the quality stage, if it has run."""
+        return (self.extra_data or {}).get("quality")
+
+    @property
+    def has_octree(self) -> bool:
+        """Check if the cloud has been tiled into an octree."""
+        return bool(self.canonical_path and self.octree_nodes)
 
     def can_create_tasks(self) -> bool:
         """Check if tasks can be created for this file."""
@@ -239,3 +310,23 @@ class PointCloudFile(BaseProjectModel):
 
         completed_tasks = self.get_completed_task_count()
         return (completed_tasks / total_tasks) * 100
+
+
+# Spatial index over the XY footprint; file search intersects it with ``&&``
+Index(
+    "ix_pointcloud_files_footprint",
+    footprint_box(
+        PointCloudFile.min_x, PointCloudFile.min_y, PointCloudFile.max_x, PointCloudFile.max_y
+    ),
+    postgresql_using="gist",
+)
+
+# Newest-first listing of live files (deleted ones are skipped by the file
+# list and the search) and its keyset cursor on (created_at, id)
+Index(
+    "ix_pointcloud_files_project_live",
+    PointCloudFile.project_id,
+    PointCloudFile.created_at,
+    PointCloudFile.id,
+    postgresql_where=text("status <> 'DELETED'"),
+)
@@ -9,10 +9,12 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
 from sqlalchemy.orm import relationship
@@ -161,6 +163,20 @@ class ProjectMember(BaseUUIDModel):
     # Unique constraint
     __table_args__ = (
         UniqueConstraint("project_id", "user_id", name="uq_project_member"),
+        # Membership and role checks of active members, answered from the index alone
+        Index(
+            "ix_project_members_active",
+            "project_id",
+            "user_id",
+            postgresql_include=["role"],
+            postgresql_where=text("is_active"),
+        ),
+        Index(
+            "ix_project_members_user_active",
+            "user_id",
+            postgresql_include=["project_id", "role"],
+            postgresql_where=text("is_active"),
+        ),
     )
 
     def __repr__(self) -> str:
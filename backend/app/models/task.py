@@ -9,6 +9,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -39,6 +40,20 @@ class Task(BaseProjectModel):
     """Task model for annotation workflow."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination of the project and assignee task lists
+        Index("ix_tasks_project_created", "project_id", "created_at", "id"),
+        Index("ix_tasks_assignee_created", "assigned_to", "created_at", "id"),
+        # Filtered task lists and the per-status task statistics
+        Index(
+            "ix_tasks_project_status_priority",
+            "project_id",
+            "status",
+            "priority",
+            "created_at",
+        ),
+        Index("ix_tasks_assignee_status", "assigned_to", "status"),
+    )
 
     # Basic Information
     name = Column(String(200), nullable=False, index=True)
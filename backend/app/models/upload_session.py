@@ -0,0 +1,119 @@
+"""Resumable upload session model definitions."""
+
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import UUID as PostgresUUID
+from sqlalchemy.orm import relationship
+
+from app.models.base import BaseProjectModel
+from app.models.enums import UploadSessionStatus
+
+
+class UploadSession(BaseProjectModel):
+    """Chunked, resumable upload of a single point cloud file."""
+
+    __tablename__ = "upload_sessions"
+
+    # Target File
+    original_filename = Column(String(255), nullable=False)
+    file_extension = Column(String(10), nullable=False)
+    file_size = Column(BigInteger, nullable=False)  # Declared total size in bytes
+    description = Column(Text, nullable=True)
+    expected_checksum = Column(String(64), nullable=True)  # Optional SHA-256
+
+    # Chunking
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False)
+    received_chunks = Column(JSON, nullable=False, default=dict)  # {index: {size, sha256}}
+
+    # Status
+    status = Column(
+        Enum(UploadSessionStatus),
+        default=UploadSessionStatus.ACTIVE,
+        nullable=False,
+        index=True,
+    )
+    expires_at = Column(DateTime, nullable=False)
+    completed_at = Column(DateTime, nullable=True)
+
+    # Ownership
+    created_by = Column(
+        PostgresUUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+    )
+    pointcloud_file_id = Column(
+        PostgresUUID(as_uuid=True), ForeignKey("pointcloud_files.id"), nullable=True
+    )
+
+    # Relationships
+    creator = relationship("User", foreign_keys=[created_by])
+    pointcloud_file = relationship("PointCloudFile")
+
+    def __repr__(self) -> str:
+        return f"<UploadSession(id={self.id}, filename='{self.original_filename}', status='{self.status}')>"
+
+    @property
+    def is_expired(self) -> bool:
+        """Check if the session can no longer accept chunks."""
+        return datetime.utcnow() > self.expires_at
+
+    @property
+    def received_indexes(self) -> List[int]:
+        """Sorted indexes of chunks stored so far."""
+        return sorted(int(i) for i in (self.received_chunks or {}))
+
+    @property
+    def missing_indexes(self) -> List[int]:
+        """Indexes of chunks still to be uploaded."""
+        received = set(self.received_indexes)
+        return [i for i in range(self.total_chunks) if i not in received]
+
+    @property
+    def received_bytes(self) -> int:
+        """Total bytes stored so far."""
+        return sum(c["size"] for c in (self.received_chunks or {}).values())
+
+    @property
+    def received_ranges(self) -> List[Tuple[int, int]]:
+        """Received byte ranges as inclusive ``(start, end)`` pairs, merged."""
+        ranges: List[Tuple[int, int]] = []
+        for index in self.received_indexes:
+            start = index * self.chunk_size
+            end = start + self.received_chunks[str(index)]["size"] - 1
+            if ranges and ranges[-1][1] + 1 == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def expected_chunk_size(self, index: int) -> int:
+        """Exact byte size the chunk at ``index`` must have."""
+        if index == self.total_chunks - 1:
+            return self.file_size - self.chunk_size * (self.total_chunks - 1)
+        return self.chunk_size
+
+    @property
+    def chunk_prefix(self) -> str:
+        """Storage key prefix shared by all staged chunks of the session."""
+        return f"projects/{self.project_id}/uploads/{self.id}/"
+
+    def chunk_object_name(self, index: int) -> str:
+        """Storage key of a staged chunk."""
+        return f"{self.chunk_prefix}{index:06d}"
+
+    def record_chunk(self, index: int, size: int, sha256: str) -> None:
+        """Record a stored chunk (reassigns the JSON column so it is flushed)."""
+        chunks: Dict[str, Dict] = dict(self.received_chunks or {})
+        chunks[str(index)] = {"size": size, "sha256": sha256}
+        self.received_chunks = chunks
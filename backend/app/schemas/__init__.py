@@ -20,6 +20,8 @@ from app.schemas.annotation import (
     VehicleTypeInfo,
 )
 from app.schemas.pointcloud import (
+    BatchUploadError,
+    BatchUploadResponse,
     BoundingBox,
     FileDownloadResponse,
     FileUploadResponse,
@@ -32,6 +34,9 @@ from app.schemas.pointcloud import (
     PointCloudFileUpdate,
     PointCloudPreview,
     PointCloudStats,
+    UploadChunkResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
 )
 from app.schemas.project import (
     ProjectBase,
@@ -125,8 +130,13 @@ __all__ = [
     "PointCloudFileSummary",
     "PointCloudFileListResponse",
     "FileUploadResponse",
+    "BatchUploadError",
+    "BatchUploadResponse",
     "FileDownloadResponse",
     "PointCloudAnalysis",
     "PointCloudPreview",
     "PointCloudStats",
+    "UploadSessionCreate",
+    "UploadSessionResponse",
+    "UploadChunkResponse",
 ]
@@ -200,10 +200,11 @@ class AnnotationListResponse(BaseModel):
     """Schema for annotation list response with pagination."""
 
     items: List[AnnotationResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when not counted
+    page: Optional[int] = None  # None for pages read by cursor
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class AnnotationSummary(BaseModel):
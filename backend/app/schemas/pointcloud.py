@@ -6,7 +6,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from app.models.enums import FileStatus
+from app.models.enums import FileStatus, UploadSessionStatus
 
 
 class BoundingBox(BaseModel):
@@ -75,6 +75,15 @@ class PointCloudFileResponse(PointCloudFileBase):
     data_quality: Optional[int] = Field(None, description="Data quality score (1-10)")
     has_noise: bool = Field(False, description="Has noise data")
     has_outliers: bool = Field(False, description="Has outlier points")
+    has_canonical_points: bool = Field(
+        False, description="Canonical float32 .npy copy is available"
+    )
+    lod_levels: Optional[List[int]] = Field(
+        None, description="Point count of each preview level, coarsest first"
+    )
+    octree_nodes: Optional[int] = Field(
+        None, description="Node count of the octree tiling, if the cloud was tiled"
+    )
 
     # Additional data
     extra_data: Optional[Dict] = Field(None, description="Additional metadata")
@@ -128,6 +137,10 @@ class PointCloudFileSummary(BaseModel):
     file_size: int = Field(..., description="File size in bytes")
     status: FileStatus = Field(..., description="File status")
     point_count: Optional[int] = Field(None, description="Number of points")
+    data_quality: Optional[int] = Field(None, description="Data quality score (1-10)")
+    has_noise: bool = Field(False, description="Has noise data")
+    has_outliers: bool = Field(False, description="Has outlier points")
+    bounding_box: Optional[BoundingBox] = Field(None, description="3D bounding box")
     upload_completed_at: Optional[datetime] = Field(
         None, description="Upload completion time"
     )
@@ -144,9 +157,14 @@ class PointCloudFileListResponse(BaseModel):
 
     items: List[PointCloudFileSummary] = Field(..., description="List of files")
     total: int = Field(..., description="Total number of files")
-    page: int = Field(..., description="Current page number")
+    page: Optional[int] = Field(
+        None, description="Current page number, None for pages read by cursor"
+    )
     size: int = Field(..., description="Page size")
     pages: int = Field(..., description="Total number of pages")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, None on the last page"
+    )
 
 
 class FileUploadResponse(BaseModel):
@@ -166,6 +184,67 @@ class FileUploadResponse(BaseModel):
     message: str = Field("File uploaded successfully", description="Status message")
 
 
+class BatchUploadError(BaseModel):
+    """Schema for a file that failed within a batch upload."""
+
+    filename: str = Field(..., description="Name of the failed file")
+    detail: str = Field(..., description="Reason for the failure")
+
+
+class BatchUploadResponse(BaseModel):
+    """Schema for batch and archive upload responses."""
+
+    items: List[FileUploadResponse] = Field(..., description="Uploaded files")
+    errors: List[BatchUploadError] = Field(
+        default_factory=list, description="Files that could not be uploaded"
+    )
+    total: int = Field(..., description="Number of files in the batch")
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable upload."""
+
+    filename: str = Field(..., min_length=1, max_length=255, description="Original filename")
+    file_size: int = Field(..., gt=0, description="Total file size in bytes")
+    chunk_size: Optional[int] = Field(
+        None, description="Requested chunk size in bytes (server default if omitted)"
+    )
+    checksum: Optional[str] = Field(
+        None, min_length=64, max_length=64, description="Expected SHA-256 of the whole file"
+    )
+    description: Optional[str] = Field(None, description="File description")
+
+
+class UploadSessionResponse(BaseModel):
+    """Schema for resumable upload session state."""
+
+    session_id: UUID = Field(..., description="Upload session ID")
+    filename: str = Field(..., description="Original filename")
+    file_size: int = Field(..., description="Total file size in bytes")
+    chunk_size: int = Field(..., description="Chunk size in bytes")
+    total_chunks: int = Field(..., description="Number of chunks")
+    status: UploadSessionStatus = Field(..., description="Session status")
+    received_chunks: List[int] = Field(..., description="Indexes of stored chunks")
+    missing_chunks: List[int] = Field(..., description="Indexes still to upload")
+    received_ranges: List[List[int]] = Field(
+        ..., description="Stored byte ranges as inclusive [start, end] pairs"
+    )
+    received_bytes: int = Field(..., description="Bytes stored so far")
+    expires_at: datetime = Field(..., description="Session expiration time")
+    file_id: Optional[UUID] = Field(None, description="Created file ID once completed")
+
+
+class UploadChunkResponse(BaseModel):
+    """Schema for a stored upload chunk."""
+
+    session_id: UUID = Field(..., description="Upload session ID")
+    index: int = Field(..., description="Chunk index")
+    size: int = Field(..., description="Chunk size in bytes")
+    checksum: str = Field(..., description="Chunk SHA-256")
+    received_bytes: int = Field(..., description="Bytes stored so far")
+    missing_chunks: int = Field(..., description="Number of chunks still to upload")
+
+
 class FileDownloadResponse(BaseModel):
     """Schema for file download response."""
 
@@ -245,10 +245,11 @@ class TaskListResponse(BaseModel):
     """Paginated task list response."""
 
     items: List[TaskResponse]
-    total: int
-    page: int
+    total: Optional[int] = None  # None when not counted
+    page: Optional[int] = None  # None for pages read by cursor
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # None on the last page
 
 
 class TaskStats(BaseModel):
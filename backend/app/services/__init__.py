@@ -2,14 +2,22 @@
 
 from .annotation import AnnotationService
 from .auth import AuthService
+from .file_stats import FileStatsService
 from .file_upload import FileUploadService
+from .import_ledger import ImportLedgerService
 from .project import ProjectService
+from .quality import QualityService
 from .task import TaskService
+from .upload_session import UploadSessionService
 
 __all__ = [
     "AnnotationService",
     "AuthService",
+    "FileStatsService",
     "FileUploadService",
+    "ImportLedgerService",
     "ProjectService",
+    "QualityService",
     "TaskService",
+    "UploadSessionService",
 ]
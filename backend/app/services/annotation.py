@@ -17,6 +17,7 @@ from app.models.task import Task
 from app.models.user import User
 from app.models.vehicle_type import ProjectVehicleType
 from app.models.pointcloud import PointCloudFile
+from app.utils.pagination import decode_cursor, keyset_condition
 
 logger = logging.getLogger(__name__)
 
@@ -161,8 +162,14 @@ class AnnotationService:
         status: Optional[AnnotationStatus] = None,
         limit: int = 50,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Annotation]:
-        """Get annotations by user with optional status filter."""
+        """
+        Get annotations by user with optional status filter, newest first.
+
+        With a ``cursor`` the list continues after the annotation it names
+        and ``offset`` is ignored.
+        """
         conditions = [
             Annotation.annotator_id == annotator_id,
             Annotation.project_id == project_id,
@@ -179,13 +186,40 @@ class AnnotationService:
                 selectinload(Annotation.vehicle_type),
                 selectinload(Annotation.reviews)
             )
+            .order_by(Annotation.created_at.desc(), Annotation.id.desc())
             .limit(limit)
-            .offset(offset)
         )
+        if cursor:
+            query = query.where(
+                keyset_condition(
+                    (Annotation.created_at, Annotation.id),
+                    decode_cursor(cursor, (datetime, UUID)),
+                )
+            )
+        else:
+            query = query.offset(offset)
 
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def count_user_annotations(
+        self,
+        annotator_id: UUID,
+        project_id: UUID,
+        status: Optional[AnnotationStatus] = None,
+    ) -> int:
+        """Count the annotations ``get_user_annotations`` pages through."""
+        conditions = [
+            Annotation.annotator_id == annotator_id,
+            Annotation.project_id == project_id,
+        ]
+        if status:
+            conditions.append(Annotation.status == status)
+
+        return await self.db.scalar(
+            select(func.count(Annotation.id)).where(and_(*conditions))
+        )
+
     async def update_annotation(
         self,
         annotation_id: UUID,
@@ -379,13 +413,30 @@ class AnnotationService:
             raise
 
     async def get_pending_reviews(
-        self, project_id: UUID, reviewer_id: Optional[UUID] = None
+        self,
+        project_id: UUID,
+        limit: int = 50,
+        cursor: Optional[str] = None,
     ) -> List[Annotation]:
-        """Get annotations pending review."""
+        """
+        Get annotations pending review, oldest first.
+
+        The queue is read in pages of ``limit`` through the partial index on
+        submitted annotations; ``cursor`` continues after the annotation it
+        names.
+        """
         conditions = [
             Annotation.project_id == project_id,
             Annotation.status == AnnotationStatus.SUBMITTED,
         ]
+        if cursor:
+            conditions.append(
+                keyset_condition(
+                    (Annotation.created_at, Annotation.id),
+                    decode_cursor(cursor, (datetime, UUID)),
+                    descending=False,
+                )
+            )
 
         query = (
             select(Annotation)
@@ -396,11 +447,22 @@ class AnnotationService:
                 selectinload(Annotation.vehicle_type),
                 selectinload(Annotation.reviews),
             )
+            .order_by(Annotation.created_at, Annotation.id)
+            .limit(limit)
         )
 
         result = await self.db.execute(query)
         return result.scalars().all()
 
+    async def count_pending_reviews(self, project_id: UUID) -> int:
+        """Count the annotations pending review."""
+        return await self.db.scalar(
+            select(func.count(Annotation.id)).where(
+                Annotation.project_id == project_id,
+                Annotation.status == AnnotationStatus.SUBMITTED,
+            )
+        )
+
     async def get_annotation_statistics(
         self, project_id: UUID, annotator_id: Optional[UUID] = None
     ) -> Dict[str, Any]:
@@ -438,8 +500,15 @@ class AnnotationService:
         status: Optional[AnnotationStatus] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> Tuple[List[Annotation], int]:
-        """Get annotations across all projects (Admin/Reviewer)."""
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Annotation], Optional[int]]:
+        """
+        Get annotations across all projects (Admin/Reviewer), newest first.
+
+        With a ``cursor`` the list continues after the annotation it names
+        and ``offset`` is ignored. The total is None unless ``include_total``.
+        """
         query = select(Annotation)
         
         if status:
@@ -454,21 +523,30 @@ class AnnotationService:
             selectinload(Annotation.annotator),
             selectinload(Annotation.vehicle_type),
             selectinload(Annotation.reviews),
-        ).order_by(Annotation.updated_at.desc())
+        ).order_by(Annotation.created_at.desc(), Annotation.id.desc())
         
         # Get total count
-        count_query = select(func.count(Annotation.id))
-        if status:
-            count_query = count_query.where(Annotation.status == status)
-        
-        total = await self.db.scalar(count_query)
+        total = None
+        if include_total:
+            count_query = select(func.count(Annotation.id))
+            if status:
+                count_query = count_query.where(Annotation.status == status)
+            total = await self.db.scalar(count_query) or 0
         
         # Get items
-        query = query.limit(limit).offset(offset)
-        result = await self.db.execute(query)
+        if cursor:
+            query = query.where(
+                keyset_condition(
+                    (Annotation.created_at, Annotation.id),
+                    decode_cursor(cursor, (datetime, UUID)),
+                )
+            )
+        else:
+            query = query.offset(offset)
+        result = await self.db.execute(query.limit(limit))
         items = result.scalars().all()
         
-        return items, total or 0
+        return items, total
 
     async def get_global_annotation_statistics(self) -> Dict[str, Any]:
         """Get global annotation statistics."""
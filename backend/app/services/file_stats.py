@@ -0,0 +1,342 @@
+"""
+Project file statistics, aggregated in SQL and kept in a rollup table.
+
+``ProjectFileStats`` holds per-project totals by status and extension. An
+``after_flush`` hook on every session turns inserts, deletes and changes of
+``PointCloudFile`` rows into increments of those totals, executed in the
+same transaction, so ingest, deletion and status changes keep the rollup
+current without any caller having to remember it.
+
+Only changes made through ORM objects pass through the hook. Core or bulk
+statements such as ``update(PointCloudFile)`` or ``delete(PointCloudFile)``
+executed directly bypass it and leave the rollup stale; code issuing them
+must call ``FileStatsService.rebuild_project_stats`` for the projects they
+touch.
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, delete, event, func, inspect, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.enums import FileStatus
+from app.models.file_stats import ProjectFileStats
+from app.models.pointcloud import PointCloudFile
+from app.schemas.pointcloud import PointCloudStats
+
+logger = logging.getLogger(__name__)
+
+_MB = 1024 * 1024
+
+# PointCloudFile attributes the rollup depends on
+_TRACKED = ("project_id", "status", "file_extension", "file_size", "point_count")
+
+_Key = Tuple[UUID, FileStatus, str]
+# (status, extension, files, bytes, points, largest file in bytes)
+_Row = Tuple[FileStatus, str, int, int, int, int]
+
+
+class _Delta:
+    """Net change of one rollup row within a flush."""
+
+    __slots__ = ("files", "size", "points", "largest_added", "largest_removed")
+
+    def __init__(self):
+        self.files = 0
+        self.size = 0
+        self.points = 0
+        self.largest_added: Optional[int] = None
+        self.largest_removed: Optional[int] = None
+
+    def add(self, size: int, points: int) -> None:
+        self.files += 1
+        self.size += size
+        self.points += points
+        self.largest_added = max(self.largest_added or 0, size)
+
+    def remove(self, size: int, points: int) -> None:
+        self.files -= 1
+        self.size -= size
+        self.points -= points
+        self.largest_removed = max(self.largest_removed or 0, size)
+
+
+def _values(pointcloud_file: PointCloudFile, before: bool) -> Optional[Dict]:
+    """
+    Tracked values before or after the pending flush.
+
+    Returns None if a value is not loaded and so cannot be known here.
+    """
+    attrs = inspect(pointcloud_file).attrs
+    values = {}
+    for name in _TRACKED:
+        history = attrs[name].history
+        if before:
+            current = history.deleted or history.unchanged
+        else:
+            current = history.added or history.unchanged
+        if not current:
+            return None
+        values[name] = current[0]
+    return values
+
+
+def _record(deltas: Dict[_Key, _Delta], values: Dict, removed: bool) -> None:
+    key = (values["project_id"], values["status"], values["file_extension"])
+    size, points = values["file_size"] or 0, values["point_count"] or 0
+    if removed:
+        deltas[key].remove(size, points)
+    else:
+        deltas[key].add(size, points)
+
+
+def _collect(session: Session) -> Tuple[Dict[_Key, _Delta], Set[UUID]]:
+    """Rollup deltas of a flush, and projects whose rollup must be rebuilt instead."""
+    deltas: Dict[_Key, _Delta] = defaultdict(_Delta)
+    rebuild: Set[UUID] = set()
+
+    for obj in session.new:
+        if isinstance(obj, PointCloudFile):
+            _record(deltas, {name: getattr(obj, name) for name in _TRACKED}, removed=False)
+
+    for obj in session.deleted:
+        if isinstance(obj, PointCloudFile):
+            _record(deltas, {name: getattr(obj, name) for name in _TRACKED}, removed=True)
+
+    for obj in session.dirty:
+        if not isinstance(obj, PointCloudFile) or not session.is_modified(obj):
+            continue
+        before, after = _values(obj, before=True), _values(obj, before=False)
+        if before is None or after is None:
+            # A tracked value was not loaded (e.g. the instance was expired by a
+            # rollback before the change): recount the project instead. The
+            # project loads from the row if it is expired as well.
+            project_ids = inspect(obj).attrs.project_id.history.sum() or [obj.project_id]
+            rebuild.update(project_id for project_id in project_ids if project_id is not None)
+            continue
+        if before == after:
+            continue
+        _record(deltas, before, removed=True)
+        _record(deltas, after, removed=False)
+
+    return deltas, rebuild
+
+
+def _grouped_query(project_id, include_deleted: bool = False):
+    """Totals of a project's files per status and extension in one grouped query."""
+    stmt = (
+        select(
+            PointCloudFile.status,
+            PointCloudFile.file_extension,
+            func.count(),
+            func.coalesce(func.sum(PointCloudFile.file_size), 0),
+            func.coalesce(func.sum(PointCloudFile.point_count), 0),
+            func.coalesce(func.max(PointCloudFile.file_size), 0),
+        )
+        .where(PointCloudFile.project_id == project_id)
+        .group_by(PointCloudFile.status, PointCloudFile.file_extension)
+    )
+    if not include_deleted:
+        stmt = stmt.where(PointCloudFile.status != FileStatus.DELETED)
+    return stmt
+
+
+def _rebuild_statements(project_id: UUID) -> List:
+    """Statements replacing a project's rollup rows with a fresh count."""
+    grouped = _grouped_query(project_id, include_deleted=True).add_columns(
+        literal(project_id, ProjectFileStats.project_id.type), func.now()
+    )
+    return [
+        delete(ProjectFileStats).where(ProjectFileStats.project_id == project_id),
+        insert(ProjectFileStats).from_select(
+            [
+                "status",
+                "file_extension",
+                "file_count",
+                "total_size",
+                "total_points",
+                "largest_file_size",
+                "project_id",
+                "updated_at",
+            ],
+            grouped,
+        ),
+    ]
+
+
+def _apply(session: Session, deltas: Dict[_Key, _Delta], rebuild: Set[UUID]) -> None:
+    connection = session.connection()
+    table = ProjectFileStats.__table__
+
+    # Rows are locked in a fixed order so that concurrent flushes touching the
+    # same rollup rows cannot deadlock each other
+    ordered = sorted(deltas.items(), key=lambda kv: (str(kv[0][0]), kv[0][1].value, kv[0][2]))
+    for (project_id, file_status, extension), delta in ordered:
+        if project_id in rebuild:
+            continue
+        key = and_(
+            table.c.project_id == project_id,
+            table.c.status == file_status,
+            table.c.file_extension == extension,
+        )
+        if delta.largest_added is not None:
+            stmt = insert(table).values(
+                project_id=project_id,
+                status=file_status,
+                file_extension=extension,
+                file_count=delta.files,
+                total_size=delta.size,
+                total_points=delta.points,
+                largest_file_size=delta.largest_added,
+                updated_at=func.now(),
+            )
+            connection.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.project_id, table.c.status, table.c.file_extension],
+                    set_={
+                        "file_count": table.c.file_count + delta.files,
+                        "total_size": table.c.total_size + delta.size,
+                        "total_points": table.c.total_points + delta.points,
+                        "largest_file_size": func.greatest(
+                            table.c.largest_file_size, delta.largest_added
+                        ),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        elif delta.files or delta.size or delta.points:
+            # Only removals: the row should exist. If it does not, the rollup
+            # has drifted (e.g. a bulk statement bypassed this hook): recount
+            result = connection.execute(
+                update(table)
+                .where(key)
+                .values(
+                    file_count=table.c.file_count + delta.files,
+                    total_size=table.c.total_size + delta.size,
+                    total_points=table.c.total_points + delta.points,
+                    updated_at=func.now(),
+                )
+            )
+            if result.rowcount == 0:
+                logger.warning(f"File stats of project {project_id} out of sync: rebuilding")
+                rebuild.add(project_id)
+                continue
+
+        if delta.largest_removed is not None:
+            # The largest file may have left this row: look the maximum up again
+            largest = (
+                select(func.coalesce(func.max(PointCloudFile.file_size), 0))
+                .where(
+                    PointCloudFile.project_id == project_id,
+                    PointCloudFile.status == file_status,
+                    PointCloudFile.file_extension == extension,
+                )
+                .scalar_subquery()
+            )
+            connection.execute(
+                update(table)
+                .where(and_(key, table.c.largest_file_size <= delta.largest_removed))
+                .values(largest_file_size=largest)
+            )
+
+    for project_id in sorted(rebuild, key=str):
+        for stmt in _rebuild_statements(project_id):
+            connection.execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_file_stats(session: Session, flush_context) -> None:
+    """Fold the flushed PointCloudFile changes into the rollup (same transaction)."""
+    deltas, rebuild = _collect(session)
+    if deltas or rebuild:
+        _apply(session, deltas, rebuild)
+
+
+def _fold(rows: Iterable[_Row]) -> PointCloudStats:
+    """Combine per status/extension totals into the API statistics."""
+    total_files = total_size = total_points = largest = 0
+    by_status: Dict[FileStatus, int] = defaultdict(int)
+    file_types: Dict[str, int] = defaultdict(int)
+    for file_status, extension, files, size, points, largest_size in rows:
+        if file_status == FileStatus.DELETED or files <= 0:
+            continue
+        total_files += files
+        total_size += size
+        total_points += points
+        largest = max(largest, largest_size)
+        by_status[file_status] += files
+        file_types[extension] += files
+
+    return PointCloudStats(
+        total_files=total_files,
+        total_size=total_size,
+        total_points=total_points,
+        uploaded_files=by_status[FileStatus.UPLOADED],
+        processing_files=by_status[FileStatus.PROCESSING],
+        failed_files=by_status[FileStatus.FAILED],
+        file_types=dict(file_types),
+        average_file_size=total_size / total_files / _MB if total_files else 0,
+        largest_file_size=largest / _MB,
+    )
+
+
+class FileStatsService:
+    """Service for project file statistics."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize file stats service."""
+        self.db = db
+
+    async def aggregate_project_stats(self, project_id: UUID) -> PointCloudStats:
+        """Statistics of a project's files from one grouped query over pointcloud_files."""
+        result = await self.db.execute(_grouped_query(project_id))
+        return _fold(result.all())
+
+    async def get_project_stats(self, project_id: UUID) -> PointCloudStats:
+        """
+        Statistics of a project's files (deleted files excluded).
+
+        Read from the rollup table, so the cost does not depend on the
+        number of files; with ``FILE_STATS_ROLLUP`` off, aggregated directly.
+        """
+        if not settings.FILE_STATS_ROLLUP:
+            return await self.aggregate_project_stats(project_id)
+
+        result = await self.db.execute(
+            select(
+                ProjectFileStats.status,
+                ProjectFileStats.file_extension,
+                ProjectFileStats.file_count,
+                ProjectFileStats.total_size,
+                ProjectFileStats.total_points,
+                ProjectFileStats.largest_file_size,
+            ).where(ProjectFileStats.project_id == project_id)
+        )
+        return _fold(result.all())
+
+    async def count_files(
+        self, project_id: UUID, status_filter: Optional[FileStatus] = None
+    ) -> int:
+        """Number of a project's files (any status but DELETED, or one) from the rollup."""
+        stmt = select(func.coalesce(func.sum(ProjectFileStats.file_count), 0)).where(
+            ProjectFileStats.project_id == project_id
+        )
+        if status_filter:
+            stmt = stmt.where(ProjectFileStats.status == status_filter)
+        else:
+            stmt = stmt.where(ProjectFileStats.status != FileStatus.DELETED)
+        result = await self.db.execute(stmt)
+        return int(result.scalar_one())
+
+    async def rebuild_project_stats(self, project_ids: Sequence[UUID]) -> None:
+        """Recount the rollup rows of projects from pointcloud_files and commit."""
+        for project_id in project_ids:
+            for stmt in _rebuild_statements(project_id):
+                await self.db.execute(stmt)
+        await self.db.commit()
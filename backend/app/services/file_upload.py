@@ -1,23 +1,197 @@
 """File upload service for point cloud data."""
 
+import asyncio
 import hashlib
+import io
+import json
+import logging
+import mmap
 import os
+import re
+import shutil
+import tempfile
+import zipfile
+from contextlib import ExitStack, nullcontext
 from datetime import datetime
-from pathlib import Path
-from typing import BinaryIO, Dict, Optional
+from pathlib import Path, PurePosixPath
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID, uuid4
 
-import numpy as np
 from fastapi import HTTPException, UploadFile, status
-from minio import Minio
 from minio.error import S3Error
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from starlette.concurrency import run_in_threadpool
 
+from app.celery_app import celery_app
 from app.core.config import settings
+from app.core.storage import get_storage
 from app.models.enums import FileStatus
-from app.models.pointcloud import PointCloudFile
+from app.models.pointcloud import PointCloudFile, footprint_box
 from app.models.project import Project
+from app.services.file_stats import FileStatsService
+from app.utils.pagination import decode_cursor, keyset_condition
+from app.utils.pointcloud_io import (
+    QUANTIZED_MEDIA_TYPE,
+    OctreeNode,
+    PointCloudFormatError,
+    analyze_point_cloud,
+    available_compressions,
+    build_octree,
+    compute_descriptors,
+    load_numpy_points,
+    lod_rows,
+    octree_hierarchy,
+    point_columns,
+    validate_point_cloud_header,
+    write_point_columns,
+    write_quantized_points,
+)
+
+logger = logging.getLogger(__name__)
+
+# Celery task names of the background analysis stage (see app.worker)
+PROCESS_FILE_TASK = "app.worker.process_pointcloud_file"
+REPROCESS_PROJECT_TASK = "app.worker.reprocess_project_files"
+QUALITY_TASK = "app.worker.score_pointcloud_quality"
+
+# Records whose stored object can be shared by a new upload of the same content
+_REUSABLE_STATUSES = (FileStatus.UPLOADED, FileStatus.PROCESSING, FileStatus.PROCESSED)
+
+# Octree node names: "r" plus one child digit per level
+_OCTREE_NODE_NAME = re.compile(r"^r[0-7]{0,10}$")
+
+
+class _HashingReader:
+    """Read-through wrapper that hashes and size-checks a stream as it is consumed."""
+
+    def __init__(self, stream: BinaryIO, max_size: int):
+        self._stream = stream
+        self._max_size = max_size
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._stream.read(size)
+        self.size += len(chunk)
+        if self.size > self._max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE}MB",
+            )
+        self._sha256.update(chunk)
+        return chunk
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of everything read so far."""
+        return self._sha256.hexdigest()
+
+
+def _dedup_enabled() -> bool:
+    return settings.DEDUP_SCOPE in ("project", "global")
+
+
+def _hash_stream(stream: BinaryIO, max_size: int) -> Tuple[int, str]:
+    """Size and SHA-256 of a stream, read in parts from the start."""
+    stream.seek(0)
+    reader = _HashingReader(stream, max_size)
+    while reader.read(settings.STORAGE_PART_SIZE):
+        pass
+    stream.seek(0)
+    return reader.size, reader.checksum
+
+
+def _hash_path(path: Path, max_size: int) -> Tuple[int, str]:
+    """Size and SHA-256 of a local file, hashed through a read-only mmap."""
+    size = path.stat().st_size
+    if size > max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE}MB",
+        )
+    if size == 0:
+        return 0, hashlib.sha256().hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return size, hashlib.sha256(mapped).hexdigest()
+
+
+def _canonical_path(file_path: str) -> str:
+    """Storage key of the canonical float32 copy of ``file_path``."""
+    return str(PurePosixPath(file_path).with_suffix(".points.npy"))
+
+
+def _lod_path(file_path: str, level: int) -> str:
+    """Storage key of preview level ``level`` of ``file_path``."""
+    return str(PurePosixPath(file_path).with_suffix(f".lod{level}.npy"))
+
+
+def _outlier_mask_path(file_path: str) -> str:
+    """Storage key of the per-point outlier/noise mask of ``file_path``."""
+    return str(PurePosixPath(file_path).with_suffix(".outliers.npy"))
+
+
+def _octree_path(file_path: str, node: str) -> str:
+    """Storage key of an octree node (or ``hierarchy.json``) of ``file_path``."""
+    return f"{PurePosixPath(file_path).with_suffix('.octree')}/{node}"
+
+
+def _quantized_path(
+    file_path: str, bits: int, attributes: bool, morton: bool, delta: bool, compression: str
+) -> str:
+    """Storage key of one encoding of ``file_path`` in the quantized transport format."""
+    flags = ("m" if morton else "") + ("d" if delta else "") + ("i" if attributes else "")
+    return str(PurePosixPath(file_path).with_suffix(f".q{bits}{flags}.{compression}"))
+
+
+def _content_prefix(file_path: str) -> str:
+    """Key prefix shared by an object and every artifact derived from it."""
+    return f"{PurePosixPath(file_path).with_suffix('')}."
+
+
+class _BatchItem:
+    """One file of a batch upload: its name, size if known, and how to open it."""
+
+    def __init__(
+        self,
+        filename: str,
+        opener: Callable[[], ContextManager[BinaryIO]],
+        size: Optional[int] = None,
+        mime_type: Optional[str] = None,
+        path: Optional[Path] = None,
+        related: Optional[Callable[[PointCloudFile], Any]] = None,
+    ):
+        self.filename = filename
+        self.open = opener
+        self.size = size
+        self.mime_type = mime_type or "application/octet-stream"
+        # Set for files on local disk, which are hashed via mmap
+        self.path = path
+        # Builds an extra row committed together with the item's record
+        self.related = related
+
+
+class _BatchState:
+    """Coordination shared by the concurrent workers of one batch upload."""
+
+    def __init__(self, concurrency: int, analyze_inline: bool):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # Analyze in the upload workers instead of queueing to Celery
+        self.analyze_inline = analyze_inline
+        # Workers share one session, so database calls take turns
+        self.db_lock = asyncio.Lock()
+        # First item per (checksum, size, extension) -> future of its record
+        self.leaders: Dict[Tuple[str, int, str], asyncio.Future] = {}
 
 
 class FileUploadService:
@@ -29,27 +203,9 @@ class FileUploadService:
         self.allowed_extensions = {".npy", ".npz", ".ply", ".pcd"}
         self.max_file_size = settings.MAX_FILE_SIZE * 1024 * 1024  # Convert MB to bytes
 
-        # Initialize MinIO client
-        self.minio_client = Minio(
-            endpoint=f"{settings.MINIO_HOST}:{settings.MINIO_PORT}",
-            access_key=settings.MINIO_ACCESS_KEY,
-            secret_key=settings.MINIO_SECRET_KEY,
-            secure=settings.MINIO_SECURE,
-        )
-
-        # Ensure bucket exists
-        self._ensure_bucket_exists()
-
-    def _ensure_bucket_exists(self) -> None:
-        """Ensure the MinIO bucket exists."""
-        try:
-            if not self.minio_client.bucket_exists(settings.MINIO_BUCKET):
-                self.minio_client.make_bucket(settings.MINIO_BUCKET)
-        except S3Error as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create storage bucket: {e}",
-            )
+        # Shared per-process storage client; the bucket is verified once at
+        # startup (or on the first write), not per request
+        self.storage = get_storage()
 
     def _validate_file(self, file: UploadFile) -> None:
         """Validate uploaded file."""
@@ -83,99 +239,584 @@ class FileUploadService:
         unique_filename = f"{uuid4()}{file_ext}"
         return f"projects/{project_id}/pointclouds/{unique_filename}"
 
-    async def _save_to_storage(self, content: bytes, storage_path: str) -> None:
-        """Save file content to MinIO storage."""
-        try:
-            # Create a temporary file-like object from bytes
-            from io import BytesIO
+    async def find_duplicate(
+        self,
+        checksum: str,
+        file_size: int,
+        file_extension: str,
+        project_id: UUID,
+        processed_only: bool = False,
+        exclude_id: Optional[UUID] = None,
+    ) -> Optional[PointCloudFile]:
+        """
+        Find a stored file with identical content whose object can be reused.
 
-            file_data = BytesIO(content)
+        The search covers the project or every project depending on
+        ``DEDUP_SCOPE``; analyzed records are preferred.
 
-            self.minio_client.put_object(
-                bucket_name=settings.MINIO_BUCKET,
-                object_name=storage_path,
-                data=file_data,
-                length=len(content),
-                content_type="application/octet-stream",
+        Returns:
+            Optional[PointCloudFile]: A matching record, None if there is none
+                or deduplication is off
+        """
+        from sqlalchemy import case, select
+
+        if not _dedup_enabled():
+            return None
+
+        stmt = select(PointCloudFile).where(
+            PointCloudFile.checksum == checksum,
+            PointCloudFile.file_size == file_size,
+            PointCloudFile.file_extension == file_extension,
+        )
+        if processed_only:
+            stmt = stmt.where(PointCloudFile.status == FileStatus.PROCESSED)
+        else:
+            stmt = stmt.where(PointCloudFile.status.in_(_REUSABLE_STATUSES))
+        if settings.DEDUP_SCOPE == "project":
+            stmt = stmt.where(PointCloudFile.project_id == project_id)
+        if exclude_id:
+            stmt = stmt.where(PointCloudFile.id != exclude_id)
+
+        stmt = stmt.order_by(
+            case((PointCloudFile.status == FileStatus.PROCESSED, 0), else_=1),
+            PointCloudFile.created_at,
+        ).limit(1)
+
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    def _reference_record(
+        self,
+        source: PointCloudFile,
+        project_id: UUID,
+        uploaded_by: UUID,
+        original_filename: str,
+        mime_type: Optional[str] = None,
+    ) -> PointCloudFile:
+        """Build a record that shares the stored object (and analysis) of ``source``."""
+        now = datetime.utcnow()
+        pointcloud_file = PointCloudFile(
+            project_id=project_id,
+            filename=source.filename,
+            original_filename=original_filename,
+            file_path=source.file_path,
+            file_size=source.file_size,
+            file_extension=source.file_extension,
+            mime_type=mime_type or source.mime_type,
+            uploaded_by=uploaded_by,
+            checksum=source.checksum,
+            status=FileStatus.UPLOADING,
+            upload_started_at=now,
+        )
+        pointcloud_file.mark_upload_completed()
+
+        if source.status == FileStatus.PROCESSED:
+            pointcloud_file.copy_analysis_from(source)
+            pointcloud_file.processing_started_at = now
+            pointcloud_file.mark_processing_completed()
+        return pointcloud_file
+
+    async def _is_last_reference(self, pointcloud_file: PointCloudFile) -> bool:
+        """
+        Whether no other live record uses this record's stored object.
+
+        Locks every record sharing the object, so concurrent deletes of
+        duplicates agree on which one removes it.
+        """
+        from sqlalchemy import select
+
+        stmt = (
+            select(PointCloudFile.id)
+            .where(
+                PointCloudFile.file_path == pointcloud_file.file_path,
+                PointCloudFile.status != FileStatus.DELETED,
             )
+            .with_for_update()
+        )
+        result = await self.db.execute(stmt)
+        return all(file_id == pointcloud_file.id for file_id in result.scalars().all())
+
+    async def _stream_to_storage(
+        self, stream: BinaryIO, storage_path: str
+    ) -> Tuple[int, str]:
+        """
+        Stream a file object to MinIO as a multipart upload.
+
+        The stream is consumed in ``STORAGE_PART_SIZE`` parts, so only one part
+        is held in memory regardless of file size. Size limit and SHA-256 are
+        enforced/computed incrementally while the parts are read.
+
+        Returns:
+            Tuple[int, str]: Number of bytes stored and their SHA-256 checksum
+        """
+        reader = _HashingReader(stream, self.max_file_size)
+        try:
+            await self.storage.put_object(storage_path, reader)
         except S3Error as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save file to storage: {e}",
             )
+        return reader.size, reader.checksum
+
+    async def _fetch_from_storage(
+        self, storage_path: str, destination: BinaryIO
+    ) -> Tuple[int, str]:
+        """
+        Copy a stored object into a local file object in bounded chunks.
+
+        Returns:
+            Tuple[int, str]: Number of bytes copied and their SHA-256 checksum
+        """
+
+        sha256 = hashlib.sha256()
+        try:
+            size = await self.storage.copy_object_to(
+                storage_path, destination, on_chunk=sha256.update
+            )
+            destination.seek(0)
+            return size, sha256.hexdigest()
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to read file from storage: {e}",
+            )
 
-    async def _analyze_point_cloud(self, content: bytes, file_extension: str) -> Dict:
+    async def _analyze_point_cloud(self, source: BinaryIO, file_extension: str) -> Dict:
         """Analyze point cloud file and extract metadata."""
         try:
-            from io import BytesIO
-
-            if file_extension == ".npy":
-                data = np.load(BytesIO(content))
-            elif file_extension == ".npz":
-                npz_data = np.load(BytesIO(content))
-                # Intelligent key selection for point cloud data
-                data = None
-                
-                # 1. Look for common names
-                for key in ['points', 'pts', 'data', 'xyz', 'lidar', 'vertex']:
-                    if key in npz_data:
-                        data = npz_data[key]
-                        break
-                
-                # 2. If not found, look for first 2D array with 3+ columns
-                if data is None:
-                    for key in npz_data.keys():
-                        arr = npz_data[key]
-                        if hasattr(arr, 'ndim') and arr.ndim == 2 and arr.shape[1] >= 3:
-                            data = arr
-                            break
-                            
-                # 3. Fallback to first key if nothing matches criteria
-                if data is None and len(npz_data.keys()) > 0:
-                    data = npz_data[list(npz_data.keys())[0]]
-                    
-                if data is None:
-                    raise ValueError("Empty or invalid NPZ file")
-            else:
-                # For other formats, return basic info
-                return {
-                    "point_count": None,
-                    "dimensions": None,
-                    "bounding_box": None,
-                    "has_colors": False,
-                    "has_normals": False,
-                }
-
-            # Basic validation
-            if data.ndim != 2:
-                raise ValueError("Point cloud data must be 2D array")
-
-            point_count, dimensions = data.shape
-
-            # Calculate bounding box (assuming first 3 columns are x, y, z)
-            xyz_data = data[:, :3] if dimensions >= 3 else data
-            bounding_box = {
-                "min_x": float(xyz_data[:, 0].min()),
-                "max_x": float(xyz_data[:, 0].max()),
-                "min_y": float(xyz_data[:, 1].min()) if xyz_data.shape[1] > 1 else 0.0,
-                "max_y": float(xyz_data[:, 1].max()) if xyz_data.shape[1] > 1 else 0.0,
-                "min_z": float(xyz_data[:, 2].min()) if xyz_data.shape[1] > 2 else 0.0,
-                "max_z": float(xyz_data[:, 2].max()) if xyz_data.shape[1] > 2 else 0.0,
-            }
+            return await run_in_threadpool(analyze_point_cloud, source, file_extension)
 
-            return {
-                "point_count": int(point_count),
-                "dimensions": int(dimensions),
-                "bounding_box": bounding_box,
-                "has_colors": dimensions > 3,
-                "has_normals": dimensions > 6,
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Failed to analyze point cloud data: {e}",
+            )
+
+    def _check_header(self, source: BinaryIO, file_extension: str) -> None:
+        """Reject content whose header is not a readable point cloud (sync)."""
+        if not source.seekable():
+            return
+        try:
+            validate_point_cloud_header(source, file_extension)
+        except PointCloudFormatError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid point cloud file: {e}",
+            )
+
+    async def _apply_analysis(
+        self, pointcloud_file: PointCloudFile, source: BinaryIO
+    ) -> None:
+        """Analyze ``source`` and store the results on the record (no commit)."""
+        analysis_result = await self._analyze_point_cloud(
+            source, pointcloud_file.file_extension
+        )
+
+        pointcloud_file.set_point_cloud_metadata(
+            point_count=analysis_result["point_count"],
+            dimensions=analysis_result["dimensions"],
+            bounding_box=analysis_result["bounding_box"],
+        )
+        pointcloud_file.error_message = None
+        pointcloud_file.error_details = None
+        # Fresh analysis: the quality stage scores the content again
+        pointcloud_file.set_quality_metrics(None, False, False)
+        await self._store_derived(pointcloud_file, lambda: nullcontext(source))
+        pointcloud_file.mark_processing_completed()
+
+    async def _store_derived(
+        self,
+        pointcloud_file: PointCloudFile,
+        opener: Callable[[], ContextManager[BinaryIO]],
+    ) -> None:
+        """
+        Write the canonical copy and the preview levels next to the original (no commit).
+
+        Both come from one pass over the mapped source: the canonical float32
+        ``.npy`` and one subsample per ``LOD_LEVELS`` budget below the point
+        count. A failure is logged and leaves ``canonical_path`` and
+        ``lod_levels`` unset; readers then fall back to the original file.
+
+        The geometric descriptors are computed from the same mapped columns
+        and stored under ``extra_data["descriptors"]``.
+        """
+        file_path = pointcloud_file.file_path
+        descriptors: Dict[str, Any] = {}
+
+        def _describe(columns: List) -> None:
+            try:
+                descriptors.update(compute_descriptors(columns))
+            except Exception as e:
+                logger.warning(f"Failed to compute descriptors for {file_path}: {e}")
+
+        def _write(stack: ExitStack) -> Tuple[List[Tuple[str, BinaryIO, int]], List[int]]:
+            outputs = []
+
+            def _output(key: str, columns: List, rows=None) -> None:
+                target = stack.enter_context(tempfile.TemporaryFile())
+                write_point_columns(columns, target, rows)
+                outputs.append((key, target, target.tell()))
+                target.seek(0)
+
+            with opener() as source:
+                columns = point_columns(source, pointcloud_file.file_extension)
+                _describe(columns)
+                _output(_canonical_path(file_path), columns)
+                levels = lod_rows(len(columns[0]), settings.LOD_LEVELS)
+                for level, rows in enumerate(levels):
+                    _output(_lod_path(file_path, level), columns, rows)
+            return outputs, [len(rows) for rows in levels]
+
+        try:
+            with ExitStack() as stack:
+                outputs, lod_levels = await run_in_threadpool(_write, stack)
+                await asyncio.gather(
+                    *(
+                        self.storage.put_object(key, data, length=size)
+                        for key, data, size in outputs
+                    )
+                )
+                pointcloud_file.canonical_path = outputs[0][0]
+                pointcloud_file.lod_levels = lod_levels
+                pointcloud_file.octree_nodes = await self._store_octree(file_path, outputs[0][1])
+        except Exception as e:
+            pointcloud_file.canonical_path = None
+            pointcloud_file.lod_levels = None
+            pointcloud_file.octree_nodes = None
+            logger.warning(f"Failed to write derived points for {file_path}: {e}")
+        if descriptors:
+            pointcloud_file.extra_data = {
+                **(pointcloud_file.extra_data or {}),
+                "descriptors": descriptors,
             }
 
+    async def _store_octree(self, file_path: str, canonical: BinaryIO) -> Optional[int]:
+        """
+        Tile a large cloud into an octree next to its canonical copy.
+
+        Clouds below ``OCTREE_MIN_POINTS`` are not tiled. Nodes are read from
+        the local canonical file and uploaded a few at a time; the hierarchy
+        index goes last, so its presence means every node is in place.
+        A failure is logged and leaves the cloud untiled.
+
+        Returns:
+            Optional[int]: Number of stored nodes, or None if not tiled
+        """
+        try:
+            points = load_numpy_points(canonical, ".npy")
+            if len(points) < settings.OCTREE_MIN_POINTS:
+                return None
+            columns = [points[:, i] for i in range(points.shape[1])]
+            nodes = await run_in_threadpool(
+                build_octree, columns, settings.OCTREE_NODE_POINTS, settings.OCTREE_MAX_DEPTH
+            )
+            semaphore = asyncio.Semaphore(settings.UPLOAD_CONCURRENCY)
+
+            def _encode(node: OctreeNode) -> io.BytesIO:
+                buffer = io.BytesIO()
+                write_point_columns(columns, buffer, node.rows)
+                buffer.seek(0)
+                return buffer
+
+            async def _put(node: OctreeNode) -> None:
+                async with semaphore:
+                    buffer = await run_in_threadpool(_encode, node)
+                    await self.storage.put_object(
+                        _octree_path(file_path, node.name),
+                        buffer,
+                        length=buffer.getbuffer().nbytes,
+                    )
+
+            await asyncio.gather(*(_put(node) for node in nodes))
+            index = json.dumps(octree_hierarchy(nodes, len(points), len(columns))).encode()
+            await self.storage.put_object(
+                _octree_path(file_path, "hierarchy.json"),
+                io.BytesIO(index),
+                length=len(index),
+                content_type="application/json",
+            )
+            return len(nodes)
         except Exception as e:
+            logger.warning(f"Failed to tile {file_path} into an octree: {e}")
+            return None
+
+    def get_lod_object(self, pointcloud_file: PointCloudFile, level: int) -> str:
+        """
+        Storage key of a preview level.
+
+        Level ``len(LOD_LEVELS)`` is the full cloud. Levels whose budget is
+        not below the point count were not stored and resolve to it as well.
+        """
+        if not pointcloud_file.canonical_path or pointcloud_file.lod_levels is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Preview levels not available",
+            )
+        if level < 0 or level > len(settings.LOD_LEVELS):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown level {level}",
+            )
+        if level < len(pointcloud_file.lod_levels):
+            return _lod_path(pointcloud_file.file_path, level)
+        return pointcloud_file.canonical_path
+
+    def get_octree_object(self, pointcloud_file: PointCloudFile, node: Optional[str] = None) -> str:
+        """
+        Storage key of an octree node, or of the hierarchy index if ``node`` is None.
+
+        Node names are validated before building the key; whether the node
+        exists is left to storage.
+        """
+        if not pointcloud_file.has_octree:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Octree not available",
+            )
+        if node is None:
+            return _octree_path(pointcloud_file.file_path, "hierarchy.json")
+        if not _OCTREE_NODE_NAME.match(node):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown node {node}",
+            )
+        return _octree_path(pointcloud_file.file_path, node)
+
+    async def get_quantized_object(
+        self,
+        pointcloud_file: PointCloudFile,
+        bits: int = 16,
+        attributes: bool = True,
+        morton: bool = False,
+        delta: bool = True,
+        compression: str = "deflate",
+    ) -> str:
+        """
+        Storage key of the file in the quantized transport format.
+
+        Each combination of options is encoded on first request, from the
+        canonical copy when there is one, and stored next to the original so
+        later requests are served straight from storage. Positions are
+        quantized over the recorded bounding box.
+        """
+        if bits not in (16, 32):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to analyze point cloud data: {e}",
+                detail="bits must be 16 or 32",
+            )
+        if compression not in available_compressions():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported compression: {compression}. "
+                f"Available: {', '.join(available_compressions())}",
+            )
+
+        key = _quantized_path(
+            pointcloud_file.file_path, bits, attributes, morton, delta, compression
+        )
+        try:
+            await self.storage.stat_object(key)
+            return key
+        except S3Error as e:
+            if e.code != "NoSuchKey":
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Failed to read file from storage: {e}",
+                )
+
+        if pointcloud_file.canonical_path:
+            source_path, extension = pointcloud_file.canonical_path, ".npy"
+        else:
+            source_path, extension = pointcloud_file.file_path, pointcloud_file.file_extension
+        box = pointcloud_file.bounding_box
+        bounds = (
+            [box[f"min_{axis}"] for axis in "xyz"] + [box[f"max_{axis}"] for axis in "xyz"]
+            if box
+            else None
+        )
+
+        with tempfile.TemporaryFile() as source, tempfile.TemporaryFile() as target:
+            await self._fetch_from_storage(source_path, source)
+
+            def _encode() -> int:
+                return write_quantized_points(
+                    point_columns(source, extension),
+                    target,
+                    bits=bits,
+                    bounds=bounds,
+                    attributes=attributes,
+                    morton=morton,
+                    delta=delta,
+                    compression=compression,
+                )
+
+            try:
+                size = await run_in_threadpool(_encode)
+            except PointCloudFormatError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Cannot encode point cloud: {e}",
+                )
+            target.seek(0)
+            await self.storage.put_object(
+                key, target, length=size, content_type=QUANTIZED_MEDIA_TYPE
+            )
+        return key
+
+    def enqueue_processing(self, file_id: UUID) -> bool:
+        """
+        Queue the background analysis stage for a stored file.
+
+        Returns:
+            bool: False if the file was not queued and must be analyzed inline
+        """
+        if not settings.PROCESS_FILES_ASYNC:
+            return False
+
+        try:
+            celery_app.send_task(PROCESS_FILE_TASK, args=[str(file_id)])
+            return True
+        except Exception as e:
+            logger.warning(f"Could not queue analysis for file {file_id}: {e}")
+            return False
+
+    def enqueue_quality(self, pointcloud_files: Sequence[PointCloudFile]) -> int:
+        """
+        Queue the background quality stage for processed files not scored yet.
+
+        The stage only runs in the worker; without one, files keep no score.
+
+        Returns:
+            int: Number of files queued
+        """
+        if not (settings.QUALITY_STAGE_ENABLED and settings.PROCESS_FILES_ASYNC):
+            return 0
+
+        queued = 0
+        for pointcloud_file in pointcloud_files:
+            if (
+                pointcloud_file.status != FileStatus.PROCESSED
+                or pointcloud_file.data_quality is not None
+            ):
+                continue
+            try:
+                celery_app.send_task(QUALITY_TASK, args=[str(pointcloud_file.id)])
+                queued += 1
+            except Exception as e:
+                logger.warning(f"Could not queue quality scoring for file {pointcloud_file.id}: {e}")
+                break
+        return queued
+
+    def get_outlier_mask_object(self, pointcloud_file: PointCloudFile) -> str:
+        """Storage key of the outlier mask written by the quality stage."""
+        if not pointcloud_file.quality_details or not pointcloud_file.quality_details.get("mask"):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Outlier mask not available",
             )
+        return _outlier_mask_path(pointcloud_file.file_path)
+
+    def enqueue_project_reprocessing(
+        self, project_id: UUID, status_filter: Optional[FileStatus] = None
+    ) -> str:
+        """
+        Queue re-analysis of every file in a project.
+
+        Returns:
+            str: Celery task ID of the fan-out task
+        """
+        result = celery_app.send_task(
+            REPROCESS_PROJECT_TASK,
+            args=[str(project_id), status_filter.value if status_filter else None],
+        )
+        return result.id
+
+    async def process_file(self, file_id: UUID) -> Optional[PointCloudFile]:
+        """
+        Run the analysis stage for a stored file.
+
+        Fetches the object, verifies (or fills in) its checksum, extracts
+        metadata and moves the record through PROCESSING to PROCESSED. Errors
+        are recorded on the record as FAILED rather than raised.
+
+        Returns:
+            Optional[PointCloudFile]: The processed record, None if missing or deleted
+        """
+        pointcloud_file = await self.get_file_by_id(file_id)
+        if not pointcloud_file or pointcloud_file.status == FileStatus.DELETED:
+            return None
+
+        pointcloud_file.mark_processing_started()
+        await self.db.commit()
+
+        orphaned_path = None
+        try:
+            sibling = await self._processed_sibling(pointcloud_file)
+            if sibling:
+                # The object was already analyzed through another record
+                pointcloud_file.copy_analysis_from(sibling)
+                pointcloud_file.mark_processing_completed()
+            else:
+                with tempfile.TemporaryFile() as local_copy:
+                    _, checksum = await self._fetch_from_storage(
+                        pointcloud_file.file_path, local_copy
+                    )
+                    if pointcloud_file.checksum and pointcloud_file.checksum != checksum:
+                        raise ValueError("Stored object does not match recorded checksum")
+                    pointcloud_file.checksum = checksum
+
+                    duplicate = await self.find_duplicate(
+                        checksum,
+                        pointcloud_file.file_size,
+                        pointcloud_file.file_extension,
+                        pointcloud_file.project_id,
+                        processed_only=True,
+                        exclude_id=pointcloud_file.id,
+                    )
+                    if duplicate:
+                        # Same content is already stored and analyzed: share that
+                        # object and drop this copy once nothing else uses it
+                        if await self._is_last_reference(pointcloud_file):
+                            orphaned_path = pointcloud_file.file_path
+                        pointcloud_file.file_path = duplicate.file_path
+                        pointcloud_file.filename = duplicate.filename
+                        pointcloud_file.copy_analysis_from(duplicate)
+                        pointcloud_file.mark_processing_completed()
+                    else:
+                        await self._apply_analysis(pointcloud_file, local_copy)
+
+        except Exception as e:
+            await self.db.rollback()
+            orphaned_path = None
+            logger.error(f"Processing failed for file {file_id}: {e}")
+            pointcloud_file.mark_processing_failed(getattr(e, "detail", None) or str(e))
+
+        await self.db.commit()
+        await self.db.refresh(pointcloud_file)
+
+        if orphaned_path:
+            await self._remove_content(orphaned_path)
+        self.enqueue_quality([pointcloud_file])
+        return pointcloud_file
+
+    async def _processed_sibling(
+        self, pointcloud_file: PointCloudFile
+    ) -> Optional[PointCloudFile]:
+        """Another analyzed record stored under the same object, if any."""
+        from sqlalchemy import select
+
+        stmt = (
+            select(PointCloudFile)
+            .where(
+                PointCloudFile.file_path == pointcloud_file.file_path,
+                PointCloudFile.status == FileStatus.PROCESSED,
+                PointCloudFile.id != pointcloud_file.id,
+            )
+            .limit(1)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def upload_pointcloud(
         self,
@@ -199,35 +840,41 @@ class FileUploadService:
         # Validate inputs
         self._validate_file(file)
 
-        # Read file content
-        content = await file.read()
-        if len(content) > self.max_file_size:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE}MB",
-            )
-
-        # Calculate checksum
-        checksum = self._calculate_checksum(content)
-
-        # Check for duplicate files in the same project
-        # (Optional: you might want to allow duplicates)
-
         # Generate storage path
         storage_path = self._get_storage_path(project_id, file.filename)
         file_ext = Path(file.filename).suffix.lower()
+        await run_in_threadpool(self._check_header, file.file, file_ext)
+
+        # Identical content already stored: reference it instead of uploading
+        if _dedup_enabled():
+            file_size, checksum = await run_in_threadpool(
+                _hash_stream, file.file, self.max_file_size
+            )
+            duplicate = await self.find_duplicate(checksum, file_size, file_ext, project_id)
+            if duplicate:
+                pointcloud_file = self._reference_record(
+                    duplicate, project_id, uploaded_by, file.filename, file.content_type
+                )
+                self.db.add(pointcloud_file)
+                await self.db.commit()
+                if pointcloud_file.status == FileStatus.UPLOADED and not self.enqueue_processing(
+                    pointcloud_file.id
+                ):
+                    pointcloud_file = await self.process_file(pointcloud_file.id)
+                await self.db.refresh(pointcloud_file)
+                return pointcloud_file
 
-        # Create file record in database
+        # Create file record in database. Size and checksum are filled in once
+        # the content has been streamed to storage.
         pointcloud_file = PointCloudFile(
             project_id=project_id,
             filename=Path(storage_path).name,
             original_filename=file.filename,
             file_path=storage_path,
-            file_size=len(content),
+            file_size=getattr(file, "size", None) or 0,
             file_extension=file_ext,
             mime_type=file.content_type,
             uploaded_by=uploaded_by,
-            checksum=checksum,
             status=FileStatus.UPLOADING,
             upload_started_at=datetime.utcnow(),
         )
@@ -238,22 +885,22 @@ class FileUploadService:
             await self.db.commit()
             await self.db.refresh(pointcloud_file)
 
-            # Save to storage
-            await self._save_to_storage(content, storage_path)
-
-            # Analyze point cloud data
-            analysis_result = await self._analyze_point_cloud(content, file_ext)
-
-            # Update file record with analysis results
-            pointcloud_file.mark_upload_completed()
-            pointcloud_file.mark_processing_completed() # Mark as PROCESSED
-            pointcloud_file.set_point_cloud_metadata(
-                point_count=analysis_result["point_count"],
-                dimensions=analysis_result["dimensions"],
-                bounding_box=analysis_result["bounding_box"],
+            # Stream to storage, hashing and size-checking on the way
+            file_size, checksum = await self._stream_to_storage(
+                file.file, storage_path
             )
-            
+            pointcloud_file.file_size = file_size
+            pointcloud_file.checksum = checksum
+            pointcloud_file.mark_upload_completed()
             await self.db.commit()
+
+            # Analysis runs as a background stage; without a worker, analyze
+            # the spooled upload inline
+            if not self.enqueue_processing(pointcloud_file.id):
+                pointcloud_file.mark_processing_started()
+                await self._apply_analysis(pointcloud_file, file.file)
+                await self.db.commit()
+
             await self.db.refresh(pointcloud_file)
             
             return pointcloud_file
@@ -263,96 +910,436 @@ class FileUploadService:
             await self.db.rollback()
 
             # Try to clean up storage
-            try:
-                self.minio_client.remove_object(settings.MINIO_BUCKET, storage_path)
-            except:
-                pass  # Ignore cleanup errors
+            await self._remove_content(storage_path)
 
             # Mark as failed if record exists
             if pointcloud_file.id:
                 pointcloud_file.mark_processing_failed(str(e))
                 await self.db.commit()
 
+            if isinstance(e, HTTPException):
+                raise
+
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Upload failed: {e}",
             )
 
-    async def import_local_file(
+    def _analyze_item(self, item: _BatchItem) -> Dict:
+        """Analyze a batch item synchronously (runs in the threadpool)."""
+        file_ext = Path(item.filename).suffix.lower()
+        with item.open() as stream:
+            if stream.seekable():
+                return analyze_point_cloud(stream, file_ext)
+            with tempfile.TemporaryFile() as local_copy:
+                shutil.copyfileobj(stream, local_copy, settings.STORAGE_PART_SIZE)
+                return analyze_point_cloud(local_copy, file_ext)
+
+    def _check_item(self, item: _BatchItem) -> None:
+        """Validate a batch item's header (runs in the threadpool)."""
+        with item.open() as stream:
+            self._check_header(stream, Path(item.filename).suffix.lower())
+
+    def _hash_item(self, item: _BatchItem) -> Tuple[int, str]:
+        """Size and SHA-256 of a batch item (runs in the threadpool)."""
+        if item.path:
+            return _hash_path(item.path, self.max_file_size)
+        with item.open() as stream:
+            return _hash_stream(stream, self.max_file_size)
+
+    async def _store_item(
         self,
-        file_path: Path,
+        item: _BatchItem,
         project_id: UUID,
         uploaded_by: UUID,
-    ) -> PointCloudFile:
-        """Import a file from local filesystem."""
-        if not file_path.exists() or not file_path.is_file():
-            raise ValueError(f"File not found: {file_path}")
+        batch: "_BatchState",
+    ) -> Tuple[_BatchItem, Optional[PointCloudFile], Optional[str], bool]:
+        """
+        Stream one batch item to storage and build its (unsaved) record.
 
-        filename = file_path.name
-        file_ext = file_path.suffix.lower()
-        
-        if file_ext not in self.allowed_extensions:
-            raise ValueError(f"Unsupported file type: {file_ext}")
-
-        # Read content
-        content = file_path.read_bytes()
-        checksum = self._calculate_checksum(content)
-        
-        # Storage path
-        storage_path = self._get_storage_path(project_id, filename)
-        
-        # Create DB record
-        pointcloud_file = PointCloudFile(
-            project_id=project_id,
-            filename=Path(storage_path).name,
-            original_filename=filename,
-            file_path=storage_path,
-            file_size=len(content),
-            file_extension=file_ext,
-            mime_type="application/octet-stream",
-            uploaded_by=uploaded_by,
-            checksum=checksum,
-            status=FileStatus.UPLOADING,
-            upload_started_at=datetime.utcnow(),
-        )
-        
+        Content already stored (in the database or earlier in this batch) is
+        referenced instead of uploaded again. When analysis is not queued to
+        the worker it runs here too, so storage writes and analysis of
+        different items overlap.
+
+        Returns:
+            Tuple: The item, its record (None on failure), the error message
+                and whether the record owns a newly stored object
+        """
+        async with batch.semaphore:
+            file_ext = Path(item.filename).suffix.lower()
+            storage_path = self._get_storage_path(project_id, item.filename)
+            leader: Optional[asyncio.Future] = None
+            try:
+                if item.size is not None and item.size > self.max_file_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE}MB",
+                    )
+                await run_in_threadpool(self._check_item, item)
+
+                if _dedup_enabled():
+                    file_size, checksum = await run_in_threadpool(self._hash_item, item)
+                    key = (checksum, file_size, file_ext)
+                    if key in batch.leaders:
+                        source = await batch.leaders[key]
+                    else:
+                        leader = batch.leaders[key] = asyncio.get_running_loop().create_future()
+                        async with batch.db_lock:
+                            source = await self.find_duplicate(
+                                checksum, file_size, file_ext, project_id
+                            )
+                    if source:
+                        if leader:
+                            leader.set_result(source)
+                        pointcloud_file = self._reference_record(
+                            source, project_id, uploaded_by, item.filename, item.mime_type
+                        )
+                        return item, pointcloud_file, None, False
+
+                pointcloud_file = PointCloudFile(
+                    project_id=project_id,
+                    filename=Path(storage_path).name,
+                    original_filename=item.filename,
+                    file_path=storage_path,
+                    file_size=item.size or 0,
+                    file_extension=file_ext,
+                    mime_type=item.mime_type,
+                    uploaded_by=uploaded_by,
+                    status=FileStatus.UPLOADING,
+                    upload_started_at=datetime.utcnow(),
+                )
+
+                with item.open() as stream:
+                    file_size, checksum = await self._stream_to_storage(
+                        stream, storage_path
+                    )
+                pointcloud_file.file_size = file_size
+                pointcloud_file.checksum = checksum
+                pointcloud_file.mark_upload_completed()
+
+                if batch.analyze_inline:
+                    pointcloud_file.mark_processing_started()
+                    try:
+                        analysis_result = await run_in_threadpool(self._analyze_item, item)
+                        pointcloud_file.set_point_cloud_metadata(
+                            point_count=analysis_result["point_count"],
+                            dimensions=analysis_result["dimensions"],
+                            bounding_box=analysis_result["bounding_box"],
+                        )
+                    except Exception as e:
+                        pointcloud_file.mark_processing_failed(
+                            f"Failed to analyze point cloud data: {e}"
+                        )
+                    else:
+                        await self._store_derived(pointcloud_file, item.open)
+                        pointcloud_file.mark_processing_completed()
+
+                if leader:
+                    leader.set_result(pointcloud_file)
+                return item, pointcloud_file, None, True
+
+            except Exception as e:
+                await self._remove_content(storage_path)
+                return item, None, getattr(e, "detail", None) or str(e), False
+            finally:
+                # Duplicates waiting on this item upload their own copy instead
+                if leader and not leader.done():
+                    leader.set_result(None)
+
+    async def _remove_object(self, storage_path: str) -> None:
+        """Best-effort removal of a stored object."""
+        try:
+            await self.storage.remove_object(storage_path)
+        except Exception:
+            pass  # Ignore cleanup errors
+
+    async def _remove_content(self, storage_path: str) -> None:
+        """Best-effort removal of a stored object and its derived artifacts."""
+        try:
+            await self.storage.remove_prefix(_content_prefix(storage_path))
+        except Exception:
+            pass  # Ignore cleanup errors
+
+    async def _commit_batch(
+        self, records: List[Tuple[PointCloudFile, bool]], related: Sequence[Any] = ()
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]]]:
+        """
+        Insert a group of stored files in one commit and queue their analysis.
+
+        Args:
+            records: Records with whether each owns a newly stored object
+            related: Extra rows to commit in the same transaction
+
+        Returns:
+            Tuple: Saved records and per-file errors if the commit failed
+        """
+        if not records:
+            return [], []
+
+        self.db.add_all([record for record, _ in records] + list(related))
         try:
-            self.db.add(pointcloud_file)
-            await self.db.commit()
-            await self.db.refresh(pointcloud_file)
-            
-            # Save to MinIO
-            await self._save_to_storage(content, storage_path)
-            
-            # Analyze
-            analysis_result = await self._analyze_point_cloud(content, file_ext)
-            
-            # Update record
-            pointcloud_file.mark_upload_completed()
-            pointcloud_file.mark_processing_completed() # Mark as PROCESSED
-            pointcloud_file.set_point_cloud_metadata(
-                point_count=analysis_result["point_count"],
-                dimensions=analysis_result["dimensions"],
-                bounding_box=analysis_result["bounding_box"],
-            )
-            
             await self.db.commit()
-            await self.db.refresh(pointcloud_file)
-            
-            return pointcloud_file
-            
         except Exception as e:
             await self.db.rollback()
-            # Try cleanup
+            logger.error(f"Failed to record {len(records)} uploaded files: {e}")
+            for record, owns_object in records:
+                if owns_object:
+                    await self._remove_content(record.file_path)
+            return [], [
+                {"filename": record.original_filename, "detail": f"Failed to save file record: {e}"}
+                for record, _ in records
+            ]
+
+        saved = [record for record, _ in records]
+        for record in saved:
+            if record.status == FileStatus.UPLOADED and not self.enqueue_processing(record.id):
+                await self.process_file(record.id)
+        # Records analyzed inline (or sharing an analyzed object) skip process_file
+        self.enqueue_quality(saved)
+        return saved, []
+
+    async def _ingest_batch(
+        self,
+        items: List[_BatchItem],
+        project_id: UUID,
+        uploaded_by: UUID,
+        commit_every: Optional[int] = None,
+        label: str = "Batch upload",
+        concurrency: Optional[int] = None,
+        analyze_inline: Optional[bool] = None,
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]]]:
+        """
+        Store a batch of files with bounded concurrency.
+
+        Up to ``concurrency`` (default ``UPLOAD_CONCURRENCY``) items are
+        streamed to storage at once. Records are written from this coroutine
+        only, either all in one commit or every ``commit_every`` files so that
+        analysis of earlier files can start while later ones are still
+        uploading. Analysis is queued to the worker unless ``analyze_inline``
+        (default: ``not PROCESS_FILES_ASYNC``).
+
+        Returns:
+            Tuple: Saved records and per-file errors as ``{filename, detail}``
+        """
+        if analyze_inline is None:
+            analyze_inline = not settings.PROCESS_FILES_ASYNC
+        batch = _BatchState(concurrency or settings.UPLOAD_CONCURRENCY, analyze_inline)
+        tasks = [
+            asyncio.ensure_future(
+                self._store_item(item, project_id, uploaded_by, batch)
+            )
+            for item in items
+        ]
+
+        saved: List[PointCloudFile] = []
+        errors: List[Dict[str, str]] = []
+        pending: List[Tuple[PointCloudFile, bool]] = []
+        related: List[Any] = []
+        try:
+            for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                item, record, error, owns_object = await next_result
+                if error:
+                    errors.append({"filename": item.filename, "detail": error})
+                else:
+                    pending.append((record, owns_object))
+                    if item.related:
+                        related.append(item.related(record))
+
+                if commit_every and len(pending) >= commit_every:
+                    async with batch.db_lock:
+                        batch_saved, batch_errors = await self._commit_batch(pending, related)
+                    saved += batch_saved
+                    errors += batch_errors
+                    pending, related = [], []
+                    logger.info(
+                        f"{label}: {completed}/{len(items)} files processed, "
+                        f"{len(saved)} saved, {len(errors)} failed"
+                    )
+
+            async with batch.db_lock:
+                batch_saved, batch_errors = await self._commit_batch(pending, related)
+            saved += batch_saved
+            errors += batch_errors
+        finally:
+            # Stop outstanding uploads if the request is cancelled midway
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"{label}: {len(saved)} saved, {len(errors)} failed")
+        return saved, errors
+
+    async def upload_multiple(
+        self,
+        files: List[UploadFile],
+        project_id: UUID,
+        uploaded_by: UUID,
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]]]:
+        """
+        Upload several files as one batch.
+
+        Files are stored concurrently and all records are inserted in a single
+        commit. Invalid files are reported instead of failing the batch.
+
+        Returns:
+            Tuple: Saved records and per-file errors as ``{filename, detail}``
+        """
+
+        def _opener(upload: UploadFile) -> Callable[[], ContextManager[BinaryIO]]:
+            def _open() -> ContextManager[BinaryIO]:
+                upload.file.seek(0)
+                return nullcontext(upload.file)
+
+            return _open
+
+        items: List[_BatchItem] = []
+        errors: List[Dict[str, str]] = []
+        for upload in files:
             try:
-                self.minio_client.remove_object(settings.MINIO_BUCKET, storage_path)
-            except:
-                pass
-                
-            if pointcloud_file.id:
-                pointcloud_file.mark_processing_failed(str(e))
-                await self.db.commit()
-            raise e
+                self._validate_file(upload)
+            except HTTPException as e:
+                errors.append({"filename": upload.filename or "", "detail": e.detail})
+                continue
+            items.append(
+                _BatchItem(
+                    filename=upload.filename,
+                    opener=_opener(upload),
+                    size=upload.size,
+                    mime_type=upload.content_type,
+                )
+            )
+
+        saved, batch_errors = await self._ingest_batch(items, project_id, uploaded_by)
+        return saved, errors + batch_errors
+
+    def _is_archive_member(self, info: zipfile.ZipInfo) -> bool:
+        """Whether a ZIP entry is a point cloud file to import."""
+        if info.is_dir():
+            return False
+        parts = PurePosixPath(info.filename).parts
+        if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+            return False
+        return PurePosixPath(info.filename).suffix.lower() in self.allowed_extensions
+
+    async def upload_archive(
+        self,
+        archive: BinaryIO,
+        project_id: UUID,
+        uploaded_by: UUID,
+        archive_name: str = "archive",
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]]]:
+        """
+        Import every point cloud file in a ZIP archive.
+
+        ``archive`` must be a seekable file object, normally the upload already
+        spooled to disk. Members are streamed out of the archive one part at a
+        time, never decompressed fully in memory.
+
+        Returns:
+            Tuple: Saved records and per-member errors as ``{filename, detail}``
+        """
+        try:
+            zip_ref = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid ZIP file"
+            )
+
+        with zip_ref:
+            members = [info for info in zip_ref.infolist() if self._is_archive_member(info)]
+            if not members:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=(
+                        "No valid point cloud files "
+                        f"({', '.join(sorted(self.allowed_extensions))}) found in archive"
+                    ),
+                )
+
+            items = [
+                _BatchItem(
+                    filename=PurePosixPath(info.filename).name,
+                    opener=lambda info=info: zip_ref.open(info),
+                    size=info.file_size,
+                )
+                for info in members
+            ]
+            return await self._ingest_batch(
+                items,
+                project_id,
+                uploaded_by,
+                commit_every=settings.ARCHIVE_COMMIT_BATCH,
+                label=f"Archive {archive_name}",
+            )
+
+    async def import_local_files(
+        self,
+        paths: List[Path],
+        project_id: UUID,
+        uploaded_by: UUID,
+        analyze_inline: bool = False,
+        label: str = "Local import",
+        related: Optional[Callable[[Path, PointCloudFile], Any]] = None,
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]]]:
+        """
+        Import files from the local filesystem in parallel.
+
+        Up to ``IMPORT_CONCURRENCY`` files are hashed (through mmap), streamed
+        to storage from their file descriptor and, with ``analyze_inline``,
+        analyzed from the open file at the same time. Records are committed
+        every ``IMPORT_COMMIT_BATCH`` files, together with any row returned by
+        ``related(path, record)``.
+
+        Returns:
+            Tuple: Saved records and per-file errors as ``{filename, detail}``
+        """
+        items: List[_BatchItem] = []
+        errors: List[Dict[str, str]] = []
+        for path in paths:
+            if not path.is_file():
+                errors.append({"filename": path.name, "detail": "File not found"})
+            elif path.suffix.lower() not in self.allowed_extensions:
+                errors.append(
+                    {"filename": path.name, "detail": f"Unsupported file type: {path.suffix}"}
+                )
+            else:
+                items.append(
+                    _BatchItem(
+                        filename=path.name,
+                        opener=lambda path=path: open(path, "rb"),
+                        size=path.stat().st_size,
+                        path=path,
+                        related=(
+                            (lambda record, path=path: related(path, record))
+                            if related else None
+                        ),
+                    )
+                )
+
+        saved, batch_errors = await self._ingest_batch(
+            items,
+            project_id,
+            uploaded_by,
+            commit_every=settings.IMPORT_COMMIT_BATCH,
+            label=label,
+            concurrency=settings.IMPORT_CONCURRENCY,
+            analyze_inline=analyze_inline,
+        )
+        return saved, errors + batch_errors
+
+    async def import_local_file(
+        self,
+        file_path: Path,
+        project_id: UUID,
+        uploaded_by: UUID,
+    ) -> PointCloudFile:
+        """Import a file from local filesystem."""
+        saved, errors = await self.import_local_files(
+            [file_path], project_id, uploaded_by, analyze_inline=True
+        )
+        if errors:
+            raise ValueError(errors[0]["detail"])
+        return saved[0]
 
     async def get_file_by_id(self, file_id: UUID) -> Optional[PointCloudFile]:
         """Get point cloud file by ID."""
@@ -362,26 +1349,196 @@ class FileUploadService:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _project_file_conditions(
+        project_id: UUID,
+        status_filter: Optional[FileStatus] = None,
+        has_noise: Optional[bool] = None,
+        has_outliers: Optional[bool] = None,
+        min_quality: Optional[int] = None,
+    ) -> list:
+        """WHERE clauses of the project file list (deleted files only if asked for)."""
+        conditions = [PointCloudFile.project_id == project_id]
+        if status_filter:
+            conditions.append(PointCloudFile.status == status_filter)
+        else:
+            conditions.append(PointCloudFile.status != FileStatus.DELETED)
+        if has_noise is not None:
+            conditions.append(PointCloudFile.has_noise == has_noise)
+        if has_outliers is not None:
+            conditions.append(PointCloudFile.has_outliers == has_outliers)
+        if min_quality is not None:
+            conditions.append(PointCloudFile.data_quality >= min_quality)
+        return conditions
+
     async def get_project_files(
         self,
         project_id: UUID,
         skip: int = 0,
         limit: int = 100,
         status_filter: Optional[FileStatus] = None,
+        has_noise: Optional[bool] = None,
+        has_outliers: Optional[bool] = None,
+        min_quality: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> list[PointCloudFile]:
-        """Get point cloud files for a project."""
+        """
+        Get point cloud files for a project, newest first, optionally filtered by quality.
+
+        With a ``cursor`` (see ``app.utils.pagination``) the list continues
+        after the file it names and ``skip`` is ignored; the lookup uses the
+        partial (project_id, created_at, id) index of live files whatever the
+        depth.
+        """
         from sqlalchemy import select
 
-        stmt = select(PointCloudFile).where(PointCloudFile.project_id == project_id)
+        stmt = select(PointCloudFile).where(
+            *self._project_file_conditions(
+                project_id, status_filter, has_noise, has_outliers, min_quality
+            )
+        )
 
-        if status_filter:
-            stmt = stmt.where(PointCloudFile.status == status_filter)
+        if cursor:
+            stmt = stmt.where(
+                keyset_condition(
+                    (PointCloudFile.created_at, PointCloudFile.id),
+                    decode_cursor(cursor, (datetime, UUID)),
+                )
+            )
+        else:
+            stmt = stmt.offset(skip)
 
-        stmt = stmt.offset(skip).limit(limit).order_by(PointCloudFile.created_at.desc())
+        stmt = stmt.limit(limit).order_by(
+            PointCloudFile.created_at.desc(), PointCloudFile.id.desc()
+        )
 
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def count_project_files(
+        self,
+        project_id: UUID,
+        status_filter: Optional[FileStatus] = None,
+        has_noise: Optional[bool] = None,
+        has_outliers: Optional[bool] = None,
+        min_quality: Optional[int] = None,
+    ) -> int:
+        """
+        Number of files ``get_project_files`` pages through.
+
+        Without quality filters this is read from the file stats rollup, so
+        counting a project of 100k files costs the same as one of ten.
+        """
+        from sqlalchemy import func, select
+
+        if (
+            settings.FILE_STATS_ROLLUP
+            and has_noise is None
+            and has_outliers is None
+            and min_quality is None
+        ):
+            return await FileStatsService(self.db).count_files(project_id, status_filter)
+
+        result = await self.db.execute(
+            select(func.count())
+            .select_from(PointCloudFile)
+            .where(
+                *self._project_file_conditions(
+                    project_id, status_filter, has_noise, has_outliers, min_quality
+                )
+            )
+        )
+        return result.scalar_one()
+
+    async def search_files(
+        self,
+        project_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        intersects: Optional[Sequence[float]] = None,
+        extents: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+        min_points: Optional[int] = None,
+        max_points: Optional[int] = None,
+        status_filter: Optional[FileStatus] = None,
+    ) -> Tuple[List[PointCloudFile], int]:
+        """
+        Find files of a project by bounding box and size, in SQL.
+
+        Args:
+            intersects: Box the file's bounding box must overlap, as
+                (min_x, min_y, max_x, max_y) or (min_x, min_y, min_z, max_x, max_y, max_z).
+                The XY part uses the GiST footprint index.
+            extents: (min, max) ranges of the extent along ``x``, ``y``, ``z``
+                and ``length`` (the longer horizontal side); either end may be None
+            min_points: Minimum point count
+            max_points: Maximum point count
+            status_filter: Only files in this status (default: any but DELETED)
+
+        Returns:
+            Tuple: Files of the requested page, newest first, and the total match count
+        """
+        from sqlalchemy import and_, func, select
+
+        conditions = [PointCloudFile.project_id == project_id]
+        if status_filter:
+            conditions.append(PointCloudFile.status == status_filter)
+        else:
+            conditions.append(PointCloudFile.status != FileStatus.DELETED)
+
+        if intersects is not None:
+            if len(intersects) == 4:
+                low, high = (*intersects[:2], None), (*intersects[2:], None)
+            elif len(intersects) == 6:
+                low, high = intersects[:3], intersects[3:]
+            else:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="bbox needs 4 (x/y) or 6 (x/y/z) values",
+                )
+            conditions.append(
+                footprint_box(
+                    PointCloudFile.min_x,
+                    PointCloudFile.min_y,
+                    PointCloudFile.max_x,
+                    PointCloudFile.max_y,
+                ).op("&&")(footprint_box(low[0], low[1], high[0], high[1]))
+            )
+            if low[2] is not None:
+                conditions.append(PointCloudFile.min_z <= high[2])
+                conditions.append(PointCloudFile.max_z >= low[2])
+
+        extent_x = PointCloudFile.max_x - PointCloudFile.min_x
+        extent_y = PointCloudFile.max_y - PointCloudFile.min_y
+        columns = {
+            "x": extent_x,
+            "y": extent_y,
+            "z": PointCloudFile.max_z - PointCloudFile.min_z,
+            "length": func.greatest(extent_x, extent_y),
+        }
+        for axis, (low_value, high_value) in (extents or {}).items():
+            if low_value is not None:
+                conditions.append(columns[axis] >= low_value)
+            if high_value is not None:
+                conditions.append(columns[axis] <= high_value)
+
+        if min_points is not None:
+            conditions.append(PointCloudFile.point_count >= min_points)
+        if max_points is not None:
+            conditions.append(PointCloudFile.point_count <= max_points)
+
+        where = and_(*conditions)
+        total = await self.db.scalar(
+            select(func.count()).select_from(PointCloudFile).where(where)
+        )
+        result = await self.db.execute(
+            select(PointCloudFile)
+            .where(where)
+            .order_by(PointCloudFile.created_at.desc(), PointCloudFile.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total or 0
+
     async def delete_file(self, file_id: UUID, deleted_by: UUID) -> bool:
         """
         Delete a point cloud file.
@@ -398,10 +1555,13 @@ class FileUploadService:
             return False
 
         try:
-            # Remove from storage
-            self.minio_client.remove_object(
-                settings.MINIO_BUCKET, file_record.file_path
-            )
+            # Remove from storage unless another record still shares the object
+            if await self._is_last_reference(file_record):
+                failed = await self.storage.remove_prefix(
+                    _content_prefix(file_record.file_path)
+                )
+                if failed:
+                    raise RuntimeError(f"Could not remove {', '.join(failed)}")
 
             # Mark as deleted in database (soft delete)
             file_record.mark_deleted()
@@ -436,10 +1596,8 @@ class FileUploadService:
         try:
             from datetime import timedelta
 
-            url = self.minio_client.presigned_get_object(
-                bucket_name=settings.MINIO_BUCKET,
-                object_name=file_record.file_path,
-                expires=timedelta(hours=expires_in_hours),
+            url = await self.storage.presigned_get_object(
+                file_record.file_path, expires=timedelta(hours=expires_in_hours)
             )
             return url
 
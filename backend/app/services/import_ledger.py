@@ -0,0 +1,209 @@
+"""Resumable server-side folder imports backed by the import ledger."""
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.enums import FileStatus
+from app.models.import_ledger import ImportLedgerEntry
+from app.models.pointcloud import PointCloudFile
+from app.models.task import task_files
+from app.services.file_upload import FileUploadService, _hash_path
+
+logger = logging.getLogger(__name__)
+
+# Keeps IN (...) lists well below the asyncpg bind parameter limit
+_LOOKUP_CHUNK = 5000
+
+
+def _chunks(values: List, size: int = _LOOKUP_CHUNK):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class ImportPlan:
+    """Files of one folder scan, split by what the ledger already knows."""
+
+    def __init__(self):
+        self.new: List[Path] = []
+        self.changed: List[Path] = []
+        # Ledger entries of files that are already imported and unchanged
+        self.unchanged: List[ImportLedgerEntry] = []
+        # Ledger entry and (size, mtime_ns) of each file seen on disk
+        self.entries: Dict[Path, ImportLedgerEntry] = {}
+        self.stats: Dict[Path, Tuple[int, int]] = {}
+
+    @property
+    def to_import(self) -> List[Path]:
+        return sorted(self.new + self.changed)
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "files_new": len(self.new),
+            "files_changed": len(self.changed),
+            "files_skipped": len(self.unchanged),
+        }
+
+
+class ImportLedgerService:
+    """Service for folder imports that skip files imported by an earlier run."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize import ledger service."""
+        self.db = db
+        self.file_service = FileUploadService(db)
+
+    async def _load_entries(
+        self, project_id: UUID, relative_paths: List[str]
+    ) -> Dict[str, ImportLedgerEntry]:
+        """Ledger entries of a project keyed by relative path."""
+        entries: Dict[str, ImportLedgerEntry] = {}
+        for chunk in _chunks(relative_paths):
+            result = await self.db.execute(
+                select(ImportLedgerEntry).where(
+                    and_(
+                        ImportLedgerEntry.project_id == project_id,
+                        ImportLedgerEntry.relative_path.in_(chunk),
+                    )
+                )
+            )
+            for entry in result.scalars():
+                entries[entry.relative_path] = entry
+        return entries
+
+    async def plan(self, base_dir: Path, paths: List[Path], project_id: UUID) -> ImportPlan:
+        """
+        Compare scanned files against the ledger.
+
+        Files whose size and mtime match their entry are skipped without being
+        read. Files that differ are re-hashed, so a touched but identical file
+        only has its entry refreshed instead of being imported again.
+        """
+        plan = ImportPlan()
+        plan.stats = await run_in_threadpool(
+            lambda: {
+                path: (stat.st_size, stat.st_mtime_ns)
+                for path, stat in ((path, path.stat()) for path in paths)
+            }
+        )
+        relative = {path: path.relative_to(base_dir).as_posix() for path in paths}
+        entries = await self._load_entries(project_id, list(relative.values()))
+
+        suspects: List[Path] = []
+        for path in paths:
+            entry = entries.get(relative[path])
+            if entry is None:
+                plan.new.append(path)
+                continue
+            plan.entries[path] = entry
+            if entry.matches(*plan.stats[path]):
+                plan.unchanged.append(entry)
+            else:
+                suspects.append(path)
+
+        semaphore = asyncio.Semaphore(settings.IMPORT_CONCURRENCY)
+
+        async def _checksum(path: Path) -> Optional[str]:
+            async with semaphore:
+                try:
+                    _, checksum = await run_in_threadpool(
+                        _hash_path, path, self.file_service.max_file_size
+                    )
+                    return checksum
+                except Exception:
+                    # Let the import itself report the problem
+                    return None
+
+        checksums = await asyncio.gather(*(_checksum(path) for path in suspects))
+        for path, checksum in zip(suspects, checksums):
+            entry = plan.entries[path]
+            if checksum == entry.checksum:
+                entry.file_size, entry.mtime_ns = plan.stats[path]
+                plan.unchanged.append(entry)
+            else:
+                plan.changed.append(path)
+
+        if suspects:
+            # Persist refreshed mtimes so the next run skips these without hashing
+            await self.db.commit()
+        return plan
+
+    async def untasked_file_ids(self, entries: List[ImportLedgerEntry]) -> List[UUID]:
+        """Files of already imported entries that are not part of any task yet."""
+        file_ids = [entry.pointcloud_file_id for entry in entries if entry.pointcloud_file_id]
+        tasked = set()
+        live = set()
+        for chunk in _chunks(file_ids):
+            result = await self.db.execute(
+                select(task_files.c.pointcloud_file_id).where(
+                    task_files.c.pointcloud_file_id.in_(chunk)
+                )
+            )
+            tasked.update(result.scalars())
+            result = await self.db.execute(
+                select(PointCloudFile.id).where(
+                    and_(
+                        PointCloudFile.id.in_(chunk),
+                        PointCloudFile.status != FileStatus.DELETED,
+                    )
+                )
+            )
+            live.update(result.scalars())
+        return [file_id for file_id in file_ids if file_id in live and file_id not in tasked]
+
+    async def import_folder(
+        self,
+        base_dir: Path,
+        paths: List[Path],
+        project_id: UUID,
+        uploaded_by: UUID,
+        label: str = "Folder import",
+    ) -> Tuple[List[PointCloudFile], List[Dict[str, str]], ImportPlan]:
+        """
+        Import new and changed files of a folder scan and record them in the ledger.
+
+        Ledger entries are committed in the same transaction as their file
+        records, so an interrupted run resumes after the last committed batch.
+
+        Args:
+            base_dir: Directory that ledger paths are relative to
+            paths: Files found by the scan
+
+        Returns:
+            Tuple: Saved records, per-file errors and the import plan
+        """
+        plan = await self.plan(base_dir, paths, project_id)
+        logger.info(
+            f"{label}: {len(plan.new)} new, {len(plan.changed)} changed, "
+            f"{len(plan.unchanged)} unchanged"
+        )
+
+        def _record(path: Path, pointcloud_file: PointCloudFile) -> ImportLedgerEntry:
+            size, mtime_ns = plan.stats[path]
+            entry = plan.entries.get(path) or ImportLedgerEntry(
+                project_id=project_id,
+                relative_path=path.relative_to(base_dir).as_posix(),
+            )
+            entry.file_size = size
+            entry.mtime_ns = mtime_ns
+            entry.checksum = pointcloud_file.checksum
+            entry.pointcloud_file_id = pointcloud_file.id
+            entry.imported_by = uploaded_by
+            return entry
+
+        saved, errors = await self.file_service.import_local_files(
+            paths=plan.to_import,
+            project_id=project_id,
+            uploaded_by=uploaded_by,
+            analyze_inline=True,
+            label=label,
+            related=_record,
+        )
+        return saved, errors, plan
@@ -0,0 +1,124 @@
+"""Background quality scoring of processed point cloud files."""
+
+import hashlib
+import io
+import logging
+import tempfile
+from typing import Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.enums import FileStatus
+from app.models.pointcloud import PointCloudFile
+from app.services.file_upload import FileUploadService, _outlier_mask_path
+from app.utils.pointcloud_io import point_columns, quality_score, score_point_quality
+
+logger = logging.getLogger(__name__)
+
+
+class QualityService:
+    """Service filling data_quality, has_noise and has_outliers of processed files."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize quality service."""
+        self.db = db
+        self.file_service = FileUploadService(db)
+        self.storage = self.file_service.storage
+
+    async def _scored_sibling(self, pointcloud_file: PointCloudFile) -> Optional[PointCloudFile]:
+        """Another record of the same stored object that has been scored already."""
+        result = await self.db.execute(
+            select(PointCloudFile)
+            .where(
+                and_(
+                    PointCloudFile.file_path == pointcloud_file.file_path,
+                    PointCloudFile.id != pointcloud_file.id,
+                    PointCloudFile.status == FileStatus.PROCESSED,
+                    PointCloudFile.data_quality.is_not(None),
+                )
+            )
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def score_file(self, file_id: UUID, force: bool = False) -> Optional[PointCloudFile]:
+        """
+        Score the noise and outliers of a processed file.
+
+        Reads the canonical copy when there is one, runs the outlier and
+        density tests, stores the per-point mask next to the file and fills
+        the quality columns. Records sharing an already scored object copy
+        its results. Failures are logged and leave the file unscored.
+
+        Returns:
+            Optional[PointCloudFile]: The scored record, None if not processed
+        """
+        pointcloud_file = await self.file_service.get_file_by_id(file_id)
+        if not pointcloud_file or pointcloud_file.status != FileStatus.PROCESSED:
+            return None
+        if pointcloud_file.data_quality is not None and not force:
+            return pointcloud_file
+
+        sibling = None if force else await self._scored_sibling(pointcloud_file)
+        if sibling:
+            pointcloud_file.set_quality_metrics(
+                sibling.data_quality,
+                sibling.has_noise,
+                sibling.has_outliers,
+                sibling.quality_details,
+            )
+            await self.db.commit()
+            return pointcloud_file
+
+        if pointcloud_file.canonical_path:
+            source_path, extension = pointcloud_file.canonical_path, ".npy"
+        else:
+            source_path, extension = pointcloud_file.file_path, pointcloud_file.file_extension
+
+        try:
+            with tempfile.TemporaryFile() as local_copy:
+                await self.file_service._fetch_from_storage(source_path, local_copy)
+                mask, stats = await run_in_threadpool(
+                    lambda: score_point_quality(
+                        point_columns(local_copy, extension),
+                        neighbors=settings.QUALITY_NEIGHBORS,
+                        std_ratio=settings.QUALITY_STD_RATIO,
+                        radius_factor=settings.QUALITY_RADIUS_FACTOR,
+                        min_neighbors=settings.QUALITY_MIN_NEIGHBORS,
+                        kdtree_max_points=settings.QUALITY_KDTREE_MAX_POINTS,
+                    )
+                )
+
+            buffer = io.BytesIO()
+            np.save(buffer, mask)
+            mask_size = buffer.tell()
+            mask_sha256 = hashlib.sha256(buffer.getbuffer()).hexdigest()
+            buffer.seek(0)
+            await self.storage.put_object(
+                _outlier_mask_path(pointcloud_file.file_path), buffer, length=mask_size
+            )
+        except Exception as e:
+            logger.error(f"Quality scoring failed for file {file_id}: {e}")
+            return pointcloud_file
+
+        points = max(stats["points"], 1)
+        details = {
+            **stats,
+            "outlier_ratio": stats["outliers"] / points,
+            "noise_ratio": stats["noise"] / points,
+            "mask": True,
+            "mask_sha256": mask_sha256,
+        }
+        pointcloud_file.set_quality_metrics(
+            quality_score(stats["flagged"] / points),
+            has_noise=details["noise_ratio"] > settings.QUALITY_NOISE_RATIO,
+            has_outliers=details["outlier_ratio"] > settings.QUALITY_OUTLIER_RATIO,
+            details=details,
+        )
+        await self.db.commit()
+        return pointcloud_file
@@ -1,15 +1,18 @@
 """Task management service for creating, assigning, and tracking annotation tasks."""
 
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import and_, event, func, inspect, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload
 
+from app.core.config import settings
 from app.models.enums import TaskPriority, TaskStatus
 from app.models.pointcloud import PointCloudFile
 from app.models.project import Project, ProjectMember
@@ -25,9 +28,81 @@ from app.schemas.task import (
     TaskSummary,
     TaskUpdate,
 )
+from app.utils.pagination import decode_cursor, keyset_condition, keyset_page
 
 logger = logging.getLogger(__name__)
 
+# Task attributes the project statistics depend on
+_STATS_ATTRIBUTES = ("project_id", "status", "due_date")
+_STATS_SESSION_KEY = "task_stats_projects"
+
+# project_id -> (expiry on the monotonic clock, statistics), oldest first; per process
+_task_stats_cache: "OrderedDict[UUID, Tuple[float, TaskStats]]" = OrderedDict()
+# project_id -> invalidation count, so that a count read across an invalidation
+# is not stored; bounded like the cache, forgetting the oldest projects
+_task_stats_versions: "OrderedDict[UUID, int]" = OrderedDict()
+# Number of forgotten invalidation counts: a read spanning one is not stored either
+_task_stats_forgotten = 0
+
+
+def _task_stats_version(project_id: UUID) -> Tuple[int, int]:
+    return _task_stats_versions.get(project_id, 0), _task_stats_forgotten
+
+
+def invalidate_task_stats(project_id: UUID) -> None:
+    """Drop the cached statistics of a project."""
+    global _task_stats_forgotten
+    _task_stats_cache.pop(project_id, None)
+    _task_stats_versions[project_id] = _task_stats_versions.pop(project_id, 0) + 1
+    if len(_task_stats_versions) > settings.TASK_STATS_CACHE_SIZE:
+        _task_stats_versions.popitem(last=False)
+        _task_stats_forgotten += 1
+
+
+def _store_task_stats(project_id: UUID, stats: TaskStats, version: Tuple[int, int]) -> None:
+    """Cache statistics counted at ``version``, unless the project changed since."""
+    if version != _task_stats_version(project_id):
+        return
+    now = time.monotonic()
+    _task_stats_cache.pop(project_id, None)
+    _task_stats_cache[project_id] = (now + settings.TASK_STATS_TTL, stats)
+    # Entries are in storing order, so the expired ones are at the front
+    while _task_stats_cache:
+        expiry, _ = next(iter(_task_stats_cache.values()))
+        if expiry > now and len(_task_stats_cache) <= settings.TASK_STATS_CACHE_SIZE:
+            break
+        _task_stats_cache.popitem(last=False)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_task_stats_changes(session: Session, flush_context) -> None:
+    """Remember the projects whose task statistics the flushed changes affect."""
+    projects = session.info.setdefault(_STATS_SESSION_KEY, set())
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Task):
+            projects.add(obj.project_id)
+    for obj in session.dirty:
+        if not isinstance(obj, Task):
+            continue
+        attrs = inspect(obj).attrs
+        for name in _STATS_ATTRIBUTES:
+            history = attrs[name].history
+            if history.has_changes():
+                projects.update(attrs.project_id.history.sum())
+                break
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_task_stats(session: Session) -> None:
+    """Drop the cached statistics of the projects changed by the transaction."""
+    for project_id in session.info.pop(_STATS_SESSION_KEY, ()):
+        invalidate_task_stats(project_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_task_stats_changes(session: Session) -> None:
+    session.info.pop(_STATS_SESSION_KEY, None)
+
 
 class TaskService:
     """Service for managing annotation tasks."""
@@ -269,76 +344,110 @@ class TaskService:
             logger.error(f"Error fetching task {task_id}: {e}")
             return None
 
+    async def _task_page(
+        self,
+        conditions: list,
+        options: list,
+        page: int,
+        size: int,
+        cursor: Optional[str],
+        include_total: bool,
+    ) -> TaskListResponse:
+        """
+        One page of tasks, newest first.
+
+        With a ``cursor`` the page continues after the task it names
+        (``page`` is ignored), via the (…, created_at, id) indexes. The total
+        is counted only when asked for.
+        """
+        key = decode_cursor(cursor, (datetime, UUID)) if cursor else None
+
+        total = None
+        if include_total:
+            total_result = await self.db.execute(
+                select(func.count(Task.id)).where(*conditions)
+            )
+            total = total_result.scalar()
+
+        query = select(Task).where(*conditions).options(*options)
+        if key:
+            query = query.where(keyset_condition((Task.created_at, Task.id), key))
+        else:
+            query = query.offset((page - 1) * size)
+        query = query.limit(size + 1).order_by(Task.created_at.desc(), Task.id.desc())
+
+        result = await self.db.execute(query)
+        tasks, next_cursor = keyset_page(
+            result.scalars().all(), size, lambda task: (task.created_at, task.id)
+        )
+
+        # Convert to response format
+        task_responses = [TaskResponse.model_validate(task) for task in tasks]
+
+        pages = (total + size - 1) // size if total is not None else None
+
+        return TaskListResponse(
+            items=task_responses,
+            total=total,
+            page=None if key else page,
+            size=size,
+            pages=pages,
+            next_cursor=next_cursor,
+        )
+
     async def get_project_tasks(
         self,
         project_id: UUID,
         filters: Optional[TaskFilter] = None,
         page: int = 1,
         size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> TaskListResponse:
         """Get tasks for a project with filtering and pagination."""
-        try:
-            # Base query for project tasks
-            query = (
-                select(Task)
-                .where(Task.project_id == project_id)
-                .options(
-                    selectinload(Task.creator),
-                    selectinload(Task.assignee),
-                    selectinload(Task.files),
-                    selectinload(Task.annotations),
-                )
-            )
-
-            # Apply filters
-            if filters:
-                if filters.status:
-                    query = query.where(Task.status == filters.status)
-                if filters.priority:
-                    query = query.where(Task.priority == filters.priority)
-                if filters.assigned_to:
-                    query = query.where(Task.assigned_to == filters.assigned_to)
-                if filters.created_by:
-                    query = query.where(Task.created_by == filters.created_by)
-                if filters.name:
-                    query = query.where(Task.name.ilike(f"%{filters.name}%"))
-                if filters.overdue_only:
-                    query = query.where(
-                        and_(
-                            Task.due_date.isnot(None),
-                            Task.due_date < datetime.utcnow(),
-                            Task.status.notin_(
-                                [
-                                    TaskStatus.COMPLETED,
-                                    TaskStatus.REVIEWED,
-                                    TaskStatus.CANCELLED,
-                                ]
-                            ),
-                        )
+        conditions = [Task.project_id == project_id]
+
+        # Apply filters
+        if filters:
+            if filters.status:
+                conditions.append(Task.status == filters.status)
+            if filters.priority:
+                conditions.append(Task.priority == filters.priority)
+            if filters.assigned_to:
+                conditions.append(Task.assigned_to == filters.assigned_to)
+            if filters.created_by:
+                conditions.append(Task.created_by == filters.created_by)
+            if filters.name:
+                conditions.append(Task.name.ilike(f"%{filters.name}%"))
+            if filters.overdue_only:
+                conditions.append(
+                    and_(
+                        Task.due_date.isnot(None),
+                        Task.due_date < datetime.utcnow(),
+                        Task.status.notin_(
+                            [
+                                TaskStatus.COMPLETED,
+                                TaskStatus.REVIEWED,
+                                TaskStatus.CANCELLED,
+                            ]
+                        ),
                     )
+                )
 
-            # Count total
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await self.db.execute(count_query)
-            total = total_result.scalar()
-
-            # Apply pagination
-            offset = (page - 1) * size
-            query = query.offset(offset).limit(size).order_by(Task.created_at.desc())
-
-            # Execute query
-            result = await self.db.execute(query)
-            tasks = result.scalars().all()
-
-            # Convert to response format
-            task_responses = [TaskResponse.model_validate(task) for task in tasks]
-
-            pages = (total + size - 1) // size
+        options = [
+            selectinload(Task.creator),
+            selectinload(Task.assignee),
+            selectinload(Task.files),
+            selectinload(Task.annotations),
+        ]
 
-            return TaskListResponse(
-                items=task_responses, total=total, page=page, size=size, pages=pages
+        try:
+            return await self._task_page(
+                conditions, options, page, size, cursor, include_total
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching tasks for project {project_id}: {e}")
             raise HTTPException(
@@ -353,47 +462,31 @@ class TaskService:
         status_filter: Optional[TaskStatus] = None,
         page: int = 1,
         size: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> TaskListResponse:
         """Get tasks assigned to a specific user."""
-        try:
-            query = (
-                select(Task)
-                .where(Task.assigned_to == user_id)
-                .options(
-                    selectinload(Task.creator),
-                    selectinload(Task.files),
-                    selectinload(Task.annotations),
-                )
-            )
-
-            if project_id:
-                query = query.where(Task.project_id == project_id)
-
-            if status_filter:
-                query = query.where(Task.status == status_filter)
-
-            # Count total
-            count_query = select(func.count()).select_from(query.subquery())
-            total_result = await self.db.execute(count_query)
-            total = total_result.scalar()
-
-            # Apply pagination
-            offset = (page - 1) * size
-            query = query.offset(offset).limit(size).order_by(Task.created_at.desc())
+        conditions = [Task.assigned_to == user_id]
 
-            # Execute query
-            result = await self.db.execute(query)
-            tasks = result.scalars().all()
+        if project_id:
+            conditions.append(Task.project_id == project_id)
 
-            # Convert to response format
-            task_responses = [TaskResponse.model_validate(task) for task in tasks]
+        if status_filter:
+            conditions.append(Task.status == status_filter)
 
-            pages = (total + size - 1) // size
+        options = [
+            selectinload(Task.creator),
+            selectinload(Task.files),
+            selectinload(Task.annotations),
+        ]
 
-            return TaskListResponse(
-                items=task_responses, total=total, page=page, size=size, pages=pages
+        try:
+            return await self._task_page(
+                conditions, options, page, size, cursor, include_total
             )
 
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching user tasks for {user_id}: {e}")
             raise HTTPException(
@@ -650,34 +743,41 @@ class TaskService:
             return None
 
     async def get_task_stats(self, project_id: UUID) -> TaskStats:
-        """Get task statistics for a project."""
-        try:
-            # Count tasks by status
-            status_counts = {}
-            for status in TaskStatus:
-                count_query = select(func.count()).where(
-                    and_(Task.project_id == project_id, Task.status == status)
-                )
-                result = await self.db.execute(count_query)
-                status_counts[status.value] = result.scalar()
+        """
+        Get task statistics for a project.
 
-            # Get overdue tasks count
-            overdue_query = select(func.count()).where(
-                and_(
-                    Task.project_id == project_id,
-                    Task.due_date.isnot(None),
-                    Task.due_date < datetime.utcnow(),
-                    Task.status.notin_(
-                        [
-                            TaskStatus.COMPLETED,
-                            TaskStatus.REVIEWED,
-                            TaskStatus.CANCELLED,
-                        ]
-                    ),
-                )
+        Counted in one grouped query and kept for ``TASK_STATS_TTL`` seconds;
+        committed task changes of the project drop the cached copy.
+        """
+        cached = _task_stats_cache.get(project_id)
+        if cached and cached[0] > time.monotonic():
+            return cached[1].model_copy(deep=True)
+        version = _task_stats_version(project_id)
+
+        try:
+            # Count tasks by status, and the overdue ones among them, in one pass
+            overdue = and_(
+                Task.due_date.isnot(None),
+                Task.due_date < datetime.utcnow(),
+                Task.status.notin_(
+                    [
+                        TaskStatus.COMPLETED,
+                        TaskStatus.REVIEWED,
+                        TaskStatus.CANCELLED,
+                    ]
+                ),
+            )
+            result = await self.db.execute(
+                select(Task.status, func.count(), func.count().filter(overdue))
+                .where(Task.project_id == project_id)
+                .group_by(Task.status)
             )
-            overdue_result = await self.db.execute(overdue_query)
-            overdue_count = overdue_result.scalar()
+
+            status_counts = {task_status.value: 0 for task_status in TaskStatus}
+            overdue_count = 0
+            for task_status, count, overdue_in_status in result:
+                status_counts[task_status.value] = count
+                overdue_count += overdue_in_status
 
             # Calculate completion rate
             total_tasks = sum(
@@ -691,7 +791,7 @@ class TaskService:
                 (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
             )
 
-            return TaskStats(
+            stats = TaskStats(
                 total_tasks=total_tasks,
                 pending_tasks=status_counts.get("pending", 0),
                 assigned_tasks=status_counts.get("assigned", 0),
@@ -709,6 +809,10 @@ class TaskService:
                 detail="Failed to get task statistics",
             )
 
+        if settings.TASK_STATS_TTL > 0:
+            _store_task_stats(project_id, stats.model_copy(deep=True), version)
+        return stats
+
     async def delete_task(self, task_id: UUID, user_id: UUID) -> bool:
         """Delete a task (soft delete by cancelling)."""
         task = await self.get_task_by_id(task_id, include_relations=False)
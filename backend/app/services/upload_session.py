@@ -0,0 +1,356 @@
+"""Resumable chunked upload service for large point cloud files."""
+
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from minio.error import S3Error
+from sqlalchemy import and_, delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.enums import FileStatus, UploadSessionStatus
+from app.models.pointcloud import PointCloudFile
+from app.models.upload_session import UploadSession
+from app.services.file_upload import FileUploadService
+
+logger = logging.getLogger(__name__)
+
+# S3 multipart composition requires every part but the last to be >= 5 MiB.
+MIN_CHUNK_SIZE = 5 * 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+class UploadSessionService:
+    """Service for resumable uploads: create session, PUT chunks, finalize."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize upload session service."""
+        self.db = db
+        self.file_service = FileUploadService(db)
+        self.storage = self.file_service.storage
+
+    async def create_session(
+        self,
+        project_id: UUID,
+        created_by: UUID,
+        filename: str,
+        file_size: int,
+        chunk_size: Optional[int] = None,
+        checksum: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> UploadSession:
+        """Start a resumable upload for one file."""
+        file_ext = Path(filename).suffix.lower()
+        if file_ext not in self.file_service.allowed_extensions:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file type: {file_ext}. Allowed: {', '.join(self.file_service.allowed_extensions)}",
+            )
+
+        if file_size > self.file_service.max_file_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size: {settings.MAX_FILE_SIZE}MB",
+            )
+
+        chunk_size = chunk_size or settings.UPLOAD_SESSION_CHUNK_SIZE
+        if not MIN_CHUNK_SIZE <= chunk_size <= MAX_CHUNK_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk size must be between {MIN_CHUNK_SIZE} and {MAX_CHUNK_SIZE} bytes",
+            )
+
+        session = UploadSession(
+            project_id=project_id,
+            created_by=created_by,
+            original_filename=filename,
+            file_extension=file_ext,
+            file_size=file_size,
+            description=description,
+            expected_checksum=checksum.lower() if checksum else None,
+            chunk_size=chunk_size,
+            total_chunks=max(1, math.ceil(file_size / chunk_size)),
+            received_chunks={},
+            status=UploadSessionStatus.ACTIVE,
+            expires_at=datetime.utcnow()
+            + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+        )
+
+        self.db.add(session)
+        await self.db.commit()
+        await self.db.refresh(session)
+
+        logger.info(
+            f"Upload session {session.id} started for {filename} "
+            f"({file_size} bytes, {session.total_chunks} chunks)"
+        )
+        return session
+
+    async def get_session(
+        self, session_id: UUID, project_id: UUID, for_update: bool = False
+    ) -> UploadSession:
+        """
+        Get an upload session within project context.
+
+        With ``for_update`` the row is locked and re-read, also if the session
+        is already in the identity map, so that its attributes are current.
+        """
+        stmt = select(UploadSession).where(
+            and_(
+                UploadSession.id == session_id,
+                UploadSession.project_id == project_id,
+            )
+        )
+        if for_update:
+            stmt = stmt.with_for_update().execution_options(populate_existing=True)
+
+        result = await self.db.execute(stmt)
+        session = result.scalar_one_or_none()
+        if not session:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Upload session not found"
+            )
+        return session
+
+    async def _ensure_active(self, session: UploadSession) -> None:
+        """
+        Reject operations on finished or expired sessions.
+
+        An expired session found here is aborted and its chunks removed
+        right away rather than waiting for the periodic purge.
+        """
+        if session.status != UploadSessionStatus.ACTIVE:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload session is {session.status.value}",
+            )
+        if session.is_expired:
+            session.status = UploadSessionStatus.ABORTED
+            await self.db.commit()
+            await self._remove_chunks(session)
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE, detail="Upload session has expired"
+            )
+
+    async def put_chunk(
+        self,
+        session_id: UUID,
+        project_id: UUID,
+        index: int,
+        data: bytes,
+        checksum: Optional[str] = None,
+    ) -> UploadSession:
+        """
+        Store one chunk of an upload.
+
+        Chunks may arrive in any order and may be re-sent; a re-sent chunk with
+        the same content is a no-op.
+        """
+        session = await self.get_session(session_id, project_id)
+        await self._ensure_active(session)
+
+        if not 0 <= index < session.total_chunks:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk index must be between 0 and {session.total_chunks - 1}",
+            )
+
+        expected_size = session.expected_chunk_size(index)
+        if len(data) != expected_size:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Chunk {index} must be {expected_size} bytes, got {len(data)}",
+            )
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        if checksum and checksum.lower() != sha256:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Checksum mismatch for chunk {index}",
+            )
+
+        existing = (session.received_chunks or {}).get(str(index))
+        if existing and existing["sha256"] == sha256:
+            return session
+
+        try:
+            await self.storage.put_object(
+                session.chunk_object_name(index), BytesIO(data), length=len(data)
+            )
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to store chunk: {e}",
+            )
+
+        # Concurrent chunk PUTs update the same JSON column; lock the row.
+        session = await self.get_session(session_id, project_id, for_update=True)
+        if session.status != UploadSessionStatus.ACTIVE:
+            # Completed or aborted while the chunk was stored, and its chunks
+            # removed: do not leave this one behind. Detached first so that
+            # releasing the lock does not expire the attributes used below.
+            self.db.expunge(session)
+            await self.db.rollback()
+            await self._remove_chunks(session)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Upload session is {session.status.value}",
+            )
+        session.record_chunk(index, len(data), sha256)
+        await self.db.commit()
+        await self.db.refresh(session)
+        return session
+
+    async def complete_session(
+        self, session_id: UUID, project_id: UUID
+    ) -> PointCloudFile:
+        """
+        Assemble all chunks into the final object and create the file record.
+
+        The chunks are concatenated server-side by MinIO (multipart copy), so
+        the assembled file never passes through the API process in one piece.
+        Analysis and checksum verification run in the background stage.
+        """
+        session = await self.get_session(session_id, project_id, for_update=True)
+        await self._ensure_active(session)
+
+        missing = session.missing_indexes
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{len(missing)} chunk(s) missing, first missing index: {missing[0]}",
+            )
+
+        storage_path = self.file_service._get_storage_path(
+            project_id, session.original_filename
+        )
+
+        try:
+            await self.storage.compose_object(
+                storage_path,
+                [session.chunk_object_name(i) for i in range(session.total_chunks)],
+            )
+        except S3Error as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to assemble upload: {e}",
+            )
+
+        pointcloud_file = PointCloudFile(
+            project_id=project_id,
+            filename=Path(storage_path).name,
+            original_filename=session.original_filename,
+            file_path=storage_path,
+            file_size=session.file_size,
+            file_extension=session.file_extension,
+            mime_type="application/octet-stream",
+            uploaded_by=session.created_by,
+            # Verified against the assembled object by the analysis stage
+            checksum=session.expected_checksum,
+            status=FileStatus.UPLOADING,
+            upload_started_at=session.created_at,
+        )
+        pointcloud_file.mark_upload_completed()
+
+        try:
+            self.db.add(pointcloud_file)
+            await self.db.flush()
+
+            session.status = UploadSessionStatus.COMPLETED
+            session.completed_at = datetime.utcnow()
+            session.pointcloud_file_id = pointcloud_file.id
+
+            await self.db.commit()
+            await self.db.refresh(pointcloud_file)
+
+        except Exception as e:
+            await self.db.rollback()
+            # Chunks remain so finalize can be retried
+            await self.file_service._remove_object(storage_path)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to finalize upload: {e}",
+            )
+
+        await self._remove_chunks(session)
+        logger.info(f"Upload session {session.id} completed as file {pointcloud_file.id}")
+
+        if not self.file_service.enqueue_processing(pointcloud_file.id):
+            pointcloud_file = await self.file_service.process_file(pointcloud_file.id)
+
+        return pointcloud_file
+
+    async def abort_session(self, session_id: UUID, project_id: UUID) -> None:
+        """Abort an upload and discard its staged chunks."""
+        session = await self.get_session(session_id, project_id, for_update=True)
+        if session.status == UploadSessionStatus.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Upload session is already completed",
+            )
+
+        session.status = UploadSessionStatus.ABORTED
+        await self.db.commit()
+        await self._remove_chunks(session)
+
+    async def purge_expired_sessions(self, limit: int = 500) -> int:
+        """
+        Delete expired sessions that never completed, with their staged chunks.
+
+        Completed sessions are kept as the record of their upload. Rows are
+        locked with SKIP LOCKED, so concurrent purges do not collide.
+
+        Returns:
+            int: Number of sessions purged
+        """
+        result = await self.db.execute(
+            select(UploadSession)
+            .where(
+                and_(
+                    UploadSession.status != UploadSessionStatus.COMPLETED,
+                    UploadSession.expires_at < datetime.utcnow(),
+                )
+            )
+            .order_by(UploadSession.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        sessions = list(result.scalars().all())
+        if not sessions:
+            return 0
+
+        for session in sessions:
+            await self._remove_chunks(session)
+
+        await self.db.execute(
+            delete(UploadSession).where(
+                UploadSession.id.in_([session.id for session in sessions])
+            )
+        )
+        await self.db.commit()
+
+        logger.info(f"Purged {len(sessions)} expired upload session(s)")
+        return len(sessions)
+
+    async def _remove_chunks(self, session: UploadSession) -> None:
+        """
+        Best-effort removal of staged chunk objects.
+
+        Removes the whole chunk prefix, so chunks stored without being
+        recorded (a failed commit after the PUT) go as well.
+        """
+
+        try:
+            failed = await self.storage.remove_prefix(session.chunk_prefix)
+        except S3Error as e:
+            logger.warning(f"Failed to remove chunks of {session.id}: {e}")
+            return
+        for name in failed:
+            logger.warning(f"Failed to remove chunk {name} of {session.id}")
@@ -0,0 +1,98 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row of a page, JSON encoded and made
+URL safe. The next page continues strictly after it with a row comparison
+such as ``(created_at, id) < (:created_at, :id)``, which a composite index
+on the same columns answers without walking the skipped rows, unlike
+OFFSET.
+"""
+
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+T = TypeVar("T")
+
+_DECODERS = {
+    datetime: datetime.fromisoformat,
+    UUID: UUID,
+    int: int,
+    float: float,
+    str: str,
+}
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque cursor for a sort key."""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> Tuple[Any, ...]:
+    """
+    Sort key of a cursor made by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor from a previous page
+        types: Type of each key part (datetime, UUID, int, float, str or an Enum)
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of key parts")
+        return tuple(
+            None if value is None else _DECODERS.get(kind, kind)(value)
+            for kind, value in zip(types, values)
+        )
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+
+
+def keyset_condition(columns: Sequence, values: Sequence[Any], descending: bool = True):
+    """
+    Rows strictly after ``values`` in the order of ``columns``.
+
+    All columns sort the same way (descending by default), so the test is a
+    single row comparison that PostgreSQL matches against a composite index.
+    """
+    key = tuple_(*columns)
+    bound = tuple_(*values)
+    return key < bound if descending else key > bound
+
+
+def keyset_page(
+    rows: Sequence[T], limit: int, key: Callable[[T], Tuple[Any, ...]]
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Split the ``limit + 1`` rows of a keyset query into a page and the next cursor.
+
+    Returns:
+        Tuple: Rows of the page, and the cursor of the next page (None on the last page)
+    """
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
@@ -0,0 +1,1363 @@
+"""
+Point cloud file readers and analysis.
+
+PLY and PCD readers parse only the text header and then map the binary
+point block straight onto a NumPy structured dtype, so the point data is
+never parsed in Python. ``.npy``/``.npz`` files are validated from their
+headers (and the zip directory) before the chosen array is mapped.
+
+``write_canonical_points`` produces the internal format stored at ingest,
+``compute_descriptors`` summarizes its geometry once for every consumer,
+``score_point_quality`` flags outliers and noise,
+``build_octree`` partitions it into the tiles served to the viewer for
+very large clouds, and ``write_quantized_points`` encodes the compact
+transport format used over slow links.
+"""
+
+import base64
+import io
+import struct
+import tempfile
+import zipfile
+import zlib
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+try:  # Optional C implementation of LZF
+    import lzf as _lzf
+except ImportError:  # pragma: no cover - depends on the environment
+    _lzf = None
+
+try:  # Optional KD-tree for the quality stage; a voxel hash is used without it
+    from scipy.spatial import cKDTree as _KDTree
+except ImportError:  # pragma: no cover - depends on the environment
+    _KDTree = None
+
+try:  # Optional zstd compression of the quantized transport format
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on the environment
+    _zstd = None
+
+
+class PointCloudFormatError(ValueError):
+    """Raised when a point cloud file cannot be parsed."""
+
+
+# PLY property types (both naming conventions) -> NumPy type codes
+_PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+_PLY_BYTE_ORDER = {
+    "ascii": "<",
+    "binary_little_endian": "<",
+    "binary_big_endian": ">",
+}
+
+# PCD TYPE letters -> NumPy kind
+_PCD_KINDS = {"F": "f", "I": "i", "U": "u"}
+
+_NPZ_POINT_KEYS = ("points", "pts", "data", "xyz", "lidar", "vertex")
+
+# Rows reduced per step when computing bounding boxes
+_REDUCE_ROWS = 1 << 16
+
+_COLOR_FIELDS = ({"red", "green", "blue"}, {"r", "g", "b"})
+_NORMAL_FIELDS = ({"nx", "ny", "nz"}, {"normal_x", "normal_y", "normal_z"})
+_PACKED_COLOR_FIELDS = {"rgb", "rgba"}
+
+
+def _readline(source: BinaryIO) -> str:
+    line = source.readline()
+    if not line:
+        raise PointCloudFormatError("Unexpected end of file in header")
+    return line.decode("ascii", errors="replace").strip()
+
+
+def _unwrap(source: BinaryIO):
+    """Return the object that actually holds the bytes of ``source``."""
+    if isinstance(source, tempfile.SpooledTemporaryFile):
+        # BytesIO until rolled over to disk, then a real file
+        return source._file
+    return source
+
+
+def _map_block(source: BinaryIO, dtype: np.dtype, count: int, offset: int) -> np.ndarray:
+    """
+    View ``count`` records of ``dtype`` starting at byte ``offset``.
+
+    In-memory buffers are viewed in place and real files are memory-mapped;
+    anything else is read once into a bytes object.
+    """
+    nbytes = dtype.itemsize * count
+    if count == 0:
+        return np.empty(0, dtype=dtype)
+
+    raw = _unwrap(source)
+    if isinstance(raw, io.BytesIO):
+        buffer = raw.getbuffer()
+        if len(buffer) < offset + nbytes:
+            raise PointCloudFormatError("File is shorter than its header declares")
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+
+    try:
+        raw.fileno()
+        has_fileno = True
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        has_fileno = False
+
+    if has_fileno:
+        raw.flush()
+        raw.seek(0, io.SEEK_END)
+        if raw.tell() < offset + nbytes:
+            raise PointCloudFormatError("File is shorter than its header declares")
+        return np.memmap(raw, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+    source.seek(offset)
+    data = source.read(nbytes)
+    if len(data) < nbytes:
+        raise PointCloudFormatError("File is shorter than its header declares")
+    return np.frombuffer(data, dtype=dtype, count=count)
+
+
+def _load_text_block(source: BinaryIO, dtype: np.dtype, count: int, offset: int) -> np.ndarray:
+    """Parse ``count`` whitespace-separated rows with NumPy's C text reader."""
+    source.seek(offset)
+    text = io.TextIOWrapper(source, encoding="ascii", errors="replace")
+    try:
+        data = np.loadtxt(text, dtype=dtype, max_rows=count, ndmin=1, comments=None)
+    finally:
+        text.detach()
+    if len(data) < count:
+        raise PointCloudFormatError("File is shorter than its header declares")
+    return data
+
+
+# --------------------------------------------------------------------------- #
+# LZF
+# --------------------------------------------------------------------------- #
+
+def lzf_decompress(data: bytes, expected_size: int) -> bytes:
+    """Decompress an LZF stream as written by PCL's ``binary_compressed``."""
+    if _lzf is not None:
+        result = _lzf.decompress(data, expected_size + 1)
+        if result is None or len(result) != expected_size:
+            raise PointCloudFormatError("LZF data does not match declared size")
+        return result
+
+    out = bytearray(expected_size)
+    ip = op = 0
+    end = len(data)
+    try:
+        while ip < end:
+            ctrl = data[ip]
+            ip += 1
+            if ctrl < 32:
+                # Literal run of ctrl + 1 bytes
+                length = ctrl + 1
+                out[op:op + length] = data[ip:ip + length]
+                ip += length
+                op += length
+            else:
+                # Back reference
+                length = ctrl >> 5
+                if length == 7:
+                    length += data[ip]
+                    ip += 1
+                ref = op - ((ctrl & 0x1F) << 8) - data[ip] - 1
+                ip += 1
+                length += 2
+                if ref < 0:
+                    raise PointCloudFormatError("Invalid LZF back reference")
+                distance = op - ref
+                if distance >= length:
+                    out[op:op + length] = out[ref:ref + length]
+                else:
+                    pattern = bytes(out[ref:op])
+                    out[op:op + length] = (pattern * (length // distance + 1))[:length]
+                op += length
+    except IndexError:
+        raise PointCloudFormatError("Truncated LZF data")
+
+    if op != expected_size:
+        raise PointCloudFormatError("LZF data does not match declared size")
+    return bytes(out)
+
+
+# --------------------------------------------------------------------------- #
+# PLY
+# --------------------------------------------------------------------------- #
+
+def _parse_ply_header(source: BinaryIO) -> Tuple[str, List[dict], int]:
+    source.seek(0)
+    if _readline(source) != "ply":
+        raise PointCloudFormatError("Missing 'ply' magic")
+
+    fmt = None
+    elements: List[dict] = []
+    while True:
+        line = _readline(source)
+        if line == "end_header":
+            break
+        parts = line.split()
+        if not parts or parts[0] in ("comment", "obj_info"):
+            continue
+        if parts[0] == "format":
+            fmt = parts[1] if len(parts) > 1 else None
+            if fmt not in _PLY_BYTE_ORDER:
+                raise PointCloudFormatError(f"Unsupported PLY format: {fmt}")
+        elif parts[0] in ("element", "property"):
+            try:
+                _add_ply_declaration(elements, parts)
+            except (IndexError, ValueError) as e:
+                raise PointCloudFormatError(f"Invalid PLY header line {line!r}: {e}")
+
+    if fmt is None:
+        raise PointCloudFormatError("Missing PLY format line")
+    return fmt, elements, source.tell()
+
+
+def _add_ply_declaration(elements: List[dict], parts: List[str]) -> None:
+    if parts[0] == "element":
+        elements.append({"name": parts[1], "count": int(parts[2]), "properties": []})
+        return
+
+    if not elements:
+        raise PointCloudFormatError("Property declared before any element")
+    if parts[1] == "list":
+        elements[-1]["properties"].append((parts[4], None))
+    elif parts[1] in _PLY_TYPES:
+        elements[-1]["properties"].append((parts[2], _PLY_TYPES[parts[1]]))
+    else:
+        raise PointCloudFormatError(f"Unknown PLY property type: {parts[1]}")
+
+
+def read_ply(source: BinaryIO) -> np.ndarray:
+    """Return the PLY ``vertex`` element as a structured array."""
+    fmt, elements, offset = _parse_ply_header(source)
+    order = _PLY_BYTE_ORDER[fmt]
+
+    for element in elements:
+        is_list = any(code is None for _, code in element["properties"])
+        if element["name"] == "vertex":
+            if is_list:
+                raise PointCloudFormatError("List properties on vertices are not supported")
+            dtype = np.dtype([(name, order + code) for name, code in element["properties"]])
+            if fmt == "ascii":
+                return _load_text_block(source, dtype, element["count"], offset)
+            return _map_block(source, dtype, element["count"], offset)
+
+        if fmt == "ascii":
+            raise PointCloudFormatError("ASCII PLY vertex element must come first")
+        if is_list:
+            # Variable-length records; the vertex offset cannot be computed
+            raise PointCloudFormatError("Vertex element must precede list elements")
+        offset += element["count"] * sum(np.dtype(code).itemsize for _, code in element["properties"])
+
+    raise PointCloudFormatError("PLY file has no vertex element")
+
+
+# --------------------------------------------------------------------------- #
+# PCD
+# --------------------------------------------------------------------------- #
+
+def _parse_pcd_header(source: BinaryIO) -> Tuple[Dict[str, List[str]], int]:
+    source.seek(0)
+    header: Dict[str, List[str]] = {}
+    while True:
+        line = _readline(source)
+        if not line or line.startswith("#"):
+            continue
+        key, *values = line.split()
+        header[key.upper()] = values
+        if key.upper() == "DATA":
+            break
+    return header, source.tell()
+
+
+def read_pcd(source: BinaryIO) -> np.ndarray:
+    """Return the points of a PCD file as a structured array."""
+    header, offset = _parse_pcd_header(source)
+
+    try:
+        fields = header["FIELDS"]
+        sizes = [int(s) for s in header["SIZE"]]
+        types = header["TYPE"]
+        counts = [int(c) for c in header.get("COUNT", ["1"] * len(fields))]
+        if "POINTS" in header:
+            points = int(header["POINTS"][0])
+        else:
+            points = int(header["WIDTH"][0]) * int(header.get("HEIGHT", ["1"])[0])
+        data_format = header["DATA"][0].lower()
+    except (KeyError, IndexError, ValueError) as e:
+        raise PointCloudFormatError(f"Invalid PCD header: {e}")
+
+    if not (len(fields) == len(sizes) == len(types) == len(counts)):
+        raise PointCloudFormatError("PCD FIELDS/SIZE/TYPE/COUNT lengths differ")
+
+    columns = []
+    seen: Dict[str, int] = {}
+    for name, size, kind, count in zip(fields, sizes, types, counts):
+        if kind.upper() not in _PCD_KINDS:
+            raise PointCloudFormatError(f"Unknown PCD field type: {kind}")
+        if name == "_":
+            # PCL padding fields; keep them so offsets stay right
+            seen[name] = seen.get(name, 0) + 1
+            name = f"_pad{seen['_']}"
+        code = f"<{_PCD_KINDS[kind.upper()]}{size}"
+        columns.append((name, code, (count,)) if count > 1 else (name, code))
+    dtype = np.dtype(columns)
+
+    if data_format == "ascii":
+        return _load_text_block(source, dtype, points, offset)
+    if data_format == "binary":
+        return _map_block(source, dtype, points, offset)
+    if data_format == "binary_compressed":
+        return _read_pcd_compressed(source, dtype, points, offset)
+    raise PointCloudFormatError(f"Unsupported PCD data format: {data_format}")
+
+
+def _read_pcd_compressed(source: BinaryIO, dtype: np.dtype, points: int, offset: int) -> np.ndarray:
+    source.seek(offset)
+    sizes = source.read(8)
+    if len(sizes) < 8:
+        raise PointCloudFormatError("Missing binary_compressed size header")
+    compressed_size, uncompressed_size = np.frombuffer(sizes, dtype="<u4")
+    if uncompressed_size != dtype.itemsize * points:
+        raise PointCloudFormatError("Compressed PCD size does not match header")
+
+    compressed = source.read(int(compressed_size))
+    if len(compressed) < compressed_size:
+        raise PointCloudFormatError("Truncated binary_compressed data")
+    raw = lzf_decompress(compressed, int(uncompressed_size))
+
+    # Decompressed data is stored field by field rather than point by point
+    result = np.empty(points, dtype=dtype)
+    field_offset = 0
+    for name in dtype.names:
+        field_dtype = dtype.fields[name][0]
+        column = np.frombuffer(
+            raw, dtype=field_dtype.base, count=points * max(1, int(np.prod(field_dtype.shape))),
+            offset=field_offset,
+        )
+        result[name] = column.reshape((points,) + field_dtype.shape)
+        field_offset += field_dtype.itemsize * points
+    return result
+
+
+# --------------------------------------------------------------------------- #
+# NumPy
+# --------------------------------------------------------------------------- #
+
+class _NpyHeader(NamedTuple):
+    shape: Tuple[int, ...]
+    fortran_order: bool
+    dtype: np.dtype
+    data_offset: int  # relative to the start of the .npy stream
+
+
+def _read_npy_header(source: BinaryIO) -> _NpyHeader:
+    """Parse an ``.npy`` header, leaving ``source`` at the start of the data."""
+    start = source.tell()
+    try:
+        version = np.lib.format.read_magic(source)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(source)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(source)
+        else:
+            raise PointCloudFormatError(f"Unsupported .npy format version {version}")
+    except PointCloudFormatError:
+        raise
+    except ValueError as e:
+        raise PointCloudFormatError(f"Invalid .npy header: {e}")
+    return _NpyHeader(shape, fortran_order, dtype, source.tell() - start)
+
+
+def _check_points_header(header: _NpyHeader) -> None:
+    """Reject arrays that cannot hold points before any data is read."""
+    if header.dtype.names or header.dtype.kind not in "biuf":
+        raise PointCloudFormatError(f"Unsupported point data type: {header.dtype}")
+    if len(header.shape) != 2:
+        raise PointCloudFormatError("Point cloud data must be 2D array")
+
+
+def _open_npz(source: BinaryIO) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise PointCloudFormatError(f"Invalid NPZ file: {e}")
+
+
+def _npz_headers(archive: zipfile.ZipFile) -> Dict[str, Tuple[zipfile.ZipInfo, _NpyHeader]]:
+    """Headers of every ``.npy`` member, read without touching the array data."""
+    headers = {}
+    for info in archive.infolist():
+        if not info.filename.endswith(".npy"):
+            continue
+        with archive.open(info) as member:
+            headers[info.filename[:-4]] = (info, _read_npy_header(member))
+    return headers
+
+
+def _choose_npz_member(archive: zipfile.ZipFile) -> Tuple[zipfile.ZipInfo, _NpyHeader]:
+    """Pick the point array of an ``.npz`` archive from member headers alone."""
+    headers = _npz_headers(archive)
+    # 1. Look for common names
+    for key in _NPZ_POINT_KEYS:
+        if key in headers:
+            return headers[key]
+
+    # 2. If not found, look for first 2D array with 3+ columns
+    for info, header in headers.values():
+        if len(header.shape) == 2 and header.shape[1] >= 3:
+            return info, header
+
+    # 3. Fallback to first key if nothing matches criteria
+    if headers:
+        return next(iter(headers.values()))
+
+    raise PointCloudFormatError("Empty or invalid NPZ file")
+
+
+def _member_data_offset(source: BinaryIO, info: zipfile.ZipInfo) -> int:
+    """Absolute offset of a stored zip member's bytes within ``source``."""
+    source.seek(info.header_offset)
+    local_header = source.read(30)
+    if len(local_header) < 30 or local_header[:4] != b"PK\x03\x04":
+        raise PointCloudFormatError(f"Corrupt NPZ member: {info.filename}")
+    name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+    return info.header_offset + 30 + name_length + extra_length
+
+
+def _npy_view(source: BinaryIO, header: _NpyHeader, offset: int) -> np.ndarray:
+    """Map an array whose data starts at byte ``offset`` of ``source``."""
+    flat = _map_block(source, header.dtype, int(np.prod(header.shape)), offset)
+    if header.fortran_order:
+        return flat.reshape(header.shape[::-1]).T
+    return flat.reshape(header.shape)
+
+
+def _is_mappable(info: zipfile.ZipInfo) -> bool:
+    return info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+
+
+def _read_exact(stream: BinaryIO, dtype: np.dtype, count: int) -> np.ndarray:
+    nbytes = dtype.itemsize * count
+    data = stream.read(nbytes)
+    if len(data) < nbytes:
+        raise PointCloudFormatError("File is shorter than its header declares")
+    return np.frombuffer(data, dtype=dtype, count=count)
+
+
+def _iter_npy_columns(
+    stream: BinaryIO, header: _NpyHeader
+) -> Iterator[List[Optional[np.ndarray]]]:
+    """
+    Stream the x, y, z columns of a compressed member in row blocks.
+
+    Only the first three columns are decoded; for Fortran-ordered arrays the
+    rest of the member is never decompressed.
+    """
+    rows, dimensions = header.shape
+    if header.fortran_order:
+        # Column-major: x, y and z are the first three runs of ``rows`` values
+        for axis in range(min(dimensions, 3)):
+            for start in range(0, rows, _REDUCE_ROWS):
+                block = _read_exact(stream, header.dtype, min(_REDUCE_ROWS, rows - start))
+                yield [block if i == axis else None for i in range(3)]
+        return
+
+    for start in range(0, rows, _REDUCE_ROWS):
+        count = min(_REDUCE_ROWS, rows - start)
+        block = _read_exact(stream, header.dtype, count * dimensions).reshape(count, dimensions)
+        yield [block[:, i] if dimensions > i else None for i in range(3)]
+
+
+def load_numpy_points(source: BinaryIO, file_extension: str) -> np.ndarray:
+    """
+    Return the point array of an ``.npy`` file or the best ``.npz`` member.
+
+    Uncompressed data is viewed in place or memory-mapped (see ``_map_block``);
+    only a compressed ``.npz`` member is decompressed into memory, and other
+    members are never read.
+    """
+    source.seek(0)
+    if file_extension == ".npy":
+        header = _read_npy_header(source)
+        _check_points_header(header)
+        return _npy_view(source, header, header.data_offset)
+
+    with _open_npz(source) as archive:
+        info, header = _choose_npz_member(archive)
+        _check_points_header(header)
+        if _is_mappable(info):
+            return _npy_view(source, header, _member_data_offset(source, info) + header.data_offset)
+        with archive.open(info) as member:
+            member.seek(header.data_offset)
+            count = int(np.prod(header.shape))
+            flat = _read_exact(member, header.dtype, count)
+            if header.fortran_order:
+                return flat.reshape(header.shape[::-1]).T
+            return flat.reshape(header.shape)
+
+
+def _analyze_numpy(source: BinaryIO, file_extension: str) -> Dict:
+    """Summarize ``.npy``/``.npz`` data, validating headers before reading points."""
+    if file_extension == ".npy":
+        return _summarize_array(load_numpy_points(source, file_extension))
+
+    source.seek(0)
+    with _open_npz(source) as archive:
+        info, header = _choose_npz_member(archive)
+        _check_points_header(header)
+        if _is_mappable(info):
+            offset = _member_data_offset(source, info) + header.data_offset
+            return _summarize_array(_npy_view(source, header, offset))
+        # Compressed member: reduce it while streaming instead of inflating it whole
+        with archive.open(info) as member:
+            member.seek(header.data_offset)
+            box = _bounding_box_blocks(_iter_npy_columns(member, header))
+        return _summarize_shape(header.shape, box)
+
+
+def validate_point_cloud_header(source: BinaryIO, file_extension: str) -> None:
+    """
+    Check that a file looks like a readable point cloud from its header alone.
+
+    Raises:
+        PointCloudFormatError: If the header is invalid or unsupported
+    """
+    file_extension = file_extension.lower()
+    source.seek(0)
+    try:
+        if file_extension == ".npy":
+            _check_points_header(_read_npy_header(source))
+        elif file_extension == ".npz":
+            with _open_npz(source) as archive:
+                _check_points_header(_choose_npz_member(archive)[1])
+        elif file_extension == ".ply":
+            _parse_ply_header(source)
+        elif file_extension == ".pcd":
+            _parse_pcd_header(source)
+        else:
+            raise PointCloudFormatError(f"Unsupported point cloud format: {file_extension}")
+    finally:
+        source.seek(0)
+
+
+# --------------------------------------------------------------------------- #
+# Analysis
+# --------------------------------------------------------------------------- #
+
+def _bounding_box_blocks(blocks: Iterable[Sequence[Optional[np.ndarray]]]) -> Dict[str, float]:
+    """
+    Bounding box over blocks of x, y, z columns.
+
+    Columns are reduced ``_REDUCE_ROWS`` rows at a time, which keeps the
+    working set in cache even for strided views into memory-mapped files.
+    """
+    lows = [np.inf] * 3
+    highs = [-np.inf] * 3
+    seen = [False] * 3
+    for columns in blocks:
+        for axis, column in enumerate(columns[:3]):
+            if column is None:
+                continue
+            for start in range(0, len(column), _REDUCE_ROWS):
+                part = column[start:start + _REDUCE_ROWS]
+                lows[axis] = np.minimum(lows[axis], part.min())
+                highs[axis] = np.maximum(highs[axis], part.max())
+                seen[axis] = True
+
+    box = {}
+    for axis, low, high, found in zip("xyz", lows, highs, seen):
+        box[f"min_{axis}"] = float(low) if found else 0.0
+        box[f"max_{axis}"] = float(high) if found else 0.0
+    return box
+
+
+def _bounding_box(columns: List[Optional[np.ndarray]]) -> Dict[str, float]:
+    return _bounding_box_blocks([columns])
+
+
+def _summarize_shape(shape: Tuple[int, ...], bounding_box: Dict[str, float]) -> Dict:
+    point_count, dimensions = shape
+    return {
+        "point_count": int(point_count),
+        "dimensions": int(dimensions),
+        "bounding_box": bounding_box,
+        "has_colors": dimensions > 3,
+        "has_normals": dimensions > 6,
+    }
+
+
+def _summarize_array(data: np.ndarray) -> Dict:
+    if data.ndim != 2:
+        raise PointCloudFormatError("Point cloud data must be 2D array")
+
+    # Assuming first 3 columns are x, y, z
+    columns = [data[:, i] if data.shape[1] > i else None for i in range(3)]
+    return _summarize_shape(data.shape, _bounding_box(columns))
+
+
+def _summarize_structured(data: np.ndarray) -> Dict:
+    names = set(data.dtype.names or ())
+    if not {"x", "y", "z"} <= names:
+        raise PointCloudFormatError("Point cloud has no x, y, z fields")
+
+    dimensions = sum(
+        max(1, int(np.prod(data.dtype.fields[name][0].shape)))
+        for name in data.dtype.names
+        if not name.startswith("_pad")
+    )
+    return {
+        "point_count": int(len(data)),
+        "dimensions": int(dimensions),
+        "bounding_box": _bounding_box([data["x"], data["y"], data["z"]]),
+        "has_colors": any(f <= names for f in _COLOR_FIELDS) or bool(_PACKED_COLOR_FIELDS & names),
+        "has_normals": any(f <= names for f in _NORMAL_FIELDS),
+    }
+
+
+def analyze_point_cloud(source: BinaryIO, file_extension: str) -> Dict:
+    """
+    Extract point count, dimensions, bounding box and attribute flags.
+
+    Raises:
+        PointCloudFormatError: If the file cannot be parsed
+    """
+    file_extension = file_extension.lower()
+    if file_extension in (".npy", ".npz"):
+        return _analyze_numpy(source, file_extension)
+    if file_extension == ".ply":
+        return _summarize_structured(read_ply(source))
+    if file_extension == ".pcd":
+        return _summarize_structured(read_pcd(source))
+    raise PointCloudFormatError(f"Unsupported point cloud format: {file_extension}")
+
+
+# --------------------------------------------------------------------------- #
+# Canonical format
+# --------------------------------------------------------------------------- #
+
+# Internal point format written at ingest: a C-ordered, uncompressed ``.npy``
+# of little-endian float32 with columns x, y, z and, when present, intensity
+CANONICAL_DTYPE = np.dtype("<f4")
+
+_INTENSITY_FIELDS = ("intensity", "scalar_intensity", "reflectance")
+
+
+def point_columns(source: BinaryIO, file_extension: str) -> List[np.ndarray]:
+    """
+    Return the x, y, z (and intensity, if any) columns of a point cloud.
+
+    Columns are views into the mapped file where the format allows. For
+    plain arrays the fourth column is taken as intensity.
+    """
+    file_extension = file_extension.lower()
+    if file_extension in (".npy", ".npz"):
+        data = load_numpy_points(source, file_extension)
+        if data.shape[1] < 3:
+            raise PointCloudFormatError("Point cloud data needs at least 3 columns")
+        return [data[:, i] for i in range(min(data.shape[1], 4))]
+
+    if file_extension == ".ply":
+        data = read_ply(source)
+    elif file_extension == ".pcd":
+        data = read_pcd(source)
+    else:
+        raise PointCloudFormatError(f"Unsupported point cloud format: {file_extension}")
+
+    names = data.dtype.names or ()
+    if not {"x", "y", "z"} <= set(names):
+        raise PointCloudFormatError("Point cloud has no x, y, z fields")
+    columns = [data["x"], data["y"], data["z"]]
+    for name in _INTENSITY_FIELDS:
+        if name in names and data.dtype.fields[name][0].shape == ():
+            columns.append(data[name])
+            break
+    return columns
+
+
+def write_point_columns(
+    columns: List[np.ndarray], target: BinaryIO, rows: Optional[np.ndarray] = None
+) -> int:
+    """
+    Write columns (optionally only ``rows``) to ``target`` in the canonical format.
+
+    Points are converted ``_REDUCE_ROWS`` rows at a time, so memory use does
+    not grow with the file.
+
+    Returns:
+        int: Number of points written
+    """
+    count = len(columns[0]) if rows is None else len(rows)
+    np.lib.format.write_array_header_1_0(
+        target,
+        {"descr": CANONICAL_DTYPE.str, "fortran_order": False, "shape": (count, len(columns))},
+    )
+    for start in range(0, count, _REDUCE_ROWS):
+        stop = min(start + _REDUCE_ROWS, count)
+        selection = slice(start, stop) if rows is None else rows[start:stop]
+        block = np.empty((stop - start, len(columns)), dtype=CANONICAL_DTYPE)
+        for i, column in enumerate(columns):
+            block[:, i] = column[selection]
+        target.write(block.data)
+    return count
+
+
+def write_canonical_points(source: BinaryIO, file_extension: str, target: BinaryIO) -> Tuple[int, int]:
+    """
+    Write the canonical ``.npy`` form of a point cloud to ``target``.
+
+    Returns:
+        Tuple: Point count and number of columns written
+    """
+    columns = point_columns(source, file_extension)
+    return write_point_columns(columns, target), len(columns)
+
+
+def lod_rows(point_count: int, budgets: Sequence[int], seed: int = 0) -> List[np.ndarray]:
+    """
+    Row indices of the preview levels of a cloud, coarsest first.
+
+    Each level is a uniform random subsample of ``budget`` points, and every
+    level contains all points of the coarser ones, so a client refining from
+    one level to the next never loses points it already drew. Indices are
+    sorted to keep reads from the mapped source sequential. Budgets that are
+    not smaller than ``point_count`` get no level (the full cloud is used).
+    """
+    budgets = sorted(b for b in set(budgets) if 0 < b < point_count)
+    if not budgets:
+        return []
+    rng = np.random.default_rng(seed)
+    order = rng.choice(point_count, size=budgets[-1], replace=False)
+    return [np.sort(order[:budget]) for budget in budgets]
+
+
+# --------------------------------------------------------------------------- #
+# Octree tiling
+# --------------------------------------------------------------------------- #
+
+class OctreeNode(NamedTuple):
+    name: str  # "r" followed by one child digit (0-7) per level
+    bounds: Tuple[float, ...]  # cube: min_x, min_y, min_z, max_x, max_y, max_z
+    rows: np.ndarray  # sorted row indices of the points stored in this node
+    children: int  # bit mask of the child digits that exist
+
+
+def _morton_codes(columns: Sequence[np.ndarray], origin: np.ndarray, size: float, depth: int) -> np.ndarray:
+    """Interleaved x/y/z cell codes of every point at ``depth`` (x is the high bit of each triple)."""
+    count = len(columns[0])
+    cells = 1 << depth
+    codes = np.zeros(count, dtype=np.uint32)
+    for start in range(0, count, _REDUCE_ROWS):
+        stop = min(start + _REDUCE_ROWS, count)
+        block = np.zeros(stop - start, dtype=np.uint32)
+        for axis, column in enumerate(columns[:3]):
+            scaled = (np.nan_to_num(column[start:stop].astype(np.float64)) - origin[axis]) / size * cells
+            cell = np.clip(scaled, 0, cells - 1).astype(np.uint32)
+            for bit in range(depth):
+                block |= ((cell >> bit) & 1) << (3 * bit + 2 - axis)
+        codes[start:stop] = block
+    return codes
+
+
+def build_octree(
+    columns: Sequence[np.ndarray], node_points: int, max_depth: int, seed: int = 0
+) -> List[OctreeNode]:
+    """
+    Partition a cloud into an octree of nodes holding at most ``node_points`` points.
+
+    Like Potree, inner nodes keep a uniform random subsample of their cube and
+    pass the remaining points down, so drawing every node down to some depth
+    gives an evenly thinned cloud, and each deeper level adds detail. Nodes at
+    ``max_depth`` keep whatever reaches them.
+
+    Cells are assigned once from per-point Morton codes, so the source columns
+    (which may be memory-mapped) are only read sequentially, plus one gather
+    per node when it is written.
+    """
+    max_depth = min(max_depth, 10)  # 3 bits per level in a uint32 code
+    count = len(columns[0])
+    if count == 0:
+        return [OctreeNode("r", (0.0,) * 6, np.empty(0, dtype=np.int64), 0)]
+
+    box = _bounding_box(list(columns[:3]))
+    low = np.array([box["min_x"], box["min_y"], box["min_z"]])
+    high = np.array([box["max_x"], box["max_y"], box["max_z"]])
+    size = float(max(high - low)) or 1.0
+    codes = _morton_codes(columns, low, size, max_depth)
+
+    # Random priority: a node's sample is the first points of its list
+    order = np.arange(count, dtype=np.int32 if count < 2**31 else np.int64)
+    np.random.default_rng(seed).shuffle(order)
+
+    nodes: List[OctreeNode] = []
+    pending = [("r", low, order)]
+    while pending:
+        name, origin, rows = pending.pop()
+        depth = len(name) - 1
+        extent = size / (1 << depth)
+        bounds = tuple(float(v) for v in (*origin, *(origin + extent)))
+        if len(rows) <= node_points or depth == max_depth:
+            nodes.append(OctreeNode(name, bounds, np.sort(rows), 0))
+            continue
+
+        rest = rows[node_points:]
+        digits = ((codes[rest] >> (3 * (max_depth - depth - 1))) & 7).astype(np.uint8)
+        mask = 0
+        for digit in range(8):
+            child_rows = rest[digits == digit]
+            if len(child_rows):
+                mask |= 1 << digit
+                offset = np.array([(digit >> 2) & 1, (digit >> 1) & 1, digit & 1]) * (extent / 2)
+                pending.append((f"{name}{digit}", origin + offset, child_rows))
+        nodes.append(OctreeNode(name, bounds, np.sort(rows[:node_points]), mask))
+
+    nodes.sort(key=lambda node: (len(node.name), node.name))
+    return nodes
+
+
+def octree_hierarchy(nodes: List[OctreeNode], point_count: int, columns: int) -> Dict:
+    """JSON-serializable index of an octree, breadth first."""
+    return {
+        "version": 1,
+        "point_count": int(point_count),
+        "columns": int(columns),
+        "bounds": list(nodes[0].bounds),
+        "nodes": [
+            {
+                "name": node.name,
+                "points": int(len(node.rows)),
+                "bounds": list(node.bounds),
+                "children": node.children,
+            }
+            for node in nodes
+        ],
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Quantized transport format
+# --------------------------------------------------------------------------- #
+
+# Layout (little-endian):
+#
+#   0   4s   magic b"QPC1"
+#   4   u8   bits per coordinate (16 or 32)
+#   5   u8   flags: QUANTIZED_MORTON | QUANTIZED_DELTA
+#   6   u8   compression of the body: 0 none, 1 deflate (zlib), 2 zstd
+#   7   u8   attribute count (0 or 1; intensity)
+#   8   u32  point count
+#   12  4x   reserved
+#   16  6d   scale x, y, z, offset x, y, z
+#   64  2f   scale, offset of each attribute
+#
+# The body holds planar unsigned channels: x[n], y[n], z[n] with ``bits``
+# bits each, then one uint16[n] per attribute. A value is
+# ``q * scale + offset``. With QUANTIZED_DELTA each channel stores the
+# difference to the previous value modulo 2**bits, so a running sum in an
+# unsigned typed array of the same width restores it. A client decodes it as:
+#
+#   const v = new DataView(buf), n = v.getUint32(8, true);
+#   const body = decompress(buf.slice(64 + 8 * v.getUint8(7)));
+#   const x = new Uint16Array(body, 0, n);  // Uint32Array when bits == 32
+#   for (let i = 1; i < n; i++) x[i] += x[i - 1];  // if delta coded
+#   position = x[i] * v.getFloat64(16, true) + v.getFloat64(40, true);
+QUANTIZED_MEDIA_TYPE = "application/x-quantized-points"
+QUANTIZED_MAGIC = b"QPC1"
+QUANTIZED_MORTON = 1  # points reordered along a Morton curve (source order is lost)
+QUANTIZED_DELTA = 2
+QUANTIZED_COMPRESSIONS = {"none": 0, "deflate": 1, "zstd": 2}
+_QUANTIZED_HEADER = struct.Struct("<4sBBBBI4x6d")
+_QUANTIZED_ATTRIBUTE = struct.Struct("<ff")
+
+
+def available_compressions() -> List[str]:
+    """Compression names of the quantized format usable in this environment."""
+    return [name for name in QUANTIZED_COMPRESSIONS if name != "zstd" or _zstd is not None]
+
+
+def _compressor(compression: str):
+    if compression == "none":
+        return None
+    if compression == "deflate":
+        return zlib.compressobj(6)
+    if compression == "zstd" and _zstd is not None:
+        return _zstd.ZstdCompressor(level=3).compressobj()
+    raise PointCloudFormatError(f"Unsupported compression: {compression}")
+
+
+def _column_range(column: np.ndarray) -> Tuple[float, float]:
+    low, high = np.inf, -np.inf
+    for start in range(0, len(column), _REDUCE_ROWS):
+        part = column[start:start + _REDUCE_ROWS]
+        low = min(low, float(np.nanmin(part, initial=np.inf)))
+        high = max(high, float(np.nanmax(part, initial=-np.inf)))
+    return (low, high) if low <= high else (0.0, 0.0)
+
+
+def write_quantized_points(
+    columns: List[np.ndarray],
+    target: BinaryIO,
+    bits: int = 16,
+    bounds: Optional[Sequence[float]] = None,
+    attributes: bool = True,
+    morton: bool = False,
+    delta: bool = True,
+    compression: str = "deflate",
+) -> int:
+    """
+    Write x, y, z (and intensity) in the quantized transport format.
+
+    Positions are quantized to ``bits`` over ``bounds`` (min x, y, z, max
+    x, y, z; computed from the columns if not given or not finite), and intensity, the
+    fourth column, to 16 bits over its own range. Values outside the bounds
+    are clamped and NaN is written as the minimum. Channels are encoded
+    ``_REDUCE_ROWS`` rows at a time and streamed through the compressor.
+
+    Returns:
+        int: Number of bytes written
+    """
+    if bits not in (16, 32):
+        raise PointCloudFormatError("Quantization supports 16 or 32 bits")
+    compressor = _compressor(compression)
+    count = len(columns[0])
+    if bounds is None or not np.all(np.isfinite(bounds)):
+        ranges = [_column_range(column) for column in columns[:3]]
+        bounds = [low for low, _ in ranges] + [high for _, high in ranges]
+    low = np.array(bounds[:3], dtype=np.float64)
+    extent = np.array(bounds[3:], dtype=np.float64) - low
+
+    channels: List[Tuple[np.ndarray, float, float, np.dtype]] = []
+    levels = (1 << bits) - 1
+    for axis in range(3):
+        scale = float(extent[axis]) / levels or 1.0
+        channels.append((columns[axis], scale, float(low[axis]), np.dtype(f"<u{bits // 8}")))
+    attribute_header = b""
+    if attributes and len(columns) > 3:
+        attr_low, attr_high = _column_range(columns[3])
+        scale = (attr_high - attr_low) / 0xFFFF or 1.0
+        channels.append((columns[3], scale, attr_low, np.dtype("<u2")))
+        attribute_header = _QUANTIZED_ATTRIBUTE.pack(scale, attr_low)
+
+    order = None
+    if morton and count:
+        size = float(extent.max()) or 1.0
+        order = np.argsort(_morton_codes(columns, low, size, 10), kind="stable")
+
+    flags = (QUANTIZED_MORTON if order is not None else 0) | (QUANTIZED_DELTA if delta else 0)
+    header = _QUANTIZED_HEADER.pack(
+        QUANTIZED_MAGIC,
+        bits,
+        flags,
+        QUANTIZED_COMPRESSIONS[compression],
+        len(channels) - 3,
+        count,
+        *(channel[1] for channel in channels[:3]),
+        *(channel[2] for channel in channels[:3]),
+    )
+    target.write(header + attribute_header)
+    written = len(header) + len(attribute_header)
+
+    def _emit(data: bytes) -> None:
+        nonlocal written
+        if compressor is not None:
+            data = compressor.compress(data)
+        target.write(data)
+        written += len(data)
+
+    for column, scale, offset, dtype in channels:
+        top = float(np.iinfo(dtype).max)
+        previous = np.zeros(1, dtype=dtype)
+        for start in range(0, count, _REDUCE_ROWS):
+            stop = min(start + _REDUCE_ROWS, count)
+            selection = slice(start, stop) if order is None else order[start:stop]
+            values = (np.asarray(column[selection], dtype=np.float64) - offset) / scale
+            quantized = np.clip(np.nan_to_num(np.rint(values)), 0, top).astype(dtype)
+            if delta:
+                coded = np.empty_like(quantized)
+                coded[:1] = quantized[:1] - previous
+                coded[1:] = quantized[1:] - quantized[:-1]
+                previous = quantized[-1:]
+                quantized = coded
+            _emit(quantized.tobytes())
+
+    if compressor is not None:
+        tail = compressor.flush()
+        target.write(tail)
+        written += len(tail)
+    return written
+
+
+def read_quantized_points(source: BinaryIO) -> np.ndarray:
+    """Decode the quantized transport format into an (n, channels) float64 array."""
+    head = source.read(_QUANTIZED_HEADER.size)
+    if len(head) < _QUANTIZED_HEADER.size:
+        raise PointCloudFormatError("Truncated quantized point header")
+    magic, bits, flags, compression, attribute_count, count, *transform = _QUANTIZED_HEADER.unpack(head)
+    if magic != QUANTIZED_MAGIC or bits not in (16, 32):
+        raise PointCloudFormatError("Not a quantized point file")
+    scales, offsets = list(transform[:3]), list(transform[3:])
+    for _ in range(attribute_count):
+        scale, offset = _QUANTIZED_ATTRIBUTE.unpack(source.read(_QUANTIZED_ATTRIBUTE.size))
+        scales.append(scale)
+        offsets.append(offset)
+
+    body = source.read()
+    if compression == QUANTIZED_COMPRESSIONS["deflate"]:
+        body = zlib.decompress(body)
+    elif compression == QUANTIZED_COMPRESSIONS["zstd"]:
+        if _zstd is None:
+            raise PointCloudFormatError("zstd support is not installed")
+        body = _zstd.ZstdDecompressor().decompressobj().decompress(body)
+
+    points = np.empty((count, len(scales)), dtype=np.float64)
+    position = 0
+    for i, (scale, offset) in enumerate(zip(scales, offsets)):
+        dtype = np.dtype(f"<u{bits // 8}" if i < 3 else "<u2")
+        values = np.frombuffer(body, dtype=dtype, count=count, offset=position)
+        position += values.nbytes
+        if flags & QUANTIZED_DELTA:
+            values = np.cumsum(values, dtype=dtype)
+        points[:, i] = values * scale + offset
+    return points
+
+
+# --------------------------------------------------------------------------- #
+# Geometric descriptors
+# --------------------------------------------------------------------------- #
+
+DESCRIPTORS_VERSION = 1
+_Z_BINS = 64
+_INTENSITY_BINS = 256
+_OCCUPANCY_CELLS = 32  # cells along the longest bounding box side
+
+
+def _finite_blocks(columns: Sequence[np.ndarray]) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """(n, 3) float64 positions and the matching intensity of finite points, in blocks."""
+    intensity = columns[3] if len(columns) > 3 else None
+    for start in range(0, len(columns[0]), _REDUCE_ROWS):
+        stop = start + _REDUCE_ROWS
+        xyz = np.column_stack([column[start:stop] for column in columns[:3]]).astype(np.float64)
+        finite = np.isfinite(xyz).all(axis=1)
+        values = None
+        if intensity is not None:
+            values = np.asarray(intensity[start:stop], dtype=np.float64)[finite]
+            values = values[np.isfinite(values)]
+        yield xyz[finite], values
+
+
+def _histogram_quantiles(counts: np.ndarray, low: float, high: float, quantiles: Sequence[float]) -> List[float]:
+    edges = np.linspace(low, high, len(counts) + 1)
+    cumulative = np.cumsum(counts) / max(counts.sum(), 1)
+    return [float(edges[min(np.searchsorted(cumulative, q) + 1, len(counts))]) for q in quantiles]
+
+
+def compute_descriptors(columns: Sequence[np.ndarray]) -> Dict:
+    """
+    Summarize the geometry of a cloud for viewers and dataset analytics.
+
+    Two streaming passes over the x, y, z (and intensity) columns, in blocks
+    of ``_REDUCE_ROWS`` rows, ignoring non-finite points. The first gathers
+    the axis-aligned box, moments and intensity range. The second projects
+    onto the principal axes and fills the histograms and occupancy grid.
+
+    The result is JSON-serializable:
+
+    - ``centroid`` and ``covariance`` (3x3) of the positions
+    - ``oriented_box``: ``center``, ``axes`` (unit rows, largest variance
+      first) and ``extents`` (full side lengths along each axis)
+    - ``density``: points per unit of occupied XY area and occupied volume,
+      measured on the occupancy grid
+    - ``z_histogram``: ``_Z_BINS`` counts between min and max z
+    - ``intensity``: min, max, mean, std and p5/p50/p95 (None without one)
+    - ``occupancy``: grid ``shape``, ``origin`` and ``cell`` size, and
+      ``bits``, the base64 of ``np.packbits`` over the C-ordered grid
+    """
+    count = 0
+    shift = None
+    low = np.full(3, np.inf)
+    high = np.full(3, -np.inf)
+    sums = np.zeros(3)
+    products = np.zeros((3, 3))
+    intensity_count = 0
+    intensity_sum = intensity_squares = 0.0
+    intensity_low, intensity_high = np.inf, -np.inf
+
+    for xyz, values in _finite_blocks(columns):
+        if len(xyz):
+            if shift is None:
+                shift = xyz[0].copy()
+            centered = xyz - shift
+            count += len(xyz)
+            low = np.minimum(low, xyz.min(axis=0))
+            high = np.maximum(high, xyz.max(axis=0))
+            sums += centered.sum(axis=0)
+            products += centered.T @ centered
+        if values is not None and len(values):
+            intensity_count += len(values)
+            intensity_sum += float(values.sum())
+            intensity_squares += float(np.square(values).sum())
+            intensity_low = min(intensity_low, float(values.min()))
+            intensity_high = max(intensity_high, float(values.max()))
+
+    if count == 0:
+        return {"version": DESCRIPTORS_VERSION, "point_count": 0}
+
+    mean = sums / count
+    centroid = shift + mean
+    covariance = products / count - np.outer(mean, mean)
+    variances, vectors = np.linalg.eigh(covariance)
+    axes = vectors[:, ::-1].T  # rows, largest variance first
+
+    extent = high - low
+    cell = float(extent.max()) / _OCCUPANCY_CELLS or 1.0
+    shape = tuple(int(n) for n in np.clip(np.ceil(extent / cell), 1, _OCCUPANCY_CELLS))
+    occupancy = np.zeros(shape, dtype=bool)
+    z_counts = np.zeros(_Z_BINS, dtype=np.int64)
+    intensity_counts = np.zeros(_INTENSITY_BINS, dtype=np.int64)
+    projected_low = np.full(3, np.inf)
+    projected_high = np.full(3, -np.inf)
+
+    for xyz, values in _finite_blocks(columns):
+        if len(xyz):
+            projected = (xyz - centroid) @ axes.T
+            projected_low = np.minimum(projected_low, projected.min(axis=0))
+            projected_high = np.maximum(projected_high, projected.max(axis=0))
+            z_counts += np.histogram(xyz[:, 2], bins=_Z_BINS, range=(low[2], high[2] or low[2] + 1))[0]
+            cells = np.minimum(((xyz - low) / cell).astype(np.int64), np.array(shape) - 1)
+            occupancy[cells[:, 0], cells[:, 1], cells[:, 2]] = True
+        if values is not None and len(values) and intensity_high > intensity_low:
+            intensity_counts += np.histogram(
+                values, bins=_INTENSITY_BINS, range=(intensity_low, intensity_high)
+            )[0]
+
+    occupied_columns = int(occupancy.any(axis=2).sum())
+    occupied_cells = int(occupancy.sum())
+
+    intensity = None
+    if intensity_count:
+        intensity_mean = intensity_sum / intensity_count
+        if intensity_high > intensity_low:
+            p5, p50, p95 = _histogram_quantiles(
+                intensity_counts, intensity_low, intensity_high, (0.05, 0.5, 0.95)
+            )
+        else:
+            p5 = p50 = p95 = intensity_low
+        intensity = {
+            "min": intensity_low,
+            "max": intensity_high,
+            "mean": intensity_mean,
+            "std": float(np.sqrt(max(intensity_squares / intensity_count - intensity_mean**2, 0.0))),
+            "p5": p5,
+            "p50": p50,
+            "p95": p95,
+        }
+
+    return {
+        "version": DESCRIPTORS_VERSION,
+        "point_count": count,
+        "centroid": centroid.tolist(),
+        "covariance": covariance.tolist(),
+        "oriented_box": {
+            "center": (centroid + ((projected_low + projected_high) / 2) @ axes).tolist(),
+            "axes": axes.tolist(),
+            "extents": (projected_high - projected_low).tolist(),
+        },
+        "density": {
+            "points_per_area": count / (occupied_columns * cell**2),
+            "points_per_volume": count / (occupied_cells * cell**3),
+        },
+        "z_histogram": {
+            "min": float(low[2]),
+            "max": float(high[2]),
+            "counts": z_counts.tolist(),
+        },
+        "intensity": intensity,
+        "occupancy": {
+            "shape": list(shape),
+            "origin": low.tolist(),
+            "cell": cell,
+            "occupied": occupied_cells,
+            "bits": base64.b64encode(np.packbits(occupancy).tobytes()).decode("ascii"),
+        },
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Quality scoring
+# --------------------------------------------------------------------------- #
+
+_SPACING_CELLS = 64  # cells along the longest side when estimating point spacing
+_NEIGHBOR_OFFSETS = np.array(
+    [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)], dtype=np.int64
+)
+
+
+def _finite_positions(columns: Sequence[np.ndarray], dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, 3) positions of the finite points and the mask selecting them."""
+    xyz = np.empty((len(columns[0]), 3), dtype=dtype)
+    for axis, column in enumerate(columns[:3]):
+        for start in range(0, len(column), _REDUCE_ROWS):
+            xyz[start:start + _REDUCE_ROWS, axis] = column[start:start + _REDUCE_ROWS]
+    finite = np.isfinite(xyz).all(axis=1)
+    return (xyz if finite.all() else xyz[finite]), finite
+
+
+def _cell_keys(xyz: np.ndarray, low: np.ndarray, cell: float, dims: np.ndarray) -> np.ndarray:
+    """Linear voxel index of every point (cells padded by one on each side)."""
+    keys = np.empty(len(xyz), dtype=np.int64)
+    for start in range(0, len(xyz), _REDUCE_ROWS):
+        cells = ((xyz[start:start + _REDUCE_ROWS] - low) / cell).astype(np.int64) + 1
+        keys[start:start + _REDUCE_ROWS] = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    return keys
+
+
+def _voxel_grid(xyz: np.ndarray, cell: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Occupied voxel keys, their point counts, each point's voxel and the grid dims."""
+    low = xyz.min(axis=0)
+    dims = np.floor((xyz.max(axis=0) - low) / cell).astype(np.int64) + 3
+    keys, inverse, counts = np.unique(
+        _cell_keys(xyz, low, cell, dims), return_inverse=True, return_counts=True
+    )
+    return keys, counts, inverse, dims
+
+
+def _estimate_spacing(xyz: np.ndarray) -> float:
+    """
+    Typical distance between neighboring points.
+
+    Assumes points sample surfaces, as scans do: the points per occupied
+    cell of a coarse grid then grow with the square of cell size / spacing.
+    """
+    extent = float((xyz.max(axis=0) - xyz.min(axis=0)).max())
+    if extent == 0:
+        return 1.0
+    cell = extent / _SPACING_CELLS
+    keys, _, _, _ = _voxel_grid(xyz, cell)
+    per_cell = len(xyz) / len(keys)
+    return cell / np.sqrt(per_cell) if per_cell > 1 else cell
+
+
+def _voxel_neighbor_counts(xyz: np.ndarray, radius: float) -> np.ndarray:
+    """Points in the 3x3x3 voxels of side ``radius`` around each point (itself included)."""
+    keys, counts, inverse, dims = _voxel_grid(xyz, radius)
+    offsets = (_NEIGHBOR_OFFSETS[:, 0] * dims[1] + _NEIGHBOR_OFFSETS[:, 1]) * dims[2] + _NEIGHBOR_OFFSETS[:, 2]
+    totals = np.zeros(len(keys), dtype=np.int64)
+    for offset in offsets:
+        neighbors = keys + offset
+        found = np.minimum(np.searchsorted(keys, neighbors), len(keys) - 1)
+        totals += np.where(keys[found] == neighbors, counts[found], 0)
+    return totals[inverse]
+
+
+def score_point_quality(
+    columns: Sequence[np.ndarray],
+    neighbors: int = 8,
+    std_ratio: float = 3.0,
+    radius_factor: float = 3.0,
+    min_neighbors: int = 3,
+    kdtree_max_points: int = 5_000_000,
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Flag statistical outliers and low-density noise points.
+
+    Two tests over a neighbor index:
+
+    - statistical outlier removal: a point is an outlier if its mean distance
+      to its ``neighbors`` nearest points exceeds the cloud mean by more than
+      ``std_ratio`` standard deviations
+    - radius density: a point is noise if fewer than ``min_neighbors`` other
+      points lie within ``radius_factor`` times the estimated point spacing
+
+    The index is a SciPy KD-tree when SciPy is installed and the cloud has
+    at most ``kdtree_max_points`` points. Otherwise points are hashed into
+    voxels of the density radius: neighbors are counted over the 3x3x3
+    surrounding voxels, and the outlier test uses the spacing implied by that
+    count. The approximation is looser but linear in the point count.
+    Non-finite points are flagged as outliers.
+
+    Returns:
+        Tuple: Per-point uint8 mask (1 outlier, 2 noise, 3 both) and statistics
+    """
+    xyz, finite = _finite_positions(columns)
+    count = len(finite)
+    mask = np.zeros(count, dtype=np.uint8)
+    mask[~finite] = 1
+    if len(xyz) <= neighbors:
+        flagged = int((~finite).sum())
+        stats = {"method": "none", "points": count, "outliers": flagged, "noise": 0, "flagged": flagged}
+        return mask, stats
+
+    spacing = _estimate_spacing(xyz)
+    radius = radius_factor * spacing
+    if _KDTree is not None and len(xyz) <= kdtree_max_points:
+        method = "kdtree"
+        tree = _KDTree(xyz)
+        distances, _ = tree.query(xyz, k=neighbors + 1, workers=-1)
+        mean_distance = distances[:, 1:].mean(axis=1)
+        nearby = tree.query_ball_point(xyz, radius, return_length=True, workers=-1) - 1
+    else:
+        method = "voxel"
+        # Largest cell that keeps linear keys well inside int64
+        extent = float((xyz.max(axis=0) - xyz.min(axis=0)).max())
+        radius = max(radius, extent / 2**20)
+        nearby = _voxel_neighbor_counts(xyz, radius) - 1
+        # Surface spacing implied by the neighbor count, scaled to k neighbors
+        mean_distance = radius * np.sqrt(neighbors / np.maximum(nearby, 1))
+
+    threshold = mean_distance.mean() + std_ratio * mean_distance.std()
+    outliers = mean_distance > threshold
+    noise = nearby < min_neighbors
+
+    flags = outliers.astype(np.uint8) | (noise.astype(np.uint8) << 1)
+    if finite.all():
+        mask = flags
+    else:
+        mask[finite] |= flags
+
+    stats = {
+        "method": method,
+        "points": count,
+        "spacing": float(spacing),
+        "radius": float(radius),
+        "neighbors": neighbors,
+        "std_ratio": std_ratio,
+        "min_neighbors": min_neighbors,
+        "distance_threshold": float(threshold),
+        "outliers": int((mask & 1).astype(bool).sum()),
+        "noise": int((mask & 2).astype(bool).sum()),
+        "flagged": int((mask > 0).sum()),
+    }
+    return mask, stats
+
+
+def quality_score(flagged_ratio: float) -> int:
+    """
+    Score from 1 (unusable) to 10 from the share of flagged points.
+
+    The first 1% is free, since the outlier test flags about that much on
+    clean scans (edges, sparse patches). Each further 1% costs one point.
+    """
+    return int(np.clip(10 - np.floor(max(flagged_ratio - 0.01, 0.0) * 100), 1, 10))
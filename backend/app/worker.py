@@ -1,12 +1,17 @@
 import asyncio
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 from uuid import UUID
 
-from minio import Minio
+from celery import group
+from celery.signals import worker_process_init
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import selectinload
+from sqlalchemy.pool import NullPool
 
 from app.celery_app import celery_app
 
@@ -15,15 +20,127 @@ celery = celery_app
 
 from app.core.config import settings
 from app.core.database import AsyncSessionLocal
+from app.core.storage import get_storage, init_storage
 from app.models.annotation import Annotation
-from app.models.enums import AnnotationStatus, TaskPriority
+from app.models.enums import AnnotationStatus, FileStatus, TaskPriority
 from app.models.pointcloud import PointCloudFile
 from app.models.task import Task
 from app.services.file_upload import FileUploadService
+from app.services.import_ledger import ImportLedgerService
+from app.services.quality import QualityService
 from app.services.task import TaskService
+from app.services.upload_session import UploadSessionService
 
 # ...
 
+
+@asynccontextmanager
+async def _task_session():
+    """
+    Yield a session on a throwaway engine.
+
+    Every task runs its coroutine with asyncio.run(), i.e. on a fresh event
+    loop, so pooled connections from the global engine cannot be reused.
+    """
+    local_engine = create_async_engine(
+        settings.DATABASE_URL, echo=False, poolclass=NullPool
+    )
+    LocalSession = async_sessionmaker(local_engine, expire_on_commit=False)
+    try:
+        async with LocalSession() as db:
+            yield db
+    finally:
+        await local_engine.dispose()
+
+
+@celery_app.task(name="app.worker.process_pointcloud_file", acks_late=True)
+def process_pointcloud_file(file_id: str):
+    """
+    Analysis stage: UPLOADED -> PROCESSING -> PROCESSED (or FAILED).
+    """
+    return asyncio.run(process_pointcloud_file_async(file_id))
+
+
+async def process_pointcloud_file_async(file_id: str):
+    async with _task_session() as db:
+        file_record = await FileUploadService(db).process_file(UUID(file_id))
+        if not file_record:
+            return {"status": "skipped", "file_id": file_id}
+        return {
+            "status": file_record.status.value,
+            "file_id": file_id,
+            "point_count": file_record.point_count,
+            "error": file_record.error_message,
+        }
+
+
+@celery_app.task(name="app.worker.score_pointcloud_quality", acks_late=True)
+def score_pointcloud_quality(file_id: str, force: bool = False):
+    """
+    Quality stage: fill data_quality, has_noise and has_outliers of a PROCESSED file.
+    """
+    return asyncio.run(score_pointcloud_quality_async(file_id, force))
+
+
+async def score_pointcloud_quality_async(file_id: str, force: bool = False):
+    async with _task_session() as db:
+        file_record = await QualityService(db).score_file(UUID(file_id), force=force)
+        if not file_record:
+            return {"status": "skipped", "file_id": file_id}
+        return {
+            "status": "scored" if file_record.data_quality is not None else "failed",
+            "file_id": file_id,
+            "data_quality": file_record.data_quality,
+            "has_noise": file_record.has_noise,
+            "has_outliers": file_record.has_outliers,
+        }
+
+
+@celery_app.task(name="app.worker.reprocess_project_files", acks_late=True)
+def reprocess_project_files(project_id: str, status_filter: Optional[str] = None):
+    """
+    Re-run the analysis stage for every file of a project across the worker pool.
+    """
+    file_ids = asyncio.run(_list_project_file_ids(project_id, status_filter))
+    if not file_ids:
+        return {"status": "completed", "files_queued": 0}
+
+    result = group(process_pointcloud_file.s(file_id) for file_id in file_ids).apply_async()
+    return {"status": "queued", "files_queued": len(file_ids), "group_id": result.id}
+
+
+async def _list_project_file_ids(project_id: str, status_filter: Optional[str]):
+    async with _task_session() as db:
+        stmt = select(PointCloudFile.id).where(
+            PointCloudFile.project_id == UUID(project_id),
+            PointCloudFile.status != FileStatus.DELETED,
+        )
+        if status_filter:
+            stmt = stmt.where(PointCloudFile.status == FileStatus(status_filter))
+        result = await db.execute(stmt)
+        return [str(file_id) for file_id in result.scalars().all()]
+
+
+@celery_app.task(name="app.worker.purge_expired_upload_sessions")
+def purge_expired_upload_sessions():
+    """
+    Delete expired, unfinished upload sessions and their staged chunks (runs on beat).
+    """
+    return asyncio.run(purge_expired_upload_sessions_async())
+
+
+async def purge_expired_upload_sessions_async():
+    async with _task_session() as db:
+        service = UploadSessionService(db)
+        purged = 0
+        while True:
+            batch = await service.purge_expired_sessions()
+            purged += batch
+            if batch == 0:
+                break
+        return {"status": "completed", "sessions_purged": purged}
+
+
 @celery_app.task(name="app.worker.import_and_create_tasks", acks_late=True)
 def import_and_create_tasks(
     project_id: str,
@@ -58,12 +175,9 @@ async def import_and_create_tasks_async(
     print(f"Starting import from {target_dir} for project {project_id}")
 
     async with AsyncSessionLocal() as db:
-        file_service = FileUploadService(db)
+        ledger_service = ImportLedgerService(db)
         task_service = TaskService(db)
         
-        imported_files = []
-        errors = []
-        
         # Scan directory
         pattern = "**/*" if recursive else "*"
         # Allowed extensions from service
@@ -76,28 +190,29 @@ async def import_and_create_tasks_async(
         
         print(f"Found {len(files_to_process)} files to process")
 
-        # Import files
-        for file_path in files_to_process:
-            try:
-                # Check if already exists (by filename/project) logic is inside upload/import usually?
-                # Or duplicate check. The service doesn't strictly prevent duplicates but stores unique path.
-                # Ideally we skip if exact filename already exists in project to avoid duplication.
-                # Let's do a quick check or just import. "Import" usually implies adding.
-                
-                file_record = await file_service.import_local_file(
-                    file_path=file_path,
-                    project_id=UUID(project_id),
-                    uploaded_by=UUID(creator_id)
-                )
-                imported_files.append(file_record.id)
-            except Exception as e:
-                print(f"Failed to import {file_path.name}: {e}")
-                errors.append(f"{file_path.name}: {str(e)}")
+        # Import new and changed files; files recorded in the ledger by an
+        # earlier run are skipped, so an interrupted import resumes here
+        saved, import_errors, plan = await ledger_service.import_folder(
+            base_dir=base_dir,
+            paths=files_to_process,
+            project_id=UUID(project_id),
+            uploaded_by=UUID(creator_id),
+            label=f"Import {source_path}",
+        )
+        errors = [f"{e['filename']}: {e['detail']}" for e in import_errors]
+        summary = plan.summary()
+
+        # Files imported earlier whose tasks were never created are picked up again
+        resumed_files = await ledger_service.untasked_file_ids(plan.unchanged)
+        imported_files = [
+            record.id for record in sorted(saved, key=lambda r: r.original_filename)
+        ] + resumed_files
 
         if not imported_files:
             return {
                 "status": "completed",
-                "message": "No files imported",
+                "message": "No new files to import",
+                **summary,
                 "errors": errors
             }
 
@@ -119,7 +234,8 @@ async def import_and_create_tasks_async(
             )
             return {
                 "status": "completed",
-                "files_imported": len(imported_files),
+                "files_imported": len(saved),
+                **summary,
                 "tasks_created": len(tasks),
                 "errors": errors
             }
@@ -127,19 +243,18 @@ async def import_and_create_tasks_async(
             print(f"Failed to create tasks: {e}")
             return {
                 "status": "partial",
-                "files_imported": len(imported_files),
+                "files_imported": len(saved),
+                **summary,
                 "tasks_created": 0,
                 "message": f"Files imported but task creation failed: {str(e)}",
                 "errors": errors
             }
 
-# MinIO Client
-minio_client = Minio(
-    endpoint=f"{settings.MINIO_HOST}:{settings.MINIO_PORT}",
-    access_key=settings.MINIO_ACCESS_KEY,
-    secret_key=settings.MINIO_SECRET_KEY,
-    secure=settings.MINIO_SECURE,
-)
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    """Give each forked worker process its own storage client and pool."""
+    init_storage()
+
 
 @celery_app.task(name="app.worker.export_dataset", acks_late=True)
 def export_dataset(project_id: str, base_path: str = None):
@@ -255,22 +370,30 @@ async def export_dataset_async(project_id: str, base_path: str):
                     hash_val = int(hashlib.md5(file_record.original_filename.encode()).hexdigest(), 16)
                     is_train = (hash_val % 100) < 90  # 90% train, 10% test
                     
+                    # The canonical float32 .npy is copied as is; older files
+                    # without one are re-packed as .npz with only 'pts'
+                    suffix = ".npy" if file_record.canonical_path else ".npz"
                     if is_train:
                         target_dir = train_dir
-                        target_filename = f"{label_name}_{train_count:05d}.npz"
+                        target_filename = f"{label_name}_{train_count:05d}{suffix}"
                         train_count += 1
                     else:
                         target_dir = test_dir
-                        target_filename = f"{label_name}_{test_count:05d}.npz"
+                        target_filename = f"{label_name}_{test_count:05d}{suffix}"
                         test_count += 1
                     
                     target_path = target_dir / target_filename
 
                     try:
-                        minio_client.fget_object(
-                            settings.MINIO_BUCKET,
-                            file_record.file_path,
-                            str(target_path)
+                        if file_record.canonical_path:
+                            await get_storage().fget_object(
+                                file_record.canonical_path, str(target_path)
+                            )
+                            count += 1
+                            continue
+
+                        await get_storage().fget_object(
+                            file_record.file_path, str(target_path)
                         )
                         
                         # Verify and clean .npz format for PointNet
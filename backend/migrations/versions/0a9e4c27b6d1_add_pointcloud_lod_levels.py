@@ -0,0 +1,24 @@
+"""Add lod_levels to pointcloud_files
+
+Revision ID: 0a9e4c27b6d1
+Revises: f1c7a3d95e48
+Create Date: 2026-10-17 16:40:12.318554
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9e4c27b6d1'
+down_revision = 'f1c7a3d95e48'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pointcloud_files', sa.Column('lod_levels', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pointcloud_files', 'lod_levels')
@@ -0,0 +1,24 @@
+"""Add octree_nodes to pointcloud_files
+
+Revision ID: 2b7d5e81c4a3
+Revises: 0a9e4c27b6d1
+Create Date: 2026-10-17 18:05:27.604112
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7d5e81c4a3'
+down_revision = '0a9e4c27b6d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pointcloud_files', sa.Column('octree_nodes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pointcloud_files', 'octree_nodes')
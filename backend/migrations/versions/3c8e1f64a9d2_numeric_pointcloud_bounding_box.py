@@ -0,0 +1,47 @@
+"""Store pointcloud_files bounding boxes as numbers and index the XY footprint
+
+Revision ID: 3c8e1f64a9d2
+Revises: 2b7d5e81c4a3
+Create Date: 2026-10-17 19:12:44.270381
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8e1f64a9d2'
+down_revision = '2b7d5e81c4a3'
+branch_labels = None
+depends_on = None
+
+BOUNDS = ('min_x', 'max_x', 'min_y', 'max_y', 'min_z', 'max_z')
+
+
+def upgrade() -> None:
+    for column in BOUNDS:
+        op.alter_column(
+            'pointcloud_files',
+            column,
+            existing_type=sa.String(length=50),
+            type_=sa.Float(),
+            existing_nullable=True,
+            postgresql_using=f"NULLIF(trim({column}), '')::double precision",
+        )
+    op.execute(
+        "CREATE INDEX ix_pointcloud_files_footprint ON pointcloud_files "
+        "USING gist (box(point(min_x, min_y), point(max_x, max_y)))"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pointcloud_files_footprint', table_name='pointcloud_files')
+    for column in BOUNDS:
+        op.alter_column(
+            'pointcloud_files',
+            column,
+            existing_type=sa.Float(),
+            type_=sa.String(length=50),
+            existing_nullable=True,
+            postgresql_using=f"{column}::text",
+        )
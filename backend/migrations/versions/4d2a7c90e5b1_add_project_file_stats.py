@@ -0,0 +1,55 @@
+"""Add project_file_stats rollup of pointcloud_files
+
+Revision ID: 4d2a7c90e5b1
+Revises: 3c8e1f64a9d2
+Create Date: 2026-10-17 19:48:03.915562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '4d2a7c90e5b1'
+down_revision = '3c8e1f64a9d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_file_stats',
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM(name='filestatus', create_type=False),
+            nullable=False,
+        ),
+        sa.Column('file_extension', sa.String(length=10), nullable=False),
+        sa.Column('file_count', sa.BigInteger(), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('total_points', sa.BigInteger(), nullable=False),
+        sa.Column('largest_file_size', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id', 'status', 'file_extension'),
+    )
+    # Backfill from the existing files
+    op.execute(
+        """
+        INSERT INTO project_file_stats (
+            project_id, status, file_extension, file_count, total_size,
+            total_points, largest_file_size, updated_at
+        )
+        SELECT project_id, status, file_extension, count(*),
+               coalesce(sum(file_size), 0), coalesce(sum(point_count), 0),
+               coalesce(max(file_size), 0), now() at time zone 'utc'
+        FROM pointcloud_files
+        GROUP BY project_id, status, file_extension
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_file_stats')
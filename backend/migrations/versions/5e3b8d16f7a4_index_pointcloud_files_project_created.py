@@ -0,0 +1,23 @@
+"""Index pointcloud_files (project_id, created_at, id) for keyset pagination
+
+Revision ID: 5e3b8d16f7a4
+Revises: 4d2a7c90e5b1
+Create Date: 2026-10-17 20:31:17.264018
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5e3b8d16f7a4'
+down_revision = '4d2a7c90e5b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pointcloud_files_project_created', 'pointcloud_files', ['project_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pointcloud_files_project_created', table_name='pointcloud_files')
@@ -0,0 +1,34 @@
+"""Index task and annotation listings for keyset pagination
+
+Revision ID: 6f9a2c47d8e3
+Revises: 5e3b8d16f7a4
+Create Date: 2026-10-17 21:12:44.580931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f9a2c47d8e3'
+down_revision = '5e3b8d16f7a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_tasks_project_created', 'tasks', ['project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tasks_assignee_created', 'tasks', ['assigned_to', 'created_at', 'id'], unique=False)
+    op.create_index('ix_annotations_annotator_project_created', 'annotations', ['annotator_id', 'project_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_annotations_updated', 'annotations', ['updated_at', 'id'], unique=False)
+    op.create_index('ix_annotations_status_updated', 'annotations', ['status', 'updated_at', 'id'], unique=False)
+    op.create_index('ix_annotations_pending_review', 'annotations', ['project_id', 'created_at', 'id'], unique=False, postgresql_where=sa.text("status = 'SUBMITTED'"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_annotations_pending_review', table_name='annotations')
+    op.drop_index('ix_annotations_status_updated', table_name='annotations')
+    op.drop_index('ix_annotations_updated', table_name='annotations')
+    op.drop_index('ix_annotations_annotator_project_created', table_name='annotations')
+    op.drop_index('ix_tasks_assignee_created', table_name='tasks')
+    op.drop_index('ix_tasks_project_created', table_name='tasks')
@@ -0,0 +1,43 @@
+"""Add composite and partial indexes for the hot task, annotation, member and file queries
+
+Built with CREATE INDEX CONCURRENTLY so that tables stay writable during the
+build. If a build fails, PostgreSQL leaves an INVALID index behind; drop it
+and run the upgrade again.
+
+Revision ID: 7a1d5e93b2c6
+Revises: 6f9a2c47d8e3
+Create Date: 2026-10-17 21:47:09.318442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1d5e93b2c6'
+down_revision = '6f9a2c47d8e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_annotations_project_status', 'annotations', ['project_id', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_annotations_annotator_project_status', 'annotations', ['annotator_id', 'project_id', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_project_status_priority', 'tasks', ['project_id', 'status', 'priority', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_tasks_assignee_status', 'tasks', ['assigned_to', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_project_members_active', 'project_members', ['project_id', 'user_id'], unique=False, postgresql_include=['role'], postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.create_index('ix_project_members_user_active', 'project_members', ['user_id'], unique=False, postgresql_include=['project_id', 'role'], postgresql_where=sa.text('is_active'), postgresql_concurrently=True)
+        op.create_index('ix_pointcloud_files_project_live', 'pointcloud_files', ['project_id', 'created_at', 'id'], unique=False, postgresql_where=sa.text("status <> 'DELETED'"), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_pointcloud_files_project_live', table_name='pointcloud_files', postgresql_concurrently=True)
+        op.drop_index('ix_project_members_user_active', table_name='project_members', postgresql_concurrently=True)
+        op.drop_index('ix_project_members_active', table_name='project_members', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_assignee_status', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_project_status_priority', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_annotations_annotator_project_status', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('ix_annotations_project_status', table_name='annotations', postgresql_concurrently=True)
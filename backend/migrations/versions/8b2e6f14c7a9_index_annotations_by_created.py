@@ -0,0 +1,37 @@
+"""Page global annotation listings by creation time
+
+The global listing pages on (created_at, id) instead of (updated_at, id):
+updated_at changes when an annotation is edited or reviewed, which moved
+rows across pages between requests. Built concurrently, see 7a1d5e93b2c6.
+
+Revision ID: 8b2e6f14c7a9
+Revises: 7a1d5e93b2c6
+Create Date: 2026-10-17 22:31:52.104876
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2e6f14c7a9'
+down_revision = '7a1d5e93b2c6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index('ix_annotations_created', 'annotations', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_annotations_status_created', 'annotations', ['status', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_annotations_status_updated', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('ix_annotations_updated', table_name='annotations', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_annotations_updated', 'annotations', ['updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_annotations_status_updated', 'annotations', ['status', 'updated_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_annotations_status_created', table_name='annotations', postgresql_concurrently=True)
+        op.drop_index('ix_annotations_created', table_name='annotations', postgresql_concurrently=True)
@@ -0,0 +1,30 @@
+"""Drop the full (project_id, created_at, id) index of pointcloud_files
+
+The file list and its count now skip deleted files like the search does,
+so ix_pointcloud_files_project_live (the same columns without deleted
+rows) serves them all and the full index only cost writes.
+
+Revision ID: 9c4f7a25d3e8
+Revises: 8b2e6f14c7a9
+Create Date: 2026-10-17 22:48:06.557213
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4f7a25d3e8'
+down_revision = '8b2e6f14c7a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_pointcloud_files_project_created', table_name='pointcloud_files', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_pointcloud_files_project_created', 'pointcloud_files', ['project_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
@@ -0,0 +1,56 @@
+"""Add upload_sessions table for resumable uploads
+
+Revision ID: c3d1e7a5f902
+Revises: b80bf8a79fa3
+Create Date: 2026-10-17 09:12:44.120311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d1e7a5f902'
+down_revision = 'b80bf8a79fa3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'upload_sessions',
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('file_extension', sa.String(length=10), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('expected_checksum', sa.String(length=64), nullable=True),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('total_chunks', sa.Integer(), nullable=False),
+        sa.Column('received_chunks', sa.JSON(), nullable=False),
+        sa.Column(
+            'status',
+            sa.Enum('ACTIVE', 'COMPLETED', 'ABORTED', name='uploadsessionstatus'),
+            nullable=False,
+        ),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_by', sa.UUID(), nullable=False),
+        sa.Column('pointcloud_file_id', sa.UUID(), nullable=True),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['pointcloud_file_id'], ['pointcloud_files.id']),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_upload_sessions_project_id'), 'upload_sessions', ['project_id'], unique=False)
+    op.create_index(op.f('ix_upload_sessions_status'), 'upload_sessions', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_upload_sessions_status'), table_name='upload_sessions')
+    op.drop_index(op.f('ix_upload_sessions_project_id'), table_name='upload_sessions')
+    op.drop_table('upload_sessions')
+    sa.Enum(name='uploadsessionstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,25 @@
+"""Index pointcloud_files checksum and file_path for deduplication
+
+Revision ID: d5a8c41e7b23
+Revises: c3d1e7a5f902
+Create Date: 2026-10-17 14:03:51.482907
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a8c41e7b23'
+down_revision = 'c3d1e7a5f902'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_pointcloud_files_checksum'), 'pointcloud_files', ['checksum'], unique=False)
+    op.create_index(op.f('ix_pointcloud_files_file_path'), 'pointcloud_files', ['file_path'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pointcloud_files_file_path'), table_name='pointcloud_files')
+    op.drop_index(op.f('ix_pointcloud_files_checksum'), table_name='pointcloud_files')
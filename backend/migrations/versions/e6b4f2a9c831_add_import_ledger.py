@@ -0,0 +1,43 @@
+"""Add import_ledger table for resumable folder imports
+
+Revision ID: e6b4f2a9c831
+Revises: d5a8c41e7b23
+Create Date: 2026-10-17 14:05:31.502117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6b4f2a9c831'
+down_revision = 'd5a8c41e7b23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_ledger',
+        sa.Column('relative_path', sa.String(length=1024), nullable=False),
+        sa.Column('file_size', sa.BigInteger(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('checksum', sa.String(length=64), nullable=False),
+        sa.Column('pointcloud_file_id', sa.UUID(), nullable=True),
+        sa.Column('imported_by', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=False),
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['imported_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['pointcloud_file_id'], ['pointcloud_files.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'relative_path', name='uq_import_ledger_project_path'),
+    )
+    op.create_index(op.f('ix_import_ledger_project_id'), 'import_ledger', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_ledger_project_id'), table_name='import_ledger')
+    op.drop_table('import_ledger')
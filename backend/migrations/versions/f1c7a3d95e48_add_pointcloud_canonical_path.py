@@ -0,0 +1,24 @@
+"""Add canonical_path to pointcloud_files
+
+Revision ID: f1c7a3d95e48
+Revises: e6b4f2a9c831
+Create Date: 2026-10-17 15:22:09.774203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c7a3d95e48'
+down_revision = 'e6b4f2a9c831'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pointcloud_files', sa.Column('canonical_path', sa.String(length=500), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('pointcloud_files', 'canonical_path')
@@ -0,0 +1,164 @@
+"""
+Benchmark point cloud analysis for npz, PLY and PCD against the npy path.
+
+Usage:
+    python scripts/benchmark_pointcloud_io.py [--points 1000000] [--repeat 5]
+
+Each format is written to a temporary file (as the worker does after
+fetching from storage) and to an in-memory buffer (as small uploads are),
+then run through app.utils.pointcloud_io.analyze_point_cloud. The
+results of every format are checked against the npy result.
+"""
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.utils.pointcloud_io import analyze_point_cloud
+
+FIELDS = ("x", "y", "z", "intensity")
+
+
+def make_points(count: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal((count, len(FIELDS))) * 50).astype(np.float32)
+
+
+def write_npy(points: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, points)
+    return buffer.getvalue()
+
+
+def write_npz(points: np.ndarray, compressed: bool) -> bytes:
+    buffer = io.BytesIO()
+    (np.savez_compressed if compressed else np.savez)(buffer, labels=np.zeros(len(points)), points=points)
+    return buffer.getvalue()
+
+
+def write_ply(points: np.ndarray, fmt: str) -> bytes:
+    header = [
+        "ply",
+        f"format {fmt} 1.0",
+        f"element vertex {len(points)}",
+        *[f"property float {name}" for name in FIELDS],
+        "end_header",
+    ]
+    head = ("\n".join(header) + "\n").encode("ascii")
+    if fmt == "ascii":
+        body = io.BytesIO()
+        np.savetxt(body, points, fmt="%.6f")
+        return head + body.getvalue()
+    order = "<" if fmt == "binary_little_endian" else ">"
+    return head + points.astype(order + "f4").tobytes()
+
+
+def _lzf_literals(data: bytes) -> bytes:
+    # Valid LZF stream made only of literal runs; exercises the decoder
+    # without needing a compressor
+    out = bytearray()
+    for start in range(0, len(data), 32):
+        chunk = data[start:start + 32]
+        out.append(len(chunk) - 1)
+        out += chunk
+    return bytes(out)
+
+
+def write_pcd(points: np.ndarray, data_format: str) -> bytes:
+    header = [
+        "VERSION .7",
+        f"FIELDS {' '.join(FIELDS)}",
+        "SIZE " + " ".join(["4"] * len(FIELDS)),
+        "TYPE " + " ".join(["F"] * len(FIELDS)),
+        "COUNT " + " ".join(["1"] * len(FIELDS)),
+        f"WIDTH {len(points)}",
+        "HEIGHT 1",
+        "VIEWPOINT 0 0 0 1 0 0 0",
+        f"POINTS {len(points)}",
+        f"DATA {data_format}",
+    ]
+    head = ("\n".join(header) + "\n").encode("ascii")
+    if data_format == "ascii":
+        body = io.BytesIO()
+        np.savetxt(body, points, fmt="%.6f")
+        return head + body.getvalue()
+    if data_format == "binary":
+        return head + points.astype("<f4").tobytes()
+
+    columns = np.ascontiguousarray(points.T.astype("<f4")).tobytes()
+    compressed = _lzf_literals(columns)
+    sizes = np.array([len(compressed), len(columns)], dtype="<u4").tobytes()
+    return head + sizes + compressed
+
+
+def time_analysis(payload: bytes, extension: str, repeat: int, on_disk: bool):
+    if on_disk:
+        source = tempfile.TemporaryFile()
+        source.write(payload)
+    else:
+        source = io.BytesIO(payload)
+
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = analyze_point_cloud(source, extension)
+        best = min(best, time.perf_counter() - start)
+    source.close()
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--skip-ascii", action="store_true")
+    args = parser.parse_args()
+
+    points = make_points(args.points)
+    cases = [
+        ("npy", ".npy", write_npy(points)),
+        ("npz", ".npz", write_npz(points, False)),
+        ("npz compressed", ".npz", write_npz(points, True)),
+        ("ply binary_little_endian", ".ply", write_ply(points, "binary_little_endian")),
+        ("ply binary_big_endian", ".ply", write_ply(points, "binary_big_endian")),
+        ("pcd binary", ".pcd", write_pcd(points, "binary")),
+        ("pcd binary_compressed", ".pcd", write_pcd(points, "binary_compressed")),
+    ]
+    if not args.skip_ascii:
+        cases += [
+            ("ply ascii", ".ply", write_ply(points, "ascii")),
+            ("pcd ascii", ".pcd", write_pcd(points, "ascii")),
+        ]
+
+    print(f"{args.points:,} points, best of {args.repeat}\n")
+    print(f"{'format':<28}{'size MiB':>10}{'file ms':>10}{'memory ms':>11}  check")
+
+    reference = None
+    for name, extension, payload in cases:
+        disk_time, result = time_analysis(payload, extension, args.repeat, True)
+        memory_time, _ = time_analysis(payload, extension, args.repeat, False)
+        if reference is None:
+            reference = result
+
+        matches = result["point_count"] == reference["point_count"] and all(
+            abs(result["bounding_box"][k] - reference["bounding_box"][k]) < 1e-3
+            for k in reference["bounding_box"]
+        )
+        print(
+            f"{name:<28}{len(payload) / 2**20:>10.1f}"
+            f"{disk_time * 1000:>10.1f}{memory_time * 1000:>11.1f}  "
+            f"{'ok' if matches else 'MISMATCH'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
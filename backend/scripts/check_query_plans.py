@@ -0,0 +1,315 @@
+"""
+Check that the hot service queries are answered by index scans.
+
+Usage:
+    python scripts/check_query_plans.py [--projects 50] [--users 2000]
+        [--files 100000] [--tasks 100000] [--annotations 200000]
+
+Seeds a large synthetic dataset inside a transaction, runs the read paths
+of the task, annotation and file services against it while recording the
+SQL they issue, and EXPLAINs every recorded statement with its parameters.
+The check fails (exit status 1) if any plan reads tasks, annotations,
+pointcloud_files or project_members with a sequential scan. The
+transaction is rolled back at the end, so the script can be pointed at a
+development database that has the migrations applied.
+
+tests/test_query_plans.py runs the same check with ``check_plans``.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+# Add backend to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_engine
+from app.models.annotation import Annotation
+from app.models.enums import (
+    AnnotationStatus,
+    FileStatus,
+    ProjectRole,
+    TaskPriority,
+    TaskStatus,
+)
+from app.models.pointcloud import PointCloudFile
+from app.models.project import Project, ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskFilter
+from app.services.annotation import AnnotationService
+from app.services.file_upload import FileUploadService
+from app.services.task import TaskService
+from app.utils.pagination import encode_cursor
+
+HOT_TABLES = {"tasks", "annotations", "pointcloud_files", "project_members"}
+CHUNK = 10_000
+
+
+async def _insert(conn, model, rows) -> None:
+    for start in range(0, len(rows), CHUNK):
+        await conn.execute(insert(model.__table__), rows[start : start + CHUNK])
+
+
+def _weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+async def seed(conn, args) -> dict:
+    """Insert users, projects, members, files, tasks and annotations."""
+    rng = random.Random(0)
+    now = datetime.utcnow()
+
+    def moment():
+        return now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+
+    run = uuid4().hex[:8]
+    users = [
+        {
+            "id": uuid4(),
+            "email": f"plan-{run}-{i}@example.invalid",
+            "full_name": f"Plan Check {i}",
+            "hashed_password": "x",
+        }
+        for i in range(args.users)
+    ]
+    await _insert(conn, User, users)
+
+    projects = [
+        {"id": uuid4(), "name": f"plan-{run}-{i}", "created_by": users[0]["id"]}
+        for i in range(args.projects)
+    ]
+    await _insert(conn, Project, projects)
+
+    members = []
+    for i, user in enumerate(users):
+        for project in rng.sample(projects, min(10, len(projects))):
+            members.append(
+                {
+                    "project_id": project["id"],
+                    "user_id": user["id"],
+                    "role": ProjectRole.REVIEWER if i % 20 == 0 else ProjectRole.ANNOTATOR,
+                    "is_active": rng.random() > 0.05,
+                }
+            )
+    await _insert(conn, ProjectMember, members)
+
+    files = []
+    for i in range(args.files):
+        created = moment()
+        files.append(
+            {
+                "id": uuid4(),
+                "project_id": rng.choice(projects)["id"],
+                "filename": f"{i}.npy",
+                "original_filename": f"scan_{i}.npy",
+                "file_path": f"plan/{run}/{i}.npy",
+                "file_size": rng.randrange(1, 500) * 1024 * 1024,
+                "file_extension": ".npy",
+                "status": _weighted(
+                    rng,
+                    [(FileStatus.PROCESSED, 90), (FileStatus.DELETED, 5), (FileStatus.FAILED, 5)],
+                ),
+                "uploaded_by": users[0]["id"],
+                "has_noise": rng.random() < 0.1,
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+    await _insert(conn, PointCloudFile, files)
+
+    tasks = []
+    for i in range(args.tasks):
+        created = moment()
+        tasks.append(
+            {
+                "id": uuid4(),
+                "project_id": rng.choice(projects)["id"],
+                "name": f"task {i}",
+                "status": rng.choice(list(TaskStatus)),
+                "priority": rng.choice(list(TaskPriority)),
+                "assigned_to": rng.choice(users)["id"],
+                "created_by": users[0]["id"],
+                "created_at": created,
+                "updated_at": created,
+            }
+        )
+    await _insert(conn, Task, tasks)
+
+    annotations = []
+    for _ in range(args.annotations):
+        task = rng.choice(tasks)
+        created = moment()
+        annotations.append(
+            {
+                "task_id": task["id"],
+                "project_id": task["project_id"],
+                "pointcloud_file_id": rng.choice(files)["id"],
+                "annotator_id": rng.choice(users)["id"],
+                "status": _weighted(
+                    rng,
+                    [
+                        (AnnotationStatus.DRAFT, 30),
+                        (AnnotationStatus.SUBMITTED, 5),
+                        (AnnotationStatus.APPROVED, 50),
+                        (AnnotationStatus.REJECTED, 10),
+                        (AnnotationStatus.NEEDS_REVISION, 5),
+                    ],
+                ),
+                "created_at": created,
+                "updated_at": created + timedelta(hours=rng.randrange(48)),
+            }
+        )
+    await _insert(conn, Annotation, annotations)
+
+    for table in ("users", "projects", "project_members", "pointcloud_files", "tasks", "annotations"):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+    reviewer = next(
+        m for m in members if m["role"] == ProjectRole.REVIEWER and m["is_active"]
+    )
+    return {
+        "project_id": reviewer["project_id"],
+        "user_id": reviewer["user_id"],
+        "task_id": tasks[0]["id"],
+        "task_project_id": tasks[0]["project_id"],
+    }
+
+
+async def run_queries(session: AsyncSession, ids: dict) -> None:
+    """Call the read paths whose SQL is checked."""
+    project_id, user_id = ids["project_id"], ids["user_id"]
+
+    tasks = TaskService(session)
+    page = await tasks.get_project_tasks(project_id, size=20)
+    await tasks.get_project_tasks(project_id, size=20, cursor=page.next_cursor)
+    await tasks.get_project_tasks(
+        project_id,
+        TaskFilter(status=TaskStatus.IN_PROGRESS, priority=TaskPriority.HIGH),
+        size=20,
+    )
+    await tasks.get_user_tasks(user_id, status_filter=TaskStatus.ASSIGNED, size=20)
+    await tasks.get_user_tasks(user_id, project_id=project_id, size=20)
+    await tasks.get_task_stats(project_id)
+
+    annotations = AnnotationService(session)
+    await annotations._verify_reviewer_permission(user_id, project_id)
+    await annotations.get_task_annotations(ids["task_id"], ids["task_project_id"])
+    await annotations.get_user_annotations(
+        user_id, project_id, status=AnnotationStatus.APPROVED, limit=21
+    )
+    await annotations.count_user_annotations(
+        user_id, project_id, status=AnnotationStatus.APPROVED
+    )
+    pending = await annotations.get_pending_reviews(project_id, limit=51)
+    if pending:
+        last = pending[-1]
+        await annotations.get_pending_reviews(
+            project_id, limit=51, cursor=encode_cursor(last.created_at, last.id)
+        )
+    await annotations.count_pending_reviews(project_id)
+    await annotations.get_annotation_statistics(project_id)
+    await annotations.get_global_annotations(
+        status=AnnotationStatus.SUBMITTED, limit=21, include_total=False
+    )
+
+    files = FileUploadService(session)
+    await files.get_project_files(project_id, limit=21)
+    await files.count_project_files(project_id, has_noise=True)
+    await files.search_files(project_id, limit=20, min_points=1)
+
+
+def _scans(plan: dict):
+    """(node type, relation, index) of every scan node of a plan."""
+    relation = plan.get("Relation Name")
+    if relation:
+        yield plan["Node Type"], relation, plan.get("Index Name")
+    for child in plan.get("Plans", []):
+        yield from _scans(child)
+
+
+async def explain(conn, statement: str, parameters) -> list:
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(_scans(plan[0]["Plan"]))
+
+
+async def check_plans(conn, args) -> list:
+    """
+    Seed ``conn``, run the read paths and EXPLAIN the SELECTs they issued.
+
+    The caller owns the transaction and rolls it back.
+
+    Returns:
+        list: (statement, scans of hot tables, sequential ones among them) of
+        every statement reading a hot table
+    """
+    statements = []
+
+    def record(sync_conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    started = time.perf_counter()
+    ids = await seed(conn, args)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    session = AsyncSession(bind=conn, expire_on_commit=False)
+    event.listen(conn.sync_connection, "before_cursor_execute", record)
+    try:
+        await run_queries(session, ids)
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", record)
+
+    checked = []
+    for statement, parameters in statements:
+        scans = await explain(conn, statement, parameters)
+        hot = [scan for scan in scans if scan[1] in HOT_TABLES]
+        if hot:
+            checked.append((statement, hot, [scan for scan in hot if scan[0] == "Seq Scan"]))
+    return checked
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--annotations", type=int, default=200_000)
+    return parser
+
+
+async def main(args) -> int:
+    async with async_engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            checked = await check_plans(conn, args)
+        finally:
+            await transaction.rollback()
+
+    failures = 0
+    for statement, hot, sequential in checked:
+        failures += bool(sequential)
+        print("FAIL" if sequential else "ok  ", " ".join(statement.split())[:110])
+        for node, relation, index in hot:
+            print(f"        {node} on {relation}" + (f" using {index}" if index else ""))
+
+    print(f"\n{len(checked)} statements checked, {failures} with sequential scans")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(build_parser().parse_args())))
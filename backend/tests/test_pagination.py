@@ -0,0 +1,46 @@
+"""Keyset cursor encoding and decoding."""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    key = (datetime(2026, 10, 17, 21, 12, 44, 580931), uuid4())
+    assert decode_cursor(encode_cursor(*key), (datetime, UUID)) == key
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        _raw_cursor({"created_at": "2026-10-17T00:00:00"}),
+        _raw_cursor(["2026-10-17T00:00:00"]),
+        _raw_cursor(["yesterday", str(uuid4())]),
+        _raw_cursor(["2026-10-17T00:00:00", 123]),
+        _raw_cursor(["2026-10-17T00:00:00", [1]]),
+        _raw_cursor([1, "x"]),
+    ],
+)
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, (datetime, UUID))
+    assert error.value.status_code == 400
+
+
+def test_keyset_page():
+    rows = list(range(5))
+    page, cursor = keyset_page(rows, 4, lambda row: (row,))
+    assert page == [0, 1, 2, 3]
+    assert decode_cursor(cursor, (int,)) == (3,)
+    assert keyset_page(rows, 5, lambda row: (row,)) == (rows, None)
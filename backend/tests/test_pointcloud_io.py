@@ -0,0 +1,336 @@
+"""Round trips through the point cloud readers and writers of ``app.utils.pointcloud_io``."""
+
+import io
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from app.utils import pointcloud_io
+from app.utils.pointcloud_io import (
+    QUANTIZED_COMPRESSIONS,
+    QUANTIZED_DELTA,
+    QUANTIZED_MAGIC,
+    QUANTIZED_MORTON,
+    PointCloudFormatError,
+    available_compressions,
+    load_numpy_points,
+    lzf_decompress,
+    read_pcd,
+    read_ply,
+    read_quantized_points,
+    write_quantized_points,
+)
+
+RNG = np.random.default_rng(0)
+POINTS = RNG.normal(scale=50.0, size=(200, 3)).astype(np.float32)
+INTENSITY = RNG.integers(0, 255, size=200).astype(np.uint8)
+
+
+@pytest.fixture(params=["memory", "file"])
+def as_source(request, tmp_path):
+    """Wrap bytes as an in-memory buffer (viewed in place) or a real file (memory-mapped)."""
+    opened = []
+
+    def wrap(data: bytes):
+        if request.param == "memory":
+            return io.BytesIO(data)
+        path = tmp_path / "cloud"
+        path.write_bytes(data)
+        handle = open(path, "rb")
+        opened.append(handle)
+        return handle
+
+    yield wrap
+    for handle in opened:
+        handle.close()
+
+
+def _xyz(data: np.ndarray) -> np.ndarray:
+    return np.column_stack([data["x"], data["y"], data["z"]])
+
+
+# --------------------------------------------------------------------------- #
+# PLY
+# --------------------------------------------------------------------------- #
+
+def _ply_header(fmt: str, before: str = "") -> bytes:
+    return (
+        f"ply\nformat {fmt} 1.0\ncomment written by the tests\n{before}"
+        f"element vertex {len(POINTS)}\n"
+        "property float x\nproperty float y\nproperty float z\n"
+        "property uchar intensity\n"
+        "element face 0\nproperty list uchar int vertex_indices\n"
+        "end_header\n"
+    ).encode("ascii")
+
+
+def _vertices(order: str) -> np.ndarray:
+    dtype = np.dtype([("x", order + "f4"), ("y", order + "f4"), ("z", order + "f4"), ("intensity", "u1")])
+    vertices = np.empty(len(POINTS), dtype=dtype)
+    vertices["x"], vertices["y"], vertices["z"] = POINTS.T
+    vertices["intensity"] = INTENSITY
+    return vertices
+
+
+def test_read_ply_ascii(as_source):
+    body = "".join(
+        f"{x!r} {y!r} {z!r} {i}\n" for (x, y, z), i in zip(POINTS.tolist(), INTENSITY.tolist())
+    )
+    data = read_ply(as_source(_ply_header("ascii") + body.encode("ascii")))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+    np.testing.assert_array_equal(data["intensity"], INTENSITY)
+
+
+@pytest.mark.parametrize("fmt, order", [("binary_little_endian", "<"), ("binary_big_endian", ">")])
+def test_read_ply_binary(as_source, fmt, order):
+    data = read_ply(as_source(_ply_header(fmt) + _vertices(order).tobytes()))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+    np.testing.assert_array_equal(data["intensity"], INTENSITY)
+
+
+def test_read_ply_binary_skips_elements_before_vertices(as_source):
+    # Two fixed-size records of 2 + 4 bytes precede the vertex block
+    camera = np.array([(1, 2.0), (3, 4.0)], dtype=[("id", "<i2"), ("focal", "<f4")])
+    header = _ply_header(
+        "binary_little_endian",
+        before="element camera 2\nproperty short id\nproperty float focal\n",
+    )
+    data = read_ply(as_source(header + camera.tobytes() + _vertices("<").tobytes()))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+
+
+def test_read_ply_rejects_truncated_binary():
+    truncated = _ply_header("binary_little_endian") + _vertices("<").tobytes()[:-1]
+    with pytest.raises(PointCloudFormatError):
+        read_ply(io.BytesIO(truncated))
+
+
+# --------------------------------------------------------------------------- #
+# PCD
+# --------------------------------------------------------------------------- #
+
+def _pcd_header(data_format: str) -> bytes:
+    return (
+        "# .PCD v0.7 - Point Cloud Data file format\n"
+        "VERSION 0.7\nFIELDS x y z intensity\nSIZE 4 4 4 1\nTYPE F F F U\nCOUNT 1 1 1 1\n"
+        f"WIDTH {len(POINTS)}\nHEIGHT 1\nVIEWPOINT 0 0 0 1 0 0 0\nPOINTS {len(POINTS)}\n"
+        f"DATA {data_format}\n"
+    ).encode("ascii")
+
+
+def _lzf_compress(data: bytes) -> bytes:
+    """Greedy LZF encoder (back references included) to feed the decoder."""
+    out = bytearray()
+    literal = bytearray()
+
+    def flush_literal():
+        for start in range(0, len(literal), 32):
+            chunk = literal[start:start + 32]
+            out.append(len(chunk) - 1)
+            out.extend(chunk)
+        literal.clear()
+
+    i = 0
+    while i < len(data):
+        best_length, best_distance = 0, 0
+        for distance in range(1, min(i, 8192) + 1):
+            length = 0
+            while (
+                length < 264
+                and i + length < len(data)
+                and data[i + length - distance] == data[i + length]
+            ):
+                length += 1
+            if length > best_length:
+                best_length, best_distance = length, distance
+        if best_length < 3:
+            literal.append(data[i])
+            i += 1
+            continue
+        flush_literal()
+        length, offset = best_length - 2, best_distance - 1
+        if length < 7:
+            out.append((length << 5) | (offset >> 8))
+        else:
+            out.append((7 << 5) | (offset >> 8))
+            out.append(length - 7)
+        out.append(offset & 0xFF)
+        i += best_length
+    flush_literal()
+    return bytes(out)
+
+
+def test_read_pcd_ascii(as_source):
+    body = "".join(
+        f"{x!r} {y!r} {z!r} {i}\n" for (x, y, z), i in zip(POINTS.tolist(), INTENSITY.tolist())
+    )
+    data = read_pcd(as_source(_pcd_header("ascii") + body.encode("ascii")))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+    np.testing.assert_array_equal(data["intensity"], INTENSITY)
+
+
+def test_read_pcd_binary(as_source):
+    data = read_pcd(as_source(_pcd_header("binary") + _vertices("<").tobytes()))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+    np.testing.assert_array_equal(data["intensity"], INTENSITY)
+
+
+def test_lzf_decompress_overlapping_back_reference():
+    data = b"abc" * 40 + bytes(range(50)) + b"z" * 300
+    compressed = _lzf_compress(data)
+
+    assert len(compressed) < len(data)
+    assert lzf_decompress(compressed, len(data)) == data
+    with pytest.raises(PointCloudFormatError):
+        lzf_decompress(compressed, len(data) + 1)
+
+
+def test_read_pcd_binary_compressed_pure_python(as_source, monkeypatch):
+    monkeypatch.setattr(pointcloud_io, "_lzf", None)
+    # binary_compressed stores the data field by field
+    columns = b"".join(
+        [POINTS[:, 0].tobytes(), POINTS[:, 1].tobytes(), POINTS[:, 2].tobytes(), INTENSITY.tobytes()]
+    )
+    compressed = _lzf_compress(columns)
+    sizes = np.array([len(compressed), len(columns)], dtype="<u4").tobytes()
+
+    data = read_pcd(as_source(_pcd_header("binary_compressed") + sizes + compressed))
+
+    np.testing.assert_array_equal(_xyz(data), POINTS)
+    np.testing.assert_array_equal(data["intensity"], INTENSITY)
+
+
+# --------------------------------------------------------------------------- #
+# NumPy
+# --------------------------------------------------------------------------- #
+
+def _npz(save, **arrays) -> bytes:
+    buffer = io.BytesIO()
+    save(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def test_load_npy(as_source):
+    buffer = io.BytesIO()
+    np.save(buffer, POINTS)
+
+    np.testing.assert_array_equal(load_numpy_points(as_source(buffer.getvalue()), ".npy"), POINTS)
+
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed], ids=["stored", "deflated"])
+def test_load_npz_picks_the_point_member(as_source, save):
+    # The labels come first in the archive so a stored member starts mid-file
+    data = _npz(save, labels=np.arange(7), pts=POINTS)
+
+    np.testing.assert_array_equal(load_numpy_points(as_source(data), ".npz"), POINTS)
+
+
+@pytest.mark.parametrize("save", [np.savez, np.savez_compressed], ids=["stored", "deflated"])
+def test_load_npz_fortran_order(as_source, save):
+    data = _npz(save, scan=np.asfortranarray(POINTS.astype(np.float64)))
+
+    np.testing.assert_array_equal(load_numpy_points(as_source(data), ".npz"), POINTS)
+
+
+def test_load_npz_stored_member_is_mapped_at_its_offset():
+    source = io.BytesIO(_npz(np.savez, labels=np.arange(7), points=POINTS))
+    points = load_numpy_points(source, ".npz")
+
+    # Viewed in place: the array shares the archive's buffer
+    assert np.shares_memory(points, np.frombuffer(source.getbuffer(), dtype=np.uint8))
+    np.testing.assert_array_equal(points, POINTS)
+
+
+def test_load_npz_rejects_non_point_arrays():
+    with pytest.raises(PointCloudFormatError):
+        load_numpy_points(io.BytesIO(_npz(np.savez, labels=np.arange(7))), ".npz")
+
+
+# --------------------------------------------------------------------------- #
+# Quantized transport format
+# --------------------------------------------------------------------------- #
+
+def _quantized(columns, **options) -> bytes:
+    target = io.BytesIO()
+    written = write_quantized_points(columns, target, **options)
+    assert written == len(target.getvalue())
+    return target.getvalue()
+
+
+def _cloud_columns():
+    return [POINTS[:, 0], POINTS[:, 1], POINTS[:, 2], INTENSITY.astype(np.float32)]
+
+
+def test_quantized_header_layout():
+    columns = _cloud_columns()
+    data = _quantized(columns, bits=16, morton=True, delta=True, compression="deflate")
+
+    # The byte offsets read by frontend/src/utils/quantizedPoints.ts
+    assert data[:4] == QUANTIZED_MAGIC
+    assert data[4] == 16
+    assert data[5] == QUANTIZED_MORTON | QUANTIZED_DELTA
+    assert data[6] == QUANTIZED_COMPRESSIONS["deflate"]
+    assert data[7] == 1  # one attribute channel
+    assert struct.unpack_from("<I", data, 8)[0] == len(POINTS)
+    scales = struct.unpack_from("<3d", data, 16)
+    offsets = struct.unpack_from("<3d", data, 40)
+    np.testing.assert_allclose(offsets, POINTS.min(axis=0))
+    np.testing.assert_allclose(scales, (POINTS.max(axis=0) - POINTS.min(axis=0)) / 0xFFFF)
+    attribute_scale, attribute_offset = struct.unpack_from("<ff", data, 64)
+    assert attribute_offset == INTENSITY.min()
+    assert attribute_scale == pytest.approx((INTENSITY.max() - INTENSITY.min()) / 0xFFFF)
+
+    # Channels are planar, x first, in the declared width
+    body = zlib.decompress(data[72:])
+    assert len(body) == len(POINTS) * (3 * 2 + 2)
+
+
+@pytest.mark.parametrize("bits", [16, 32])
+@pytest.mark.parametrize("delta", [False, True], ids=["plain", "delta"])
+@pytest.mark.parametrize("morton", [False, True], ids=["source", "morton"])
+@pytest.mark.parametrize("compression", available_compressions())
+def test_quantized_round_trip_within_half_a_step(bits, delta, morton, compression):
+    columns = _cloud_columns()
+    data = _quantized(columns, bits=bits, morton=morton, delta=delta, compression=compression)
+    decoded = read_quantized_points(io.BytesIO(data))
+
+    assert decoded.shape == (len(POINTS), 4)
+    assert bool(data[5] & QUANTIZED_MORTON) == morton
+    original = np.column_stack([POINTS.astype(np.float64), INTENSITY])
+    if morton:
+        # The points come back in another order: match them up by x, which
+        # is distinct at either width for this cloud
+        decoded = decoded[np.argsort(decoded[:, 0], kind="stable")]
+        original = original[np.argsort(original[:, 0], kind="stable")]
+
+    steps = np.array(struct.unpack_from("<3d", data, 16) + struct.unpack_from("<f", data, 64))
+    error = np.abs(decoded - original).max(axis=0)
+    # Half a quantization step, plus float rounding of the scale and offset
+    # (float64 for positions, float32 for the attribute)
+    rounding = np.array([1e-9, 1e-9, 1e-9, 1e-6]) * np.abs(original).max(axis=0)
+    assert np.all(error <= steps / 2 + rounding)
+
+
+def test_quantized_round_trip_without_attributes_and_with_bounds():
+    bounds = [-10.0, -10.0, -10.0, 10.0, 10.0, 10.0]
+    data = _quantized(_cloud_columns(), bits=16, attributes=False, bounds=bounds)
+    decoded = read_quantized_points(io.BytesIO(data))
+
+    assert decoded.shape == (len(POINTS), 3)
+    # Positions outside the given bounds are clamped to them
+    expected = np.clip(POINTS.astype(np.float64), -10.0, 10.0)
+    assert np.abs(decoded - expected).max() <= 20.0 / 0xFFFF / 2 + 1e-9
+
+
+def test_quantized_rejects_other_data():
+    with pytest.raises(PointCloudFormatError):
+        read_quantized_points(io.BytesIO(b"PLY1" + bytes(60)))
+    with pytest.raises(PointCloudFormatError):
+        write_quantized_points(_cloud_columns(), io.BytesIO(), bits=8)
@@ -0,0 +1,45 @@
+"""
+The hot service queries are answered by index scans on a large dataset.
+
+Runs ``scripts/check_query_plans.py`` against the configured database
+(migrations applied) inside a rolled-back transaction; skipped when no
+PostgreSQL is reachable.
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.database import async_engine
+from scripts.check_query_plans import build_parser, check_plans
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+
+async def _connect():
+    try:
+        return await asyncio.wait_for(async_engine.connect(), timeout=5)
+    except Exception as e:
+        await async_engine.dispose()
+        pytest.skip(f"PostgreSQL not available: {e}")
+
+
+async def test_hot_queries_use_indexes():
+    conn = await _connect()
+    try:
+        transaction = await conn.begin()
+        try:
+            checked = await check_plans(conn, build_parser().parse_args([]))
+        finally:
+            await transaction.rollback()
+    finally:
+        await conn.close()
+        await async_engine.dispose()
+
+    assert checked, "no statement read a hot table"
+    sequential = {
+        " ".join(statement.split()): scans
+        for statement, _, scans in checked
+        if scans
+    }
+    assert not sequential, f"sequential scans: {sequential}"
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Layout,
   Typography,
@@ -32,6 +32,7 @@ import AnnotationViewer from '../components/AnnotationViewer';
 import Navbar from '../components/Navbar';
 import { apiCall, getAuthHeaders } from '../utils/api';
 import { parseNpyFile } from '../utils/npyParser';
+import { parseQuantizedPoints, QUANTIZED_MEDIA_TYPE } from '../utils/quantizedPoints';
 import { useAuth, usePermissions } from '../contexts/AuthContext';
 
 const { Title, Text } = Typography;
@@ -79,6 +80,9 @@ const AnnotationPage: React.FC = () => {
   const [selectedFileId, setSelectedFileId] = useState<string>('');
   const [currentAnnotation, setCurrentAnnotation] = useState<Annotation | null>(null);
   const [pointCloudData, setPointCloudData] = useState<Float32Array>();
+  // Preview level shown, and the level that is the full cloud (null: no previews)
+  const [lod, setLod] = useState<{ level: number; fullLevel: number } | null>(null);
+  const loadingFileRef = useRef<string>('');
   const [vehicleTypes, setVehicleTypes] = useState<VehicleType[]>([]);
   const [annotations, setAnnotations] = useState<any[]>([]); // All task annotations
   const [visibleAnnotations, setVisibleAnnotations] = useState<any[]>([]); // Filtered by file
@@ -236,56 +240,74 @@ const AnnotationPage: React.FC = () => {
     }
   };
 
+  const fetchLevel = async (fileId: string, level: number) => {
+      const resp = await fetch(`/api/v1/projects/${projectId}/files/${fileId}/lod/${level}`, {
+          headers: getAuthHeaders()
+      });
+      if (!resp.ok) throw new Error(`下載失敗 HTTP ${resp.status}`);
+      return parseNpyFile(await resp.arrayBuffer()).data;
+  };
+
+  // The whole cloud: the top preview level, or all there is for older files
+  const fetchFullCloud = async (fileId: string) => {
+      // Use proxy endpoint to stream file through backend
+      // This avoids CORS and DNS resolution issues with MinIO signed URLs
+      const url = `/api/v1/projects/${projectId}/files/${fileId}/proxy`;
+
+      // Compact quantized transport first: the viewer only needs positions and
+      // annotations are per file, so lossy 16-bit coordinates in Morton order are fine
+      const quantizedResp = await fetch(
+          `${url}?encoding=quantized&order=morton&attributes=false&compression=deflate`,
+          { headers: { ...getAuthHeaders(), Accept: QUANTIZED_MEDIA_TYPE } }
+      );
+      if (quantizedResp.ok) {
+          return (await parseQuantizedPoints(await quantizedResp.arrayBuffer())).positions;
+      }
+
+      // Prefer the canonical float32 .npy written at ingest (any source format);
+      // files ingested before it existed only have the original
+      let binResp = await fetch(`${url}?canonical=true`, {
+          headers: getAuthHeaders()
+      });
+      const canonical = binResp.ok;
+      if (binResp.status === 404) {
+          binResp = await fetch(url, {
+              headers: getAuthHeaders()
+          });
+      }
+
+      if (!binResp.ok) throw new Error(`下載失敗 HTTP ${binResp.status}`);
+      const arrayBuf = await binResp.arrayBuffer();
+
+      const filename = task?.files.find(f => f.id === fileId)?.original_filename || '';
+      if (!canonical && filename.toLowerCase().endsWith('.npz')) {
+          const { extractPointCloudFromNpzBuffer } = await import('../utils/npzParser');
+          const result = await extractPointCloudFromNpzBuffer(arrayBuf);
+          return result.positions;
+      }
+      return parseNpyFile(arrayBuf).data;
+  };
+
   const loadFile = async (fileId: string) => {
       if (!projectId || !fileId) return;
+      loadingFileRef.current = fileId;
       setLoading(true);
+      setLod(null);
       try {
-        // Use proxy endpoint to stream file through backend
-        // This avoids CORS and DNS resolution issues with MinIO signed URLs
-        const url = `/api/v1/projects/${projectId}/files/${fileId}/proxy`;
-        
-        const binResp = await fetch(url, {
-            headers: getAuthHeaders()
-        });
-        
-        if (!binResp.ok) throw new Error(`下載失敗 HTTP ${binResp.status}`);
-        if (!binResp.ok) throw new Error(`下載失敗 HTTP ${binResp.status}`);
-        const arrayBuf = await binResp.arrayBuffer();
-        
-        const fileInfo = task?.files.find(f => f.id === fileId);
+        const fileInfo = await apiCall(`/projects/${projectId}/files/${fileId}`);
         const filename = fileInfo?.original_filename || '';
-        
-        // Parse based on extension? The parser handles check.
-        // We need to know if it is NPZ from filename usually
-        // Or just try.
-        
-        // Note: extractPointCloudFromNpzBuffer is used if npz
-        // parseNpyFile if npy.
-        // We need logic here.
-        
-        let parsedData;
-        if (filename.toLowerCase().endsWith('.npz')) {
-             // Need to import extractPointCloudFromNpzBuffer (already imported)
-             // But wait, extractPointCloudFromNpzBuffer returns { positions: ..., ... } object usually?
-             // Or raw array? 
-             // Looking at TaskList.tsx: pointCloudData = await extractPointCloudFromNpzBuffer(...)
-             // In utils/npzParser.ts: returns { positions: Float32Array, ... }
-             
-             // But AnnotationPage previously used: 
-             // const parsed = parseNpyFile(arrayBuf); 
-             // setPointCloudData(parsed.data);
-             
-             // I need to support both.
-             
-             const { extractPointCloudFromNpzBuffer } = await import('../utils/npzParser');
-             const result = await extractPointCloudFromNpzBuffer(arrayBuf);
-             parsedData = result.positions;
-        } else {
-             const parsed = parseNpyFile(arrayBuf);
-             parsedData = parsed.data;
+
+        // Render the coarsest preview level; finer levels are fetched on request.
+        // The last level (one past the stored previews) is the full cloud.
+        const data = fileInfo?.lod_levels
+            ? await fetchLevel(fileId, 0)
+            : await fetchFullCloud(fileId);
+        // Another file was selected meanwhile
+        if (loadingFileRef.current !== fileId) return;
+        setPointCloudData(data);
+        if (fileInfo?.lod_levels) {
+            setLod({ level: 0, fullLevel: fileInfo.lod_levels.length });
         }
-        
-        setPointCloudData(parsedData);
         message.success(`已載入檔案: ${filename}`);
         
       } catch (e) {
@@ -296,6 +318,26 @@ const AnnotationPage: React.FC = () => {
       }
   };
 
+  const refineLevel = async () => {
+      if (!lod || lod.level >= lod.fullLevel) return;
+      const fileId = selectedFileId;
+      setLoading(true);
+      try {
+          const level = lod.level + 1;
+          const data = level === lod.fullLevel
+              ? await fetchFullCloud(fileId)
+              : await fetchLevel(fileId, level);
+          if (loadingFileRef.current !== fileId) return;
+          setPointCloudData(data);
+          setLod({ ...lod, level });
+      } catch (e) {
+          console.error(e);
+          message.error('載入點雲檔案失敗');
+      } finally {
+          setLoading(false);
+      }
+  };
+
   // Handle points selection
   // const handlePointsSelect = (points: any) => {
   //   setSelectedPoints(points);
@@ -594,8 +636,15 @@ const AnnotationPage: React.FC = () => {
                   <div style={{ fontSize: '24px', fontWeight: 'bold', color: '#52c41a' }}>
                     {Math.floor((pointCloudData?.length || 0) / 3).toLocaleString()}
                   </div>
-                  <Text type="secondary">總點數</Text>
+                  <Text type="secondary">
+                    {lod && lod.level < lod.fullLevel ? `預覽點數 (層級 ${lod.level})` : '總點數'}
+                  </Text>
                 </div>
+                {lod && lod.level < lod.fullLevel && (
+                  <Button onClick={refineLevel} loading={loading}>
+                    {lod.level + 1 === lod.fullLevel ? '載入完整點雲' : '提高解析度'}
+                  </Button>
+                )}
               </Space>
             </Col>
           </Row>
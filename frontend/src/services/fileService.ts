@@ -31,6 +31,12 @@ export interface FileUploadResponse {
   message?: string;
 }
 
+export interface BatchUploadResponse {
+  items: FileUploadResponse[];
+  errors: { filename: string; detail: string }[];
+  total: number;
+}
+
 /**
  * 從API獲取文件列表
  */
@@ -141,7 +147,9 @@ export async function uploadProjectFiles(projectId: string, files: File[]): Prom
     body: formData
   });
   if (!res.ok) throw new Error(`Upload multi failed: HTTP ${res.status}`);
-  return await res.json();
+  const data: BatchUploadResponse = await res.json();
+  if (data.errors.length) console.warn('Files failed to upload:', data.errors);
+  return data.items;
 }
 
 /**
@@ -157,7 +165,9 @@ export async function uploadProjectArchive(projectId: string, zipFile: File): Pr
     body: formData
   });
   if (!res.ok) throw new Error(`Upload archive failed: HTTP ${res.status}`);
-  return await res.json();
+  const data: BatchUploadResponse = await res.json();
+  if (data.errors.length) console.warn('Archive members failed:', data.errors);
+  return data.items;
 }
 
 /**
@@ -257,5 +267,7 @@ export async function importLocalFiles(projectId: string, sourcePath: string, re
     body: JSON.stringify({ source_path: sourcePath, recursive })
   });
   if (!response.ok) throw new Error(`Import failed: HTTP ${response.status}`);
-  return await response.json();
+  const data: BatchUploadResponse = await response.json();
+  if (data.errors.length) console.warn('Local files failed to import:', data.errors);
+  return data.items;
 } 
\ No newline at end of file
@@ -23,12 +23,12 @@ export interface PointCloudFileInfo {
   status: string
   point_count: number | null
   dimensions: number | null
-  min_x: string | null
-  max_x: string | null
-  min_y: string | null
-  max_y: string | null
-  min_z: string | null
-  max_z: string | null
+  min_x: number | null
+  max_x: number | null
+  min_y: number | null
+  max_y: number | null
+  min_z: number | null
+  max_z: number | null
   upload_completed_at: string | null
   created_at: string
 }
@@ -199,12 +199,12 @@ function extractBoundsFromFileInfo(fileInfo: PointCloudFileInfo): {
   min: [number, number, number]
   max: [number, number, number]
 } {
-  const minX = fileInfo.min_x ? parseFloat(fileInfo.min_x) : -50
-  const maxX = fileInfo.max_x ? parseFloat(fileInfo.max_x) : 50
-  const minY = fileInfo.min_y ? parseFloat(fileInfo.min_y) : -50
-  const maxY = fileInfo.max_y ? parseFloat(fileInfo.max_y) : 50
-  const minZ = fileInfo.min_z ? parseFloat(fileInfo.min_z) : -50
-  const maxZ = fileInfo.max_z ? parseFloat(fileInfo.max_z) : 50
+  const minX = fileInfo.min_x ?? -50
+  const maxX = fileInfo.max_x ?? 50
+  const minY = fileInfo.min_y ?? -50
+  const maxY = fileInfo.max_y ?? 50
+  const minZ = fileInfo.min_z ?? -50
+  const maxZ = fileInfo.max_z ?? 50
   
   return {
     min: [minX, minY, minZ],
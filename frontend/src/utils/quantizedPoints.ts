@@ -0,0 +1,82 @@
+/**
+ * 量化點雲傳輸格式解析工具
+ * 對應後端 app/utils/pointcloud_io.py 的 write_quantized_points
+ */
+
+export const QUANTIZED_MEDIA_TYPE = 'application/x-quantized-points';
+
+const FLAG_MORTON = 1;
+const FLAG_DELTA = 2;
+
+export interface QuantizedPointCloud {
+  /** x, y, z 交錯排列 */
+  positions: Float32Array;
+  /** 強度（若有） */
+  intensity?: Float32Array;
+  pointCount: number;
+  /** 點順序是否已按 Morton 曲線重排（與原始檔案索引不一致） */
+  reordered: boolean;
+}
+
+async function decompress(body: ArrayBuffer, compression: number): Promise<ArrayBuffer> {
+  if (compression === 0) return body;
+  if (compression === 1) {
+    const stream = new Blob([body]).stream().pipeThrough(new DecompressionStream('deflate'));
+    return new Response(stream).arrayBuffer();
+  }
+  throw new Error('Unsupported compression: zstd (request compression=deflate)');
+}
+
+/**
+ * 解析量化點雲
+ */
+export async function parseQuantizedPoints(buffer: ArrayBuffer): Promise<QuantizedPointCloud> {
+  const view = new DataView(buffer);
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+  if (magic !== 'QPC1') {
+    throw new Error('Invalid quantized point file: missing magic number');
+  }
+
+  const bits = view.getUint8(4);
+  const flags = view.getUint8(5);
+  const attributeCount = view.getUint8(7);
+  const pointCount = view.getUint32(8, true);
+  const scales = [0, 1, 2].map((i) => view.getFloat64(16 + i * 8, true));
+  const offsets = [0, 1, 2].map((i) => view.getFloat64(40 + i * 8, true));
+  for (let i = 0; i < attributeCount; i++) {
+    scales.push(view.getFloat32(64 + i * 8, true));
+    offsets.push(view.getFloat32(68 + i * 8, true));
+  }
+
+  const body = await decompress(buffer.slice(64 + attributeCount * 8), view.getUint8(6));
+
+  // 各通道平面存放；差分編碼時以同寬度無號整數累加還原
+  let byteOffset = 0;
+  const channels = scales.map((scale, channel) => {
+    const values = channel < 3 && bits === 32
+      ? new Uint32Array(body, byteOffset, pointCount)
+      : new Uint16Array(body, byteOffset, pointCount);
+    byteOffset += values.byteLength;
+    if (flags & FLAG_DELTA) {
+      for (let i = 1; i < pointCount; i++) values[i] += values[i - 1];
+    }
+    return { values, scale, offset: offsets[channel] };
+  });
+
+  const positions = new Float32Array(pointCount * 3);
+  for (let axis = 0; axis < 3; axis++) {
+    const { values, scale, offset } = channels[axis];
+    for (let i = 0; i < pointCount; i++) {
+      positions[i * 3 + axis] = values[i] * scale + offset;
+    }
+  }
+
+  let intensity: Float32Array | undefined;
+  if (attributeCount > 0) {
+    const { values, scale, offset } = channels[3];
+    intensity = new Float32Array(pointCount);
+    for (let i = 0; i < pointCount; i++) intensity[i] = values[i] * scale + offset;
+  }
+
+  return { positions, intensity, pointCount, reordered: Boolean(flags & FLAG_MORTON) };
+}